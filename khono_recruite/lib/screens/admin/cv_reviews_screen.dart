@@ -14,22 +14,85 @@ class CVReviewsScreen extends StatefulWidget {
 
 class _CVReviewsScreenState extends State<CVReviewsScreen> {
   final AdminService admin = AdminService();
+  final ScrollController _scrollController = ScrollController();
   List<Map<String, dynamic>> cvReviews = [];
+  List<dynamic> jobs = [];
   bool loading = true;
+  bool loadingMore = false;
+  String? nextCursor;
+
+  // Filters, sent to the server with every page
+  String? statusFilter;
+  int? jobFilter;
+  double? minScoreFilter;
+
+  static const statuses = [
+    'applied',
+    'assessment_submitted',
+    'interviewed',
+    'offered',
+    'hired',
+    'rejected',
+  ];
+  static const minScores = [50.0, 70.0];
 
   @override
   void initState() {
     super.initState();
+    _scrollController.addListener(_onScroll);
     fetchCVReviews();
+    fetchJobs();
+  }
+
+  @override
+  void dispose() {
+    _scrollController.dispose();
+    super.dispose();
+  }
+
+  Map<String, String> get _filters => {
+        if (statusFilter != null) 'status': statusFilter!,
+        if (jobFilter != null) 'job_id': '$jobFilter',
+        if (minScoreFilter != null) 'min_score': '$minScoreFilter',
+      };
+
+  void _onScroll() {
+    final position = _scrollController.position;
+    if (position.pixels >= position.maxScrollExtent - 400) {
+      fetchMoreCVReviews();
+    }
+  }
+
+  // A page that does not fill the screen cannot be scrolled; keep loading
+  void _fillViewport() {
+    WidgetsBinding.instance.addPostFrameCallback((_) {
+      if (_scrollController.hasClients) _onScroll();
+    });
+  }
+
+  Future<void> fetchJobs() async {
+    try {
+      final data = await admin.listJobs();
+      setState(() => jobs = data);
+    } catch (e) {
+      debugPrint("Error fetching jobs: $e");
+    }
   }
 
+  // First page for the current filters
   Future<void> fetchCVReviews() async {
-    setState(() => loading = true);
+    setState(() {
+      loading = true;
+      cvReviews = [];
+      nextCursor = null;
+    });
     try {
-      final data = await admin.listCVReviews();
+      final page = await admin.listCVReviews(filters: _filters);
       setState(() {
-        cvReviews = List<Map<String, dynamic>>.from(data);
+        cvReviews = List<Map<String, dynamic>>.from(page.items);
+        nextCursor = page.nextCursor;
       });
+      _fillViewport();
     } catch (e) {
       debugPrint("Error fetching CV reviews: $e");
     } finally {
@@ -37,6 +100,101 @@ class _CVReviewsScreenState extends State<CVReviewsScreen> {
     }
   }
 
+  Future<void> fetchMoreCVReviews() async {
+    final cursor = nextCursor;
+    if (loading || loadingMore || cursor == null) return;
+    setState(() => loadingMore = true);
+    try {
+      final page = await admin.listCVReviews(filters: _filters, cursor: cursor);
+      // Filters changed meanwhile: this page belongs to the old list
+      if (nextCursor != cursor) return;
+      setState(() {
+        cvReviews.addAll(List<Map<String, dynamic>>.from(page.items));
+        nextCursor = page.nextCursor;
+      });
+      _fillViewport();
+    } catch (e) {
+      debugPrint("Error fetching more CV reviews: $e");
+    } finally {
+      setState(() => loadingMore = false);
+    }
+  }
+
+  Widget _filterDropdown<T>({
+    required ThemeProvider themeProvider,
+    required String hint,
+    required T? value,
+    required Map<T, String> options,
+    required ValueChanged<T?> onChanged,
+  }) {
+    return Container(
+      padding: const EdgeInsets.symmetric(horizontal: 12),
+      decoration: BoxDecoration(
+        color: (themeProvider.isDarkMode
+                ? const Color(0xFF14131E)
+                : Colors.white)
+            .withOpacity(0.9),
+        borderRadius: BorderRadius.circular(12),
+      ),
+      child: DropdownButtonHideUnderline(
+        child: DropdownButton<T?>(
+          value: value,
+          hint: Text(hint, style: GoogleFonts.inter(fontSize: 13)),
+          dropdownColor:
+              themeProvider.isDarkMode ? const Color(0xFF14131E) : Colors.white,
+          style: GoogleFonts.inter(
+            fontSize: 13,
+            color: themeProvider.isDarkMode ? Colors.white : Colors.black87,
+          ),
+          items: [
+            DropdownMenuItem<T?>(value: null, child: Text(hint)),
+            ...options.entries.map((e) => DropdownMenuItem<T?>(
+                  value: e.key,
+                  child: Text(e.value, overflow: TextOverflow.ellipsis),
+                )),
+          ],
+          onChanged: (value) {
+            onChanged(value);
+            fetchCVReviews();
+          },
+        ),
+      ),
+    );
+  }
+
+  Widget _buildFilters(ThemeProvider themeProvider) {
+    return Wrap(
+      spacing: 12,
+      runSpacing: 12,
+      children: [
+        _filterDropdown<String>(
+          themeProvider: themeProvider,
+          hint: "All statuses",
+          value: statusFilter,
+          options: {for (final s in statuses) s: s.replaceAll('_', ' ')},
+          onChanged: (value) => statusFilter = value,
+        ),
+        _filterDropdown<int>(
+          themeProvider: themeProvider,
+          hint: "All jobs",
+          value: jobFilter,
+          options: {
+            for (final job in jobs)
+              job['id'] as int: (job['title'] ?? 'Job ${job['id']}').toString(),
+          },
+          onChanged: (value) => jobFilter = value,
+        ),
+        _filterDropdown<double>(
+          themeProvider: themeProvider,
+          hint: "Any CV score",
+          value: minScoreFilter,
+          options: {for (final s in minScores) s: "CV score ${s.toInt()}+"},
+          onChanged: (value) => minScoreFilter = value,
+        ),
+      ],
+    );
+  }
+
   Color getScoreColor(double score) {
     if (score >= 70) return Colors.green;
     if (score >= 50) return Colors.orange;
@@ -88,359 +246,501 @@ class _CVReviewsScreenState extends State<CVReviewsScreen> {
                 color:
                     themeProvider.isDarkMode ? Colors.white : Colors.black87),
           ),
-          body: loading
-              ? Center(
-                  child: Column(
-                    mainAxisAlignment: MainAxisAlignment.center,
+          body: Padding(
+            padding: const EdgeInsets.all(20),
+            child: Column(
+              crossAxisAlignment: CrossAxisAlignment.start,
+              children: [
+                // Header with stats
+                Container(
+                  padding: const EdgeInsets.all(20),
+                  decoration: BoxDecoration(
+                    color: (themeProvider.isDarkMode
+                            ? const Color(0xFF14131E)
+                            : Colors.white)
+                        .withOpacity(0.9),
+                    borderRadius: BorderRadius.circular(16),
+                    boxShadow: [
+                      BoxShadow(
+                        color: Colors.black.withOpacity(0.1),
+                        blurRadius: 15,
+                        offset: const Offset(0, 6),
+                      ),
+                    ],
+                  ),
+                  child: Row(
                     children: [
-                      const CircularProgressIndicator(
-                        valueColor:
-                            AlwaysStoppedAnimation<Color>(Colors.redAccent),
+                      Container(
+                        padding: const EdgeInsets.all(12),
+                        decoration: BoxDecoration(
+                          color: Colors.redAccent.withOpacity(0.1),
+                          borderRadius: BorderRadius.circular(12),
+                        ),
+                        child: Icon(
+                          Icons.assignment_outlined,
+                          color: Colors.redAccent,
+                          size: 28,
+                        ),
+                      ),
+                      const SizedBox(width: 16),
+                      Column(
+                        crossAxisAlignment:
+                            CrossAxisAlignment.start,
+                        children: [
+                          Text(
+                            "CV Reviews",
+                            style: GoogleFonts.poppins(
+                              fontSize: 20,
+                              fontWeight: FontWeight.w600,
+                              color: themeProvider.isDarkMode
+                                  ? Colors.white
+                                  : Colors.black87,
+                            ),
+                          ),
+                          Text(
+                            "${cvReviews.length}${nextCursor != null ? '+' : ''} candidates reviewed",
+                            style: GoogleFonts.inter(
+                              color: themeProvider.isDarkMode
+                                  ? Colors.grey.shade400
+                                  : Colors.grey.shade600,
+                              fontSize: 14,
+                            ),
+                          ),
+                        ],
                       ),
-                      const SizedBox(height: 16),
-                      Text(
-                        "Loading CV Reviews...",
-                        style: GoogleFonts.inter(
-                          color: themeProvider.isDarkMode
-                              ? Colors.grey.shade400
-                              : Colors.grey.shade600,
-                          fontSize: 16,
+                      const Spacer(),
+                      Container(
+                        padding: const EdgeInsets.symmetric(
+                            horizontal: 16, vertical: 8),
+                        decoration: BoxDecoration(
+                          color: Colors.redAccent.withOpacity(0.1),
+                          borderRadius: BorderRadius.circular(12),
+                        ),
+                        child: Text(
+                          "Active Reviews",
+                          style: GoogleFonts.inter(
+                            color: Colors.redAccent,
+                            fontWeight: FontWeight.w600,
+                            fontSize: 12,
+                          ),
                         ),
                       ),
                     ],
                   ),
-                )
-              : Padding(
-                  padding: const EdgeInsets.all(20),
-                  child: cvReviews.isEmpty
+                ),
+                const SizedBox(height: 16),
+                _buildFilters(themeProvider),
+                const SizedBox(height: 20),
+
+                // Grid of CV reviews, loaded a page at a time as it scrolls
+                Expanded(
+                  child: loading
                       ? Center(
                           child: Column(
                             mainAxisAlignment: MainAxisAlignment.center,
                             children: [
-                              Icon(
-                                Icons.assignment_outlined,
-                                size: 80,
-                                color: themeProvider.isDarkMode
-                                    ? Colors.grey.shade600
-                                    : Colors.grey.shade300,
+                              const CircularProgressIndicator(
+                                valueColor:
+                                    AlwaysStoppedAnimation<Color>(Colors.redAccent),
                               ),
                               const SizedBox(height: 16),
                               Text(
-                                "No CV Reviews Found",
+                                "Loading CV Reviews...",
                                 style: GoogleFonts.inter(
                                   color: themeProvider.isDarkMode
                                       ? Colors.grey.shade400
                                       : Colors.grey.shade600,
-                                  fontSize: 18,
-                                  fontWeight: FontWeight.w600,
-                                ),
-                              ),
-                              const SizedBox(height: 8),
-                              Text(
-                                "CV reviews will appear here once available",
-                                style: GoogleFonts.inter(
-                                  color: themeProvider.isDarkMode
-                                      ? Colors.grey.shade500
-                                      : Colors.grey.shade500,
-                                  fontSize: 14,
+                                  fontSize: 16,
                                 ),
                               ),
                             ],
                           ),
                         )
-                      : Column(
-                          crossAxisAlignment: CrossAxisAlignment.start,
-                          children: [
-                            // Header with stats
-                            Container(
-                              padding: const EdgeInsets.all(20),
-                              decoration: BoxDecoration(
-                                color: (themeProvider.isDarkMode
-                                        ? const Color(0xFF14131E)
-                                        : Colors.white)
-                                    .withOpacity(0.9),
-                                borderRadius: BorderRadius.circular(16),
-                                boxShadow: [
-                                  BoxShadow(
-                                    color: Colors.black.withOpacity(0.1),
-                                    blurRadius: 15,
-                                    offset: const Offset(0, 6),
-                                  ),
-                                ],
-                              ),
-                              child: Row(
+                      : cvReviews.isEmpty
+                          ? Center(
+                              child: Column(
+                                mainAxisAlignment: MainAxisAlignment.center,
                                 children: [
-                                  Container(
-                                    padding: const EdgeInsets.all(12),
-                                    decoration: BoxDecoration(
-                                      color: Colors.redAccent.withOpacity(0.1),
-                                      borderRadius: BorderRadius.circular(12),
-                                    ),
-                                    child: Icon(
-                                      Icons.assignment_outlined,
-                                      color: Colors.redAccent,
-                                      size: 28,
-                                    ),
+                                  Icon(
+                                    Icons.assignment_outlined,
+                                    size: 80,
+                                    color: themeProvider.isDarkMode
+                                        ? Colors.grey.shade600
+                                        : Colors.grey.shade300,
                                   ),
-                                  const SizedBox(width: 16),
-                                  Column(
-                                    crossAxisAlignment:
-                                        CrossAxisAlignment.start,
-                                    children: [
-                                      Text(
-                                        "CV Reviews",
-                                        style: GoogleFonts.poppins(
-                                          fontSize: 20,
-                                          fontWeight: FontWeight.w600,
-                                          color: themeProvider.isDarkMode
-                                              ? Colors.white
-                                              : Colors.black87,
-                                        ),
-                                      ),
-                                      Text(
-                                        "${cvReviews.length} candidates reviewed",
-                                        style: GoogleFonts.inter(
-                                          color: themeProvider.isDarkMode
-                                              ? Colors.grey.shade400
-                                              : Colors.grey.shade600,
-                                          fontSize: 14,
-                                        ),
-                                      ),
-                                    ],
-                                  ),
-                                  const Spacer(),
-                                  Container(
-                                    padding: const EdgeInsets.symmetric(
-                                        horizontal: 16, vertical: 8),
-                                    decoration: BoxDecoration(
-                                      color: Colors.redAccent.withOpacity(0.1),
-                                      borderRadius: BorderRadius.circular(12),
+                                  const SizedBox(height: 16),
+                                  Text(
+                                    "No CV Reviews Found",
+                                    style: GoogleFonts.inter(
+                                      color: themeProvider.isDarkMode
+                                          ? Colors.grey.shade400
+                                          : Colors.grey.shade600,
+                                      fontSize: 18,
+                                      fontWeight: FontWeight.w600,
                                     ),
-                                    child: Text(
-                                      "Active Reviews",
-                                      style: GoogleFonts.inter(
-                                        color: Colors.redAccent,
-                                        fontWeight: FontWeight.w600,
-                                        fontSize: 12,
-                                      ),
+                                  ),
+                                  const SizedBox(height: 8),
+                                  Text(
+                                    "CV reviews will appear here once available",
+                                    style: GoogleFonts.inter(
+                                      color: themeProvider.isDarkMode
+                                          ? Colors.grey.shade500
+                                          : Colors.grey.shade500,
+                                      fontSize: 14,
                                     ),
                                   ),
                                 ],
                               ),
-                            ),
-                            const SizedBox(height: 20),
-
-                            // Grid of CV reviews
-                            Expanded(
-                              child: GridView.builder(
-                                gridDelegate:
-                                    SliverGridDelegateWithFixedCrossAxisCount(
-                                  crossAxisCount: crossAxisCount,
-                                  mainAxisSpacing: 20,
-                                  crossAxisSpacing: 20,
-                                  childAspectRatio: 0.75,
-                                ),
-                                itemCount: cvReviews.length,
-                                itemBuilder: (_, index) {
-                                  final review = cvReviews[index];
-                                  final score =
-                                      (review['cv_score'] ?? 0).toDouble();
-                                  final scoreColor = getScoreColor(score);
-                                  final scoreLabel = getScoreLabel(score);
+                            )
+                          : GridView.builder(
+                              controller: _scrollController,
+                              gridDelegate:
+                                  SliverGridDelegateWithFixedCrossAxisCount(
+                                crossAxisCount: crossAxisCount,
+                                mainAxisSpacing: 20,
+                                crossAxisSpacing: 20,
+                                childAspectRatio: 0.75,
+                              ),
+                              itemCount: cvReviews.length,
+                              itemBuilder: (_, index) {
+                                final review = cvReviews[index];
+                                final score =
+                                    (review['cv_score'] ?? 0).toDouble();
+                                final scoreColor = getScoreColor(score);
+                                final scoreLabel = getScoreLabel(score);
 
-                                  final cvParser =
-                                      review['cv_parser_result'] ?? {};
-                                  final skills = cvParser['skills'] ?? [];
-                                  final education = cvParser['education'] ?? [];
-                                  final workExp =
-                                      cvParser['work_experience'] ?? [];
+                                final cvParser =
+                                    review['cv_parser_result'] ?? {};
+                                final skills = cvParser['skills'] ?? [];
+                                final education = cvParser['education'] ?? [];
+                                final workExp =
+                                    cvParser['work_experience'] ?? [];
 
-                                  return Container(
-                                    decoration: BoxDecoration(
-                                      color: (themeProvider.isDarkMode
-                                              ? const Color(0xFF14131E)
-                                              : Colors.white)
-                                          .withOpacity(0.9),
-                                      borderRadius: BorderRadius.circular(20),
-                                      boxShadow: [
-                                        BoxShadow(
-                                          color: Colors.black.withOpacity(0.1),
-                                          blurRadius: 15,
-                                          offset: const Offset(0, 6),
+                                return Container(
+                                  decoration: BoxDecoration(
+                                    color: (themeProvider.isDarkMode
+                                            ? const Color(0xFF14131E)
+                                            : Colors.white)
+                                        .withOpacity(0.9),
+                                    borderRadius: BorderRadius.circular(20),
+                                    boxShadow: [
+                                      BoxShadow(
+                                        color: Colors.black.withOpacity(0.1),
+                                        blurRadius: 15,
+                                        offset: const Offset(0, 6),
+                                      ),
+                                    ],
+                                  ),
+                                  child: Column(
+                                    children: [
+                                      // Header with score
+                                      Container(
+                                        padding: const EdgeInsets.all(20),
+                                        decoration: BoxDecoration(
+                                          color: scoreColor.withOpacity(0.1),
+                                          borderRadius:
+                                              const BorderRadius.only(
+                                            topLeft: Radius.circular(20),
+                                            topRight: Radius.circular(20),
+                                          ),
                                         ),
-                                      ],
-                                    ),
-                                    child: Column(
-                                      children: [
-                                        // Header with score
-                                        Container(
-                                          padding: const EdgeInsets.all(20),
-                                          decoration: BoxDecoration(
-                                            color: scoreColor.withOpacity(0.1),
-                                            borderRadius:
-                                                const BorderRadius.only(
-                                              topLeft: Radius.circular(20),
-                                              topRight: Radius.circular(20),
+                                        child: Row(
+                                          children: [
+                                            Stack(
+                                              alignment: Alignment.center,
+                                              children: [
+                                                CircularPercentIndicator(
+                                                  radius: 30,
+                                                  lineWidth: 6,
+                                                  percent: (score / 100)
+                                                      .clamp(0.0, 1.0),
+                                                  center: Text(
+                                                    "${score.toStringAsFixed(0)}%",
+                                                    style: GoogleFonts.inter(
+                                                      fontWeight:
+                                                          FontWeight.bold,
+                                                      fontSize: 14,
+                                                      color: scoreColor,
+                                                    ),
+                                                  ),
+                                                  progressColor: scoreColor,
+                                                  backgroundColor:
+                                                      themeProvider.isDarkMode
+                                                          ? Colors
+                                                              .grey.shade800
+                                                          : Colors
+                                                              .grey.shade200,
+                                                  circularStrokeCap:
+                                                      CircularStrokeCap.round,
+                                                ),
+                                              ],
                                             ),
-                                          ),
-                                          child: Row(
-                                            children: [
-                                              Stack(
-                                                alignment: Alignment.center,
+                                            const SizedBox(width: 16),
+                                            Expanded(
+                                              child: Column(
+                                                crossAxisAlignment:
+                                                    CrossAxisAlignment.start,
                                                 children: [
-                                                  CircularPercentIndicator(
-                                                    radius: 30,
-                                                    lineWidth: 6,
-                                                    percent: (score / 100)
-                                                        .clamp(0.0, 1.0),
-                                                    center: Text(
-                                                      "${score.toStringAsFixed(0)}%",
-                                                      style: GoogleFonts.inter(
-                                                        fontWeight:
-                                                            FontWeight.bold,
-                                                        fontSize: 14,
+                                                  Text(
+                                                    review['full_name'] ??
+                                                        "Unknown Candidate",
+                                                    style: GoogleFonts.inter(
+                                                      fontSize: 16,
+                                                      fontWeight:
+                                                          FontWeight.w600,
+                                                      color: themeProvider
+                                                              .isDarkMode
+                                                          ? Colors.white
+                                                          : Colors.black87,
+                                                    ),
+                                                    maxLines: 1,
+                                                    overflow:
+                                                        TextOverflow.ellipsis,
+                                                  ),
+                                                  const SizedBox(height: 4),
+                                                  Container(
+                                                    padding: const EdgeInsets
+                                                        .symmetric(
+                                                        horizontal: 8,
+                                                        vertical: 4),
+                                                    decoration: BoxDecoration(
+                                                      color: scoreColor
+                                                          .withOpacity(0.2),
+                                                      borderRadius:
+                                                          BorderRadius
+                                                              .circular(6),
+                                                    ),
+                                                    child: Text(
+                                                      scoreLabel,
+                                                      style:
+                                                          GoogleFonts.inter(
                                                         color: scoreColor,
+                                                        fontSize: 10,
+                                                        fontWeight:
+                                                            FontWeight.w600,
                                                       ),
                                                     ),
-                                                    progressColor: scoreColor,
+                                                  ),
+                                                ],
+                                              ),
+                                            ),
+                                          ],
+                                        ),
+                                      ),
+
+                                      Expanded(
+                                        child: Padding(
+                                          padding: const EdgeInsets.all(20),
+                                          child: Column(
+                                            crossAxisAlignment:
+                                                CrossAxisAlignment.start,
+                                            children: [
+                                              // CV Fit Score
+                                              Column(
+                                                crossAxisAlignment:
+                                                    CrossAxisAlignment.start,
+                                                children: [
+                                                  Row(
+                                                    mainAxisAlignment:
+                                                        MainAxisAlignment
+                                                            .spaceBetween,
+                                                    children: [
+                                                      Text(
+                                                        "CV Fit Score",
+                                                        style:
+                                                            GoogleFonts.inter(
+                                                          fontWeight:
+                                                              FontWeight.w600,
+                                                          fontSize: 12,
+                                                          color: themeProvider
+                                                                  .isDarkMode
+                                                              ? Colors.grey
+                                                                  .shade400
+                                                              : Colors.grey
+                                                                  .shade700,
+                                                        ),
+                                                      ),
+                                                      Text(
+                                                        "${score.toStringAsFixed(1)}%",
+                                                        style:
+                                                            GoogleFonts.inter(
+                                                          fontWeight:
+                                                              FontWeight.w600,
+                                                          fontSize: 12,
+                                                          color: scoreColor,
+                                                        ),
+                                                      ),
+                                                    ],
+                                                  ),
+                                                  const SizedBox(height: 8),
+                                                  LinearPercentIndicator(
+                                                    lineHeight: 6,
+                                                    percent: (score / 100)
+                                                        .clamp(0.0, 1.0),
                                                     backgroundColor:
-                                                        themeProvider.isDarkMode
+                                                        themeProvider
+                                                                .isDarkMode
                                                             ? Colors
                                                                 .grey.shade800
-                                                            : Colors
-                                                                .grey.shade200,
-                                                    circularStrokeCap:
-                                                        CircularStrokeCap.round,
+                                                            : Colors.grey
+                                                                .shade200,
+                                                    progressColor: scoreColor,
+                                                    barRadius:
+                                                        const Radius.circular(
+                                                            3),
                                                   ),
                                                 ],
                                               ),
-                                              const SizedBox(width: 16),
-                                              Expanded(
-                                                child: Column(
+                                              const SizedBox(height: 16),
+
+                                              // Skills
+                                              if (skills.isNotEmpty)
+                                                Column(
                                                   crossAxisAlignment:
-                                                      CrossAxisAlignment.start,
+                                                      CrossAxisAlignment
+                                                          .start,
                                                   children: [
                                                     Text(
-                                                      review['full_name'] ??
-                                                          "Unknown Candidate",
-                                                      style: GoogleFonts.inter(
-                                                        fontSize: 16,
+                                                      "Skills",
+                                                      style:
+                                                          GoogleFonts.inter(
                                                         fontWeight:
                                                             FontWeight.w600,
+                                                        fontSize: 12,
                                                         color: themeProvider
                                                                 .isDarkMode
-                                                            ? Colors.white
-                                                            : Colors.black87,
+                                                            ? Colors
+                                                                .grey.shade400
+                                                            : Colors.grey
+                                                                .shade700,
                                                       ),
-                                                      maxLines: 1,
-                                                      overflow:
-                                                          TextOverflow.ellipsis,
                                                     ),
-                                                    const SizedBox(height: 4),
-                                                    Container(
-                                                      padding: const EdgeInsets
-                                                          .symmetric(
-                                                          horizontal: 8,
-                                                          vertical: 4),
-                                                      decoration: BoxDecoration(
-                                                        color: scoreColor
-                                                            .withOpacity(0.2),
-                                                        borderRadius:
-                                                            BorderRadius
-                                                                .circular(6),
-                                                      ),
-                                                      child: Text(
-                                                        scoreLabel,
-                                                        style:
-                                                            GoogleFonts.inter(
-                                                          color: scoreColor,
-                                                          fontSize: 10,
-                                                          fontWeight:
-                                                              FontWeight.w600,
+                                                    const SizedBox(height: 8),
+                                                    Wrap(
+                                                      spacing: 6,
+                                                      runSpacing: 6,
+                                                      children: skills
+                                                          .take(4)
+                                                          .map<Widget>(
+                                                              (s) =>
+                                                                  Container(
+                                                                    padding: const EdgeInsets
+                                                                        .symmetric(
+                                                                        horizontal:
+                                                                            8,
+                                                                        vertical:
+                                                                            4),
+                                                                    decoration:
+                                                                        BoxDecoration(
+                                                                      color: Colors
+                                                                          .redAccent
+                                                                          .withOpacity(0.1),
+                                                                      borderRadius:
+                                                                          BorderRadius.circular(12),
+                                                                    ),
+                                                                    child:
+                                                                        Text(
+                                                                      s.toString(),
+                                                                      style: GoogleFonts
+                                                                          .inter(
+                                                                        fontSize:
+                                                                            10,
+                                                                        color:
+                                                                            Colors.redAccent,
+                                                                        fontWeight:
+                                                                            FontWeight.w500,
+                                                                      ),
+                                                                    ),
+                                                                  ))
+                                                          .toList(),
+                                                    ),
+                                                    if (skills.length > 4)
+                                                      Padding(
+                                                        padding:
+                                                            const EdgeInsets
+                                                                .only(top: 4),
+                                                        child: Text(
+                                                          "+${skills.length - 4} more",
+                                                          style: GoogleFonts
+                                                              .inter(
+                                                            fontSize: 10,
+                                                            color: themeProvider
+                                                                    .isDarkMode
+                                                                ? Colors.grey
+                                                                    .shade500
+                                                                : Colors.grey
+                                                                    .shade500,
+                                                          ),
                                                         ),
                                                       ),
-                                                    ),
+                                                    const SizedBox(
+                                                        height: 12),
                                                   ],
                                                 ),
-                                              ),
-                                            ],
-                                          ),
-                                        ),
 
-                                        Expanded(
-                                          child: Padding(
-                                            padding: const EdgeInsets.all(20),
-                                            child: Column(
-                                              crossAxisAlignment:
-                                                  CrossAxisAlignment.start,
-                                              children: [
-                                                // CV Fit Score
+                                              // Education
+                                              if (education.isNotEmpty)
                                                 Column(
                                                   crossAxisAlignment:
-                                                      CrossAxisAlignment.start,
+                                                      CrossAxisAlignment
+                                                          .start,
                                                   children: [
-                                                    Row(
-                                                      mainAxisAlignment:
-                                                          MainAxisAlignment
-                                                              .spaceBetween,
-                                                      children: [
-                                                        Text(
-                                                          "CV Fit Score",
-                                                          style:
-                                                              GoogleFonts.inter(
-                                                            fontWeight:
-                                                                FontWeight.w600,
-                                                            fontSize: 12,
-                                                            color: themeProvider
-                                                                    .isDarkMode
-                                                                ? Colors.grey
-                                                                    .shade400
-                                                                : Colors.grey
-                                                                    .shade700,
-                                                          ),
-                                                        ),
-                                                        Text(
-                                                          "${score.toStringAsFixed(1)}%",
-                                                          style:
-                                                              GoogleFonts.inter(
-                                                            fontWeight:
-                                                                FontWeight.w600,
-                                                            fontSize: 12,
-                                                            color: scoreColor,
-                                                          ),
-                                                        ),
-                                                      ],
-                                                    ),
-                                                    const SizedBox(height: 8),
-                                                    LinearPercentIndicator(
-                                                      lineHeight: 6,
-                                                      percent: (score / 100)
-                                                          .clamp(0.0, 1.0),
-                                                      backgroundColor:
-                                                          themeProvider
-                                                                  .isDarkMode
-                                                              ? Colors
-                                                                  .grey.shade800
-                                                              : Colors.grey
-                                                                  .shade200,
-                                                      progressColor: scoreColor,
-                                                      barRadius:
-                                                          const Radius.circular(
-                                                              3),
+                                                    Text(
+                                                      "Education",
+                                                      style:
+                                                          GoogleFonts.inter(
+                                                        fontWeight:
+                                                            FontWeight.w600,
+                                                        fontSize: 12,
+                                                        color: themeProvider
+                                                                .isDarkMode
+                                                            ? Colors
+                                                                .grey.shade400
+                                                            : Colors.grey
+                                                                .shade700,
+                                                      ),
                                                     ),
+                                                    const SizedBox(height: 6),
+                                                    ...education
+                                                        .take(2)
+                                                        .map<Widget>(
+                                                            (edu) => Padding(
+                                                                  padding: const EdgeInsets
+                                                                      .only(
+                                                                      bottom:
+                                                                          4),
+                                                                  child: Text(
+                                                                    "• ${edu['degree'] ?? ''} - ${edu['institution'] ?? ''}",
+                                                                    style: GoogleFonts
+                                                                        .inter(
+                                                                      fontSize:
+                                                                          10,
+                                                                      color: themeProvider.isDarkMode
+                                                                          ? Colors.grey.shade500
+                                                                          : Colors.grey.shade600,
+                                                                    ),
+                                                                    maxLines:
+                                                                        1,
+                                                                    overflow:
+                                                                        TextOverflow
+                                                                            .ellipsis,
+                                                                  ),
+                                                                )),
+                                                    const SizedBox(
+                                                        height: 12),
                                                   ],
                                                 ),
-                                                const SizedBox(height: 16),
 
-                                                // Skills
-                                                if (skills.isNotEmpty)
-                                                  Column(
+                                              // Work Experience
+                                              if (workExp.isNotEmpty)
+                                                Expanded(
+                                                  child: Column(
                                                     crossAxisAlignment:
                                                         CrossAxisAlignment
                                                             .start,
                                                     children: [
                                                       Text(
-                                                        "Skills",
+                                                        "Experience",
                                                         style:
                                                             GoogleFonts.inter(
                                                           fontWeight:
@@ -448,108 +748,26 @@ class _CVReviewsScreenState extends State<CVReviewsScreen> {
                                                           fontSize: 12,
                                                           color: themeProvider
                                                                   .isDarkMode
-                                                              ? Colors
-                                                                  .grey.shade400
+                                                              ? Colors.grey
+                                                                  .shade400
                                                               : Colors.grey
                                                                   .shade700,
                                                         ),
                                                       ),
-                                                      const SizedBox(height: 8),
-                                                      Wrap(
-                                                        spacing: 6,
-                                                        runSpacing: 6,
-                                                        children: skills
-                                                            .take(4)
-                                                            .map<Widget>(
-                                                                (s) =>
-                                                                    Container(
-                                                                      padding: const EdgeInsets
-                                                                          .symmetric(
-                                                                          horizontal:
-                                                                              8,
-                                                                          vertical:
-                                                                              4),
-                                                                      decoration:
-                                                                          BoxDecoration(
-                                                                        color: Colors
-                                                                            .redAccent
-                                                                            .withOpacity(0.1),
-                                                                        borderRadius:
-                                                                            BorderRadius.circular(12),
-                                                                      ),
-                                                                      child:
-                                                                          Text(
-                                                                        s.toString(),
-                                                                        style: GoogleFonts
-                                                                            .inter(
-                                                                          fontSize:
-                                                                              10,
-                                                                          color:
-                                                                              Colors.redAccent,
-                                                                          fontWeight:
-                                                                              FontWeight.w500,
-                                                                        ),
-                                                                      ),
-                                                                    ))
-                                                            .toList(),
-                                                      ),
-                                                      if (skills.length > 4)
-                                                        Padding(
-                                                          padding:
-                                                              const EdgeInsets
-                                                                  .only(top: 4),
-                                                          child: Text(
-                                                            "+${skills.length - 4} more",
-                                                            style: GoogleFonts
-                                                                .inter(
-                                                              fontSize: 10,
-                                                              color: themeProvider
-                                                                      .isDarkMode
-                                                                  ? Colors.grey
-                                                                      .shade500
-                                                                  : Colors.grey
-                                                                      .shade500,
-                                                            ),
-                                                          ),
-                                                        ),
                                                       const SizedBox(
-                                                          height: 12),
-                                                    ],
-                                                  ),
-
-                                                // Education
-                                                if (education.isNotEmpty)
-                                                  Column(
-                                                    crossAxisAlignment:
-                                                        CrossAxisAlignment
-                                                            .start,
-                                                    children: [
-                                                      Text(
-                                                        "Education",
-                                                        style:
-                                                            GoogleFonts.inter(
-                                                          fontWeight:
-                                                              FontWeight.w600,
-                                                          fontSize: 12,
-                                                          color: themeProvider
-                                                                  .isDarkMode
-                                                              ? Colors
-                                                                  .grey.shade400
-                                                              : Colors.grey
-                                                                  .shade700,
-                                                        ),
-                                                      ),
-                                                      const SizedBox(height: 6),
-                                                      ...education
+                                                          height: 6),
+                                                      ...workExp
                                                           .take(2)
                                                           .map<Widget>(
-                                                              (edu) => Padding(
+                                                              (exp) =>
+                                                                  Padding(
                                                                     padding: const EdgeInsets
                                                                         .only(
                                                                         bottom:
                                                                             4),
-                                                                    child: Text(
-                                                                      "• ${edu['degree'] ?? ''} - ${edu['institution'] ?? ''}",
+                                                                    child:
+                                                                        Text(
+                                                                      "• ${exp['role'] ?? ''} at ${exp['company'] ?? ''}",
                                                                       style: GoogleFonts
                                                                           .inter(
                                                                         fontSize:
@@ -561,82 +779,30 @@ class _CVReviewsScreenState extends State<CVReviewsScreen> {
                                                                       maxLines:
                                                                           1,
                                                                       overflow:
-                                                                          TextOverflow
-                                                                              .ellipsis,
+                                                                          TextOverflow.ellipsis,
                                                                     ),
                                                                   )),
-                                                      const SizedBox(
-                                                          height: 12),
                                                     ],
                                                   ),
-
-                                                // Work Experience
-                                                if (workExp.isNotEmpty)
-                                                  Expanded(
-                                                    child: Column(
-                                                      crossAxisAlignment:
-                                                          CrossAxisAlignment
-                                                              .start,
-                                                      children: [
-                                                        Text(
-                                                          "Experience",
-                                                          style:
-                                                              GoogleFonts.inter(
-                                                            fontWeight:
-                                                                FontWeight.w600,
-                                                            fontSize: 12,
-                                                            color: themeProvider
-                                                                    .isDarkMode
-                                                                ? Colors.grey
-                                                                    .shade400
-                                                                : Colors.grey
-                                                                    .shade700,
-                                                          ),
-                                                        ),
-                                                        const SizedBox(
-                                                            height: 6),
-                                                        ...workExp
-                                                            .take(2)
-                                                            .map<Widget>(
-                                                                (exp) =>
-                                                                    Padding(
-                                                                      padding: const EdgeInsets
-                                                                          .only(
-                                                                          bottom:
-                                                                              4),
-                                                                      child:
-                                                                          Text(
-                                                                        "• ${exp['role'] ?? ''} at ${exp['company'] ?? ''}",
-                                                                        style: GoogleFonts
-                                                                            .inter(
-                                                                          fontSize:
-                                                                              10,
-                                                                          color: themeProvider.isDarkMode
-                                                                              ? Colors.grey.shade500
-                                                                              : Colors.grey.shade600,
-                                                                        ),
-                                                                        maxLines:
-                                                                            1,
-                                                                        overflow:
-                                                                            TextOverflow.ellipsis,
-                                                                      ),
-                                                                    )),
-                                                      ],
-                                                    ),
-                                                  ),
-                                              ],
-                                            ),
+                                                ),
+                                            ],
                                           ),
                                         ),
-                                      ],
-                                    ),
-                                  );
-                                },
-                              ),
+                                      ),
+                                    ],
+                                  ),
+                                );
+                              },
                             ),
-                          ],
-                        ),
                 ),
+                if (loadingMore)
+                  const Padding(
+                    padding: EdgeInsets.only(top: 12),
+                    child: LinearProgressIndicator(color: Colors.redAccent),
+                  ),
+              ],
+            ),
+          ),
         ),
       ),
     );
@@ -4,6 +4,7 @@ import 'package:file_picker/file_picker.dart';
 import 'package:http/http.dart' as http;
 import 'dart:convert';
 import '../../services/auth_service.dart';
+import '../../services/candidate_service.dart';
 import 'assessments_results_screen.dart';
 
 class CVUploadScreen extends StatefulWidget {
@@ -19,6 +20,7 @@ class _CVUploadScreenState extends State<CVUploadScreen> {
   String? selectedFileName;
   TextEditingController resumeTextController = TextEditingController();
   bool uploading = false;
+  bool analyzing = false;
   String? token;
 
   // Theme Colors
@@ -98,13 +100,13 @@ class _CVUploadScreenState extends State<CVUploadScreen> {
       final responseString = await streamedResponse.stream.bytesToString();
       final resp = json.decode(responseString);
 
-      if (streamedResponse.statusCode == 200 ||
-          streamedResponse.statusCode == 201) {
-        final matchScore = resp['parser_result']?['match_score'] ??
-            resp['parser_result']?['score'] ??
-            'N/A';
+      if (CandidateService.isResumeJob(streamedResponse.statusCode, resp)) {
+        setState(() => analyzing = true);
+        final result =
+            await CandidateService.waitForResumeJob(resp['job_id'], token!);
+        final cvScore = result['cv_score'] ?? 'N/A';
         ScaffoldMessenger.of(context).showSnackBar(
-            SnackBar(content: Text("Resume uploaded! CV Score: $matchScore")));
+            SnackBar(content: Text("Resume uploaded! CV Score: $cvScore")));
 
         Navigator.pushReplacement(
           context,
@@ -123,7 +125,10 @@ class _CVUploadScreenState extends State<CVUploadScreen> {
       ScaffoldMessenger.of(context)
           .showSnackBar(SnackBar(content: Text("Error uploading CV: $e")));
     } finally {
-      setState(() => uploading = false);
+      setState(() {
+        uploading = false;
+        analyzing = false;
+      });
     }
   }
 
@@ -268,6 +273,13 @@ class _CVUploadScreenState extends State<CVUploadScreen> {
                                 ),
                         ),
                       ),
+                      if (analyzing) ...[
+                        const SizedBox(height: 8),
+                        Text(
+                          "Analyzing your resume, this can take a minute...",
+                          style: TextStyle(color: _textSecondary),
+                        ),
+                      ],
                       const SizedBox(height: 8),
                       Text(
                         'Supported: PDF/DOC/DOCX/TXT. Max file size depends on server config.',
@@ -1,9 +1,9 @@
-import 'dart:convert';
 import 'package:flutter/material.dart';
 import 'package:provider/provider.dart';
 import 'package:google_fonts/google_fonts.dart';
 import '../../services/auth_service.dart';
 import '../../utils/api_endpoints.dart';
+import '../../utils/pagination.dart';
 import '../../providers/theme_provider.dart';
 
 class CandidateListScreen extends StatefulWidget {
@@ -14,8 +14,11 @@ class CandidateListScreen extends StatefulWidget {
 }
 
 class _CandidateListScreenState extends State<CandidateListScreen> {
+  final ScrollController _scrollController = ScrollController();
   List<dynamic> candidates = [];
   bool loading = true;
+  bool loadingMore = false;
+  String? nextCursor;
 
   // Track hovered card
   int? hoveredIndex;
@@ -23,30 +26,54 @@ class _CandidateListScreenState extends State<CandidateListScreen> {
   @override
   void initState() {
     super.initState();
+    _scrollController.addListener(_onScroll);
     fetchCandidates();
   }
 
+  @override
+  void dispose() {
+    _scrollController.dispose();
+    super.dispose();
+  }
+
+  void _onScroll() {
+    final position = _scrollController.position;
+    if (position.pixels >= position.maxScrollExtent - 400) {
+      fetchCandidates();
+    }
+  }
+
+  // A page that does not fill the screen cannot be scrolled; keep loading
+  void _fillViewport() {
+    WidgetsBinding.instance.addPostFrameCallback((_) {
+      if (_scrollController.hasClients) _onScroll();
+    });
+  }
+
+  // Loads the next page (the first one on the initial call)
   Future<void> fetchCandidates() async {
+    if (loadingMore || (!loading && nextCursor == null)) return;
+    setState(() => loadingMore = true);
     try {
-      final response = await AuthService.authorizedGet(
+      final page = await fetchPage(
         "${ApiEndpoints.adminBase}/candidates/all",
+        token: await AuthService.getAccessToken(),
+        itemsKey: 'candidates',
+        cursor: nextCursor,
       );
-      if (response.statusCode == 200) {
-        final data = jsonDecode(response.body);
-        setState(() {
-          candidates = data['candidates'];
-          loading = false;
-        });
-      } else {
-        setState(() => loading = false);
-        ScaffoldMessenger.of(context).showSnackBar(
-          const SnackBar(content: Text('Failed to load candidates')),
-        );
-      }
+      setState(() {
+        candidates.addAll(page.items);
+        nextCursor = page.nextCursor;
+      });
+      _fillViewport();
     } catch (e) {
-      setState(() => loading = false);
       ScaffoldMessenger.of(context)
           .showSnackBar(SnackBar(content: Text('Error: $e')));
+    } finally {
+      setState(() {
+        loading = false;
+        loadingMore = false;
+      });
     }
   }
 
@@ -191,7 +218,7 @@ class _CandidateListScreenState extends State<CandidateListScreen> {
                                     ),
                                   ),
                                   Text(
-                                    "${candidates.length} candidates registered",
+                                    "${candidates.length}${nextCursor != null ? '+' : ''} candidates registered",
                                     style: GoogleFonts.inter(
                                       color: themeProvider.isDarkMode
                                           ? Colors.grey.shade400
@@ -239,13 +266,14 @@ class _CandidateListScreenState extends State<CandidateListScreen> {
                                       cardsPerRow;
 
                               return SingleChildScrollView(
+                                controller: _scrollController,
                                 padding:
                                     const EdgeInsets.symmetric(horizontal: 20),
                                 child: Wrap(
                                   spacing: 20,
                                   runSpacing: 20,
-                                  children:
-                                      candidates.asMap().entries.map((entry) {
+                                  children: [
+                                    ...candidates.asMap().entries.map((entry) {
                                     int index = entry.key;
                                     var c = entry.value;
 
@@ -574,7 +602,16 @@ class _CandidateListScreenState extends State<CandidateListScreen> {
                                         ),
                                       ),
                                     );
-                                  }).toList(),
+                                    }),
+                                    if (loadingMore)
+                                      const SizedBox(
+                                        width: double.infinity,
+                                        child: Center(
+                                          child: CircularProgressIndicator(
+                                              color: Colors.redAccent),
+                                        ),
+                                      ),
+                                  ],
                                 ),
                               );
                             },
@@ -2,6 +2,7 @@ import 'package:flutter/material.dart';
 import 'dart:convert';
 import 'package:http/http.dart' as http;
 import '../../services/auth_service.dart';
+import '../../utils/pagination.dart';
 
 class UserManagementScreen extends StatefulWidget {
   const UserManagementScreen({Key? key}) : super(key: key);
@@ -11,16 +12,41 @@ class UserManagementScreen extends StatefulWidget {
 }
 
 class _UserManagementScreenState extends State<UserManagementScreen> {
+  final ScrollController _scrollController = ScrollController();
   List<Map<String, dynamic>> users = [];
   List<String> roles = ["Admin", "HR", "Recruiter", "Viewer"];
+  bool loadingMore = false;
+  bool lastPage = false;
+  String? nextCursor;
 
   @override
   void initState() {
     super.initState();
+    _scrollController.addListener(_onScroll);
     _fetchRolesFromBackend();
     _fetchUsersFromBackend();
   }
 
+  @override
+  void dispose() {
+    _scrollController.dispose();
+    super.dispose();
+  }
+
+  void _onScroll() {
+    final position = _scrollController.position;
+    if (position.pixels >= position.maxScrollExtent - 400) {
+      _fetchUsersFromBackend();
+    }
+  }
+
+  // A page that does not fill the screen cannot be scrolled; keep loading
+  void _fillViewport() {
+    WidgetsBinding.instance.addPostFrameCallback((_) {
+      if (_scrollController.hasClients) _onScroll();
+    });
+  }
+
   Future<void> _fetchRolesFromBackend() async {
     await Future.delayed(const Duration(seconds: 1));
     setState(() {
@@ -28,27 +54,29 @@ class _UserManagementScreenState extends State<UserManagementScreen> {
     });
   }
 
+  // Loads the next page of users (the first one on the initial call)
   Future<void> _fetchUsersFromBackend() async {
+    if (loadingMore || lastPage) return;
+    setState(() => loadingMore = true);
     try {
       final token = await AuthService.getAccessToken();
       if (token == null) return;
 
-      final response = await http.get(
-        Uri.parse("http://127.0.0.1:5000/api/admin/users"),
-        headers: {
-          "Content-Type": "application/json",
-          "Authorization": "Bearer $token",
-        },
+      final page = await fetchPage(
+        "http://127.0.0.1:5000/api/admin/users",
+        token: token,
+        cursor: nextCursor,
       );
-
-      if (response.statusCode == 200) {
-        final data = jsonDecode(response.body);
-        setState(() {
-          users = List<Map<String, dynamic>>.from(data);
-        });
-      }
+      setState(() {
+        users.addAll(List<Map<String, dynamic>>.from(page.items));
+        nextCursor = page.nextCursor;
+        lastPage = !page.hasMore;
+      });
+      _fillViewport();
     } catch (e) {
       debugPrint("Error fetching users: $e");
+    } finally {
+      setState(() => loadingMore = false);
     }
   }
 
@@ -389,9 +417,12 @@ class _UserManagementScreenState extends State<UserManagementScreen> {
       body: Padding(
         padding: const EdgeInsets.all(16),
         child: ListView.separated(
-          itemCount: users.length,
+          controller: _scrollController,
+          itemCount: users.length + (loadingMore ? 1 : 0),
           separatorBuilder: (_, __) => const SizedBox(height: 12),
-          itemBuilder: (ctx, index) => buildUserCard(index),
+          itemBuilder: (ctx, index) => index < users.length
+              ? buildUserCard(index)
+              : const Center(child: CircularProgressIndicator()),
         ),
       ),
     );
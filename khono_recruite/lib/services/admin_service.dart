@@ -1,6 +1,7 @@
 import 'dart:convert';
 import 'package:http/http.dart' as http;
 import '../utils/api_endpoints.dart';
+import '../utils/pagination.dart';
 import 'auth_service.dart';
 
 class AdminService {
@@ -9,12 +10,11 @@ class AdminService {
   // ---------- JOBS ----------
   Future<List<dynamic>> listJobs() async {
     final token = await AuthService.getAccessToken();
-    final res = await http.get(
-      Uri.parse(ApiEndpoints.adminJobs),
-      headers: {...headers, 'Authorization': 'Bearer $token'},
-    );
-    if (res.statusCode == 200) return json.decode(res.body);
-    throw Exception('Failed to load jobs: ${res.body}');
+    try {
+      return await fetchAllPages(ApiEndpoints.adminJobs, token: token);
+    } catch (e) {
+      throw Exception('Failed to load jobs: $e');
+    }
   }
 
   Future<Map<String, dynamic>> createJob(Map<String, dynamic> data) async {
@@ -53,12 +53,12 @@ class AdminService {
   // ---------- CANDIDATES ----------
   Future<List<dynamic>> listCandidates() async {
     final token = await AuthService.getAccessToken();
-    final res = await http.get(
-      Uri.parse('${ApiEndpoints.adminBase}/candidates'),
-      headers: {...headers, 'Authorization': 'Bearer $token'},
-    );
-    if (res.statusCode == 200) return json.decode(res.body);
-    throw Exception('Failed to fetch candidates: ${res.body}');
+    try {
+      return await fetchAllPages('${ApiEndpoints.adminBase}/candidates',
+          token: token);
+    } catch (e) {
+      throw Exception('Failed to fetch candidates: $e');
+    }
   }
 
   Future<Map<String, dynamic>> getApplication(int applicationId) async {
@@ -204,17 +204,19 @@ class AdminService {
   }
 
   // ---------- CV REVIEWS ----------
-  Future<List<Map<String, dynamic>>> listCVReviews() async {
+  // One page per call; pass the previous page's nextCursor to get the next.
+  // [filters]: status, job_id, min_score, max_score, score_field, sort, order.
+  Future<PageResult> listCVReviews(
+      {Map<String, String> filters = const {},
+      String? cursor,
+      int pageSize = 30}) async {
     final token = await AuthService.getAccessToken();
-    final res = await http.get(
-      Uri.parse('${ApiEndpoints.adminBase}/cv-reviews'),
-      headers: {...headers, 'Authorization': 'Bearer $token'},
-    );
-
-    if (res.statusCode == 200) {
-      return List<Map<String, dynamic>>.from(json.decode(res.body));
+    try {
+      return await fetchPage('${ApiEndpoints.adminBase}/cv-reviews',
+          token: token, query: filters, cursor: cursor, pageSize: pageSize);
+    } catch (e) {
+      throw Exception('Failed to fetch CV reviews: $e');
     }
-    throw Exception('Failed to fetch CV reviews: ${res.body}');
   }
 
 // ---------- ASSESSMENTS ----------
@@ -1,6 +1,7 @@
 import 'dart:convert';
 import 'package:http/http.dart' as http;
 import '../utils/api_endpoints.dart';
+import '../utils/pagination.dart';
 
 class CandidateService {
   // ---------- SUBMIT ENROLLMENT ----------
@@ -20,22 +21,16 @@ class CandidateService {
   // ----------------- GET AVAILABLE JOBS -----------------
   static Future<List<Map<String, dynamic>>> getAvailableJobs(
       String token) async {
-    final response = await http.get(
-      Uri.parse("http://127.0.0.1:5000/api/candidate/jobs"),
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': 'Bearer $token',
-      },
-    );
-
-    if (response.statusCode == 200) {
-      final List<dynamic> data = jsonDecode(response.body);
+    try {
+      final data = await fetchAllPages(
+          "http://127.0.0.1:5000/api/candidate/jobs",
+          token: token);
       // Cast each item to Map<String, dynamic>
       return data
           .map<Map<String, dynamic>>((item) => Map<String, dynamic>.from(item))
           .toList();
-    } else {
-      throw Exception('Failed to fetch jobs: ${response.statusCode}');
+    } catch (e) {
+      throw Exception('Failed to fetch jobs: $e');
     }
   }
 
@@ -54,7 +49,48 @@ class CandidateService {
 
     final streamedResponse = await request.send();
     final responseString = await streamedResponse.stream.bytesToString();
-    return jsonDecode(responseString);
+    final resp = jsonDecode(responseString);
+
+    // The server queues the analysis (202), or reports the upload already
+    // in progress (409); either way wait for that job's result
+    if (isResumeJob(streamedResponse.statusCode, resp)) {
+      return waitForResumeJob(resp['job_id'], token);
+    }
+    return resp;
+  }
+
+  static bool isResumeJob(int statusCode, dynamic resp) =>
+      statusCode == 202 || (statusCode == 409 && resp['job_id'] != null);
+
+  // ---------- RESUME PROCESSING STATUS ----------
+  /// Polls a queued resume upload until the worker finishes it and returns
+  /// the analysis summary (cv_score, missing_skills, suggestions, ...).
+  static Future<Map<String, dynamic>> waitForResumeJob(
+      String jobId, String token,
+      {Duration interval = const Duration(seconds: 2),
+      Duration timeout = const Duration(minutes: 5)}) async {
+    final uri = Uri.parse('${ApiEndpoints.uploadResume}/jobs/$jobId');
+    final deadline = DateTime.now().add(timeout);
+    while (true) {
+      final response = await http.get(
+        uri,
+        headers: {'Authorization': 'Bearer $token'},
+      );
+      final job = jsonDecode(response.body);
+      if (response.statusCode != 200) {
+        throw Exception(job['error'] ?? 'Failed to fetch resume status');
+      }
+      if (job['status'] == 'succeeded') {
+        return Map<String, dynamic>.from(job['result'] ?? {});
+      }
+      if (job['status'] == 'dead') {
+        throw Exception(job['error'] ?? 'Resume analysis failed');
+      }
+      if (DateTime.now().isAfter(deadline)) {
+        throw Exception('Resume is still being analyzed, check back later');
+      }
+      await Future.delayed(interval);
+    }
   }
 
   // ---------- GET CANDIDATE APPLICATIONS ----------
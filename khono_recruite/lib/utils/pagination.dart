@@ -0,0 +1,75 @@
+import 'dart:convert';
+import 'package:http/http.dart' as http;
+
+/// Header carrying the cursor of the next page on paginated list endpoints.
+const nextCursorHeader = 'x-next-cursor';
+
+/// One page of a cursor-paginated list endpoint.
+class PageResult {
+  final List<dynamic> items;
+
+  /// Pass back as `cursor` to get the following page; null on the last page.
+  final String? nextCursor;
+
+  const PageResult(this.items, this.nextCursor);
+
+  bool get hasMore => nextCursor != null && nextCursor!.isNotEmpty;
+}
+
+/// Fetches the page of a cursor-paginated list endpoint that starts at
+/// [cursor] (the first page when null). [itemsKey] names the list inside
+/// the body when the endpoint wraps it in an object (e.g. `candidates`).
+/// Throws on any non-200 response.
+Future<PageResult> fetchPage(
+  String url, {
+  required String? token,
+  Map<String, String> query = const {},
+  String? itemsKey,
+  String? cursor,
+  int pageSize = 50,
+}) async {
+  final uri = Uri.parse(url).replace(queryParameters: {
+    ...query,
+    'limit': '$pageSize',
+    if (cursor != null) 'cursor': cursor,
+  });
+  final res = await http.get(uri, headers: {
+    'Content-Type': 'application/json',
+    'Authorization': 'Bearer $token',
+  });
+  if (res.statusCode != 200) {
+    throw Exception('Request failed (${res.statusCode}): ${res.body}');
+  }
+  final body = json.decode(res.body);
+  final next = res.headers[nextCursorHeader];
+  return PageResult(itemsKey == null ? body : body[itemsKey],
+      next == null || next.isEmpty ? null : next);
+}
+
+/// Fetches every page of a cursor-paginated list endpoint and returns the
+/// items in order. Only for lists that are small by nature (e.g. jobs for
+/// a dropdown); screens listing candidates or reviews should page with
+/// [fetchPage] as the user scrolls.
+Future<List<dynamic>> fetchAllPages(
+  String url, {
+  required String? token,
+  Map<String, String> query = const {},
+  String? itemsKey,
+  int pageSize = 500,
+}) async {
+  final items = <dynamic>[];
+  String? cursor;
+
+  do {
+    final page = await fetchPage(url,
+        token: token,
+        query: query,
+        itemsKey: itemsKey,
+        cursor: cursor,
+        pageSize: pageSize);
+    items.addAll(page.items);
+    cursor = page.nextCursor;
+  } while (cursor != null);
+
+  return items;
+}
@@ -5,7 +5,10 @@ from .extensions import (
     migrate, cors, bcrypt, oauth, limiter
 )
 from .models import *
-from .routes import auth, admin_routes, candidate_routes, ai_routes, mfa_routes, sso_routes, analytics_routes  # import sso_routes
+from .services import skill_index_service  # noqa: F401  registers the skill index flush hook
+from .services import analytics_rollup_service  # noqa: F401  registers the analytics rollup flush hook
+from .cli import register_cli
+from .routes import auth, admin_routes, candidate_routes, ai_routes, mfa_routes, sso_routes, analytics_routes, metrics_routes  # import sso_routes
 
 def create_app():
     app = Flask(__name__)
@@ -28,6 +31,7 @@ def create_app():
         origins=["*"],  # adjust for production
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
+        expose_headers=["X-Next-Cursor"],  # keyset pagination, see app/utils/pagination.py
         supports_credentials=True,
     )
 
@@ -38,11 +42,15 @@ def create_app():
     app.register_blueprint(ai_routes.ai_bp)
     app.register_blueprint(mfa_routes.mfa_bp, url_prefix="/api/auth")  # MFA routes
     app.register_blueprint(analytics_routes.analytics_bp, url_prefix="/api")
+    app.register_blueprint(metrics_routes.metrics_bp)  # Prometheus /metrics
 
     # ---------------- Register SSO Blueprint ----------------
     sso_routes.register_sso_provider(app)      # initialize Auth0 / SSO provider
     app.register_blueprint(sso_routes.sso_bp)  # SSO routes
 
+    # ---------------- CLI Commands ----------------
+    register_cli(app)
+
     # ---------------- Health Check Route ----------------
     @app.route("/api/health")
     def health():
@@ -0,0 +1,96 @@
+# app/cli.py
+import logging
+
+import click
+
+from app.extensions import db
+
+
+def register_cli(app):
+    """Attach the project's custom ``flask`` commands to the app."""
+
+    @app.cli.command("worker")
+    @click.option("--queue", "queues", multiple=True, default=["resume", "media"], show_default=True,
+                  help="Queue(s) to consume; repeat the option for several.")
+    @click.option("--burst", is_flag=True, help="Exit once the queues are empty.")
+    @click.option("--poll-timeout", default=5, show_default=True, help="Seconds to block waiting for a job.")
+    def worker(queues, burst, poll_timeout):
+        """Run a background job worker (resume processing, profile picture resizing, ...)."""
+        from app.services.job_queue import run_worker
+        # Importing the processing modules registers their job handlers
+        from app.services import profile_picture_service, resume_processing_service  # noqa: F401
+
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        try:
+            run_worker(list(queues), poll_timeout=poll_timeout, burst=burst,
+                       after_job=db.session.remove)
+        except KeyboardInterrupt:
+            click.echo("Worker stopped.")
+
+    @app.cli.command("dead-jobs")
+    @click.option("--queue", default="resume", show_default=True)
+    @click.option("--limit", default=20, show_default=True)
+    def dead_jobs(queue, limit):
+        """List jobs that exhausted their retries."""
+        from app.services.job_queue import JobQueue
+
+        q = JobQueue(queue)
+        click.echo(f"{queue}: {q.stats()}")
+        for job in q.dead_letters(limit):
+            click.echo(f"{job['id']}  {job.get('type')}  attempts={job['attempts']}  error={job.get('error')}")
+
+    @app.cli.command("reindex-skills")
+    def reindex_skills():
+        """Rebuild the candidate_skills index from candidate profiles and parsed CVs."""
+        from app.services.skill_index_service import rebuild_index
+
+        rows = rebuild_index()
+        click.echo(f"Indexed {rows} candidate skills.")
+
+    @app.cli.command("rebuild-rollups")
+    def rebuild_rollups():
+        """Recompute the analytics_rollups table from applications, assessments and interviews."""
+        from app.services.analytics_rollup_service import rebuild_rollups as rebuild
+
+        rows = rebuild()
+        click.echo(f"Wrote {rows} analytics rollup rows.")
+
+    @app.cli.command("explain-queries")
+    @click.option("--natural", is_flag=True,
+                  help="Keep sequential scans enabled and show the plans chosen for the current data.")
+    def explain_queries(natural):
+        """Check with EXPLAIN that the hot endpoint queries use their indexes."""
+        from app.services.query_plan_service import check_plans
+
+        try:
+            results = check_plans(natural=natural)
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+
+        for r in results:
+            status = "ok  " if r["ok"] else "MISS"
+            detail = ", ".join(r["indexes"]) or "no index"
+            if r["seq_scans"]:
+                detail += f"; seq scan on {', '.join(r['seq_scans'])}"
+            click.echo(f"{status} {r['name']:<32} expects {r['index']} -> {detail}")
+
+        missing = [r for r in results if not r["ok"]]
+        if missing and not natural:
+            raise click.ClickException(f"{len(missing)} of {len(results)} queries do not use their index")
+
+    @app.cli.command("analytics-queries")
+    def analytics_queries():
+        """Check the admin analytics endpoints stay within their database round trips."""
+        from app.services import admin_analytics_service
+        from app.utils.query_counter import count_queries
+
+        failed = 0
+        for name, expected in admin_analytics_service.EXPECTED_QUERIES.items():
+            with count_queries(db.engine) as counter:
+                getattr(admin_analytics_service, name)()
+            ok = counter.count <= expected
+            failed += not ok
+            click.echo(f"{'ok  ' if ok else 'FAIL'} {name:<24} {counter.count} queries (expected {expected})")
+        db.session.rollback()
+        if failed:
+            raise click.ClickException(f"{failed} analytics endpoint(s) exceed their query budget")
@@ -51,6 +51,28 @@ class Config:
     CV_UPLOAD_FOLDER = os.getenv('CV_UPLOAD_FOLDER', 'uploads/cvs')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
+    # Background jobs (flask worker)
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BACKOFF = int(os.getenv('JOB_RETRY_BACKOFF', 10))  # seconds, doubled per attempt
+    JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 24 * 3600))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', 15 * 60))
+    JOB_LLM_BUDGET_WAIT = int(os.getenv('JOB_LLM_BUDGET_WAIT', 120))  # seconds a job waits for AI budget
+    RESUME_UPLOAD_THREADS = int(os.getenv('RESUME_UPLOAD_THREADS', 4))  # concurrent Cloudinary uploads per worker
+
+    # Signed direct-to-Cloudinary uploads: how long an issued upload stays
+    # valid for completion, and size limits per upload kind
+    DIRECT_UPLOAD_TTL = int(os.getenv('DIRECT_UPLOAD_TTL', 15 * 60))
+    DIRECT_UPLOAD_MAX_DOCUMENT_BYTES = int(os.getenv('DIRECT_UPLOAD_MAX_DOCUMENT_BYTES', 10 * 1024 * 1024))
+    DIRECT_UPLOAD_MAX_IMAGE_BYTES = int(os.getenv('DIRECT_UPLOAD_MAX_IMAGE_BYTES', 5 * 1024 * 1024))
+
+    # Local pre-screen: resumes scoring below the threshold (0-100) or failing a
+    # knockout rule are not sent to the LLM
+    PRESCREEN_ENABLED = os.getenv('PRESCREEN_ENABLED', 'true').lower() == 'true'
+    PRESCREEN_LLM_THRESHOLD = float(os.getenv('PRESCREEN_LLM_THRESHOLD', 30))
+
+    # Bearer token required on /metrics when set
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
     # Frontend URL
     FRONTEND_URL = os.getenv('FRONTEND_URL')
     RATELIMIT_STORAGE_URI = "memory://"
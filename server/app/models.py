@@ -18,8 +18,15 @@ class User(db.Model):
     enrollment_completed = db.Column(db.Boolean, default=False)
     dark_mode = db.Column(db.Boolean, default=False)
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     first_login = db.Column(db.Boolean, default=True)
+
+    __table_args__ = (
+        # Logins look users up by lower(email)
+        db.Index('ix_users_email_lower', db.func.lower(email)),
+        # Keyset pagination of the admin user list
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
     # MFA Fields
     mfa_secret = db.Column(db.String(32), nullable=True)
@@ -93,12 +100,17 @@ class Requisition(db.Model):
     weightings = db.Column(JSON, default={'cv': 60, 'assessment': 40})
     assessment_pack = db.Column(JSON, default={"questions": []})
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     published_on = db.Column(db.DateTime, default=datetime.utcnow)
     vacancy = db.Column(db.Integer, default=1)
 
     applications = db.relationship('Application', back_populates='requisition', lazy=True)
 
+    __table_args__ = (
+        # Keyset pagination of the job lists
+        db.Index('ix_requisitions_created_at_id', 'created_at', 'id'),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -127,7 +139,7 @@ class Candidate(db.Model):
     __tablename__ = 'candidates'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
     full_name = db.Column(db.String(150))
     phone = db.Column(db.String(50))
     dob = db.Column(db.Date)
@@ -145,6 +157,8 @@ class Candidate(db.Model):
     portfolio = db.Column(db.String(500))
     cover_letter = db.Column(db.Text)
     profile_picture = db.Column(db.String(1024), nullable=True)
+    # {"64": {"webp": url, "jpg": url}, "128": {...}, ...} (see profile_picture_service)
+    profile_picture_variants = db.Column(JSON, nullable=True)
 
     # Structured sections
     education = db.Column(JSON, default=[])
@@ -167,6 +181,15 @@ class Candidate(db.Model):
     assessments = db.relationship('AssessmentResult', back_populates='candidate', lazy=True)
     analyses = db.relationship('CVAnalysis', back_populates='candidate', lazy=True)
 
+    def profile_picture_url(self, size: int = None, fmt: str = "jpg"):
+        """Smallest stored variant at least ``size`` px wide, else the full picture."""
+        variants = self.profile_picture_variants or {}
+        if size:
+            for width in sorted(int(w) for w in variants):
+                if width >= size and variants[str(width)].get(fmt):
+                    return variants[str(width)][fmt]
+        return self.profile_picture
+
     def to_dict(self):
         """Return candidate data for API responses."""
         return {
@@ -189,6 +212,7 @@ class Candidate(db.Model):
             "portfolio": self.portfolio,
             "cover_letter": self.cover_letter,
             "profile_picture": self.profile_picture,
+            "profile_picture_variants": self.profile_picture_variants,
             "education": self.education,
             "skills": self.skills,
             "work_experience": self.work_experience,
@@ -202,6 +226,23 @@ class Candidate(db.Model):
             "notifications_push": self.notifications_push,
         }
 
+# ------------------- CANDIDATE SKILL INDEX -------------------
+class CandidateSkill(db.Model):
+    """
+    Inverted index skill -> candidate, kept in sync by app.services.skill_index_service.
+    ``source`` is "profile" (Candidate.skills), "cv" (parsed CV on the profile)
+    or "application:<id>" (an application's parsed CV).
+    """
+    __tablename__ = 'candidate_skills'
+
+    skill = db.Column(db.String(100), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True)
+    source = db.Column(db.String(50), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_candidate_skills_candidate_id', 'candidate_id'),
+    )
+
 # ------------------- APPLICATION -------------------
 class Application(db.Model):
     __tablename__ = 'applications'
@@ -222,6 +263,13 @@ class Application(db.Model):
     last_saved_screen = db.Column(db.String(50))
     saved_at = db.Column(db.DateTime)
 
+    __table_args__ = (
+        db.Index('ix_applications_requisition_id', 'requisition_id'),
+        db.Index('ix_applications_candidate_id', 'candidate_id'),
+        db.Index('ix_applications_status', 'status'),
+        db.Index('ix_applications_created_at', 'created_at'),
+    )
+
     candidate = db.relationship('Candidate', back_populates='applications')
     requisition = db.relationship('Requisition', back_populates='applications')
     interviews = db.relationship('Interview', back_populates='application', lazy=True)
@@ -253,7 +301,7 @@ class Application(db.Model):
 class AssessmentResult(db.Model):
     __tablename__ = 'assessment_results'
     id = db.Column(db.Integer, primary_key=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False, index=True)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False)
     answers = db.Column(JSON, default={})
     scores = db.Column(JSON, default={})
@@ -284,9 +332,9 @@ class AssessmentResult(db.Model):
 class Interview(db.Model):
     __tablename__ = 'interviews'
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False, index=True)
     hiring_manager_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=True, index=True)
     scheduled_time = db.Column(db.DateTime, nullable=False)
     interview_type = db.Column(db.String(50), nullable=True)
     meeting_link = db.Column(db.String(255), nullable=True)
@@ -335,6 +383,83 @@ class CVAnalysis(db.Model):
     candidate = db.relationship('Candidate', back_populates='analyses')
 
 
+# ------------------- LLM USAGE (DAILY ROLLUP) -------------------
+class LLMUsageDaily(db.Model):
+    """One row per day, model and calling route; upserted by app.services.llm_usage_service."""
+    __tablename__ = "llm_usage_daily"
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    model = db.Column(db.String(150), nullable=False)
+    route = db.Column(db.String(150), nullable=False)
+    calls = db.Column(db.Integer, nullable=False, default=0)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    retries = db.Column(db.Integer, nullable=False, default=0)
+    prompt_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    completion_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    cost_usd = db.Column(db.Float, nullable=False, default=0)
+    latency_ms_total = db.Column(db.Float, nullable=False, default=0)
+    latency_ms_max = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'model', 'route', name='uq_llm_usage_daily'),
+    )
+
+    def to_dict(self):
+        return {
+            "day": self.day.isoformat(),
+            "model": self.model,
+            "route": self.route,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd or 0, 6),
+            "avg_latency_ms": round(self.latency_ms_total / self.calls, 1) if self.calls else 0,
+            "max_latency_ms": round(self.latency_ms_max or 0, 1),
+        }
+
+
+
+# ------------------- ANALYTICS ROLLUPS -------------------
+class AnalyticsRollup(db.Model):
+    """
+    Row counts per metric, month, requisition and status, kept in sync by
+    app.services.analytics_rollup_service. ``requisition_id`` 0 and ``status``
+    "" stand in for missing values (they are part of the unique key).
+    """
+    __tablename__ = "analytics_rollups"
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(20), nullable=False)
+    month = db.Column(db.Date, nullable=False)
+    requisition_id = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(50), nullable=False, default="")
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'month', 'requisition_id', 'status', name='uq_analytics_rollup'),
+    )
+
+# ------------------- RESUME DOCUMENTS (BY CONTENT HASH) -------------------
+class ResumeDocument(db.Model):
+    """
+    One row per distinct uploaded file (SHA-256 of its bytes): where it lives
+    on Cloudinary and its extracted text, so re-uploads skip both steps.
+    """
+    __tablename__ = "resume_documents"
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    filename = db.Column(db.String(255))
+    resume_url = db.Column(db.String(500))
+    text = db.Column(db.Text)
+    pages = db.Column(db.Integer)
+    truncated = db.Column(db.Boolean, default=False)
+    use_count = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 # ------------------- NOTIFICATION -------------------
 class Notification(db.Model):
     __tablename__ = 'notifications'
@@ -344,6 +469,11 @@ class Notification(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # A user's notifications, optionally unread only, newest first
+        db.Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+    )
+
     user = db.relationship('User', back_populates='notifications')
 
     def to_dict(self):
@@ -409,7 +539,7 @@ class AuditLog(db.Model):
     ip_address = db.Column(db.String(100), nullable=True)
     user_agent = db.Column(db.String(500), nullable=True)
     extra_data = db.Column(JSON, nullable=True)  # <- renamed from metadata
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -474,6 +604,11 @@ class Meeting(db.Model):
     cancelled_at = db.Column(db.DateTime, nullable=True)
     cancelled_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_meetings_organizer_id_start_time', 'organizer_id', 'start_time'),
+        db.Index('ix_meetings_start_time', 'start_time'),
+    )
+
     organizer = db.relationship("User", backref=db.backref("organized_meetings", lazy=True), foreign_keys=[organizer_id])
 
     def to_dict(self):
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.extensions import db
 from app.models import User, Requisition, Candidate, Application, AssessmentResult, Interview, Notification, AuditLog, Conversation, SharedNote, Meeting
@@ -7,6 +7,11 @@ from app.utils.decorators import role_required
 from app.services.email_service import EmailService
 from app.services.audit_service import AuditService
 from app.services.audit2 import AuditService
+from app.services import admin_analytics_service
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER, InvalidCursor, keyset_page, paginate_request, parse_limit, with_next_cursor,
+)
+from app.services.powerbi_export_service import EXPORT_FORMATS, build_export_query, export_columns, export_records
 from flask_cors import cross_origin
 from sqlalchemy import func, and_, or_
 import bleach
@@ -20,48 +25,7 @@ admin_bp = Blueprint("admin_bp", __name__)
 @role_required(["admin", "hiring_manager"])
 def get_dashboard_stats():
     """Get overall dashboard statistics"""
-    
-    # Total counts
-    total_users = User.query.count()
-    total_candidates = Candidate.query.count()
-    total_requisitions = Requisition.query.count()
-    total_applications = Application.query.count()
-    
-    # Application status breakdown
-    application_statuses = db.session.query(
-        Application.status,
-        func.count(Application.id)
-    ).group_by(Application.status).all()
-    
-    status_breakdown = {status: count for status, count in application_statuses}
-    
-    # Recent activity (last 7 days)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    
-    new_users_week = User.query.filter(User.created_at >= week_ago).count()
-    new_applications_week = Application.query.filter(Application.created_at >= week_ago).count()
-    new_requisitions_week = Requisition.query.filter(Requisition.created_at >= week_ago).count()
-    
-    # Average scores
-    avg_cv_score = db.session.query(func.avg(Application.cv_score)).scalar() or 0
-    avg_assessment_score = db.session.query(func.avg(Application.assessment_score)).scalar() or 0
-    
-    return jsonify({
-        'total_users': total_users,
-        'total_candidates': total_candidates,
-        'total_requisitions': total_requisitions,
-        'total_applications': total_applications,
-        'application_status_breakdown': status_breakdown,
-        'recent_activity': {
-            'new_users': new_users_week,
-            'new_applications': new_applications_week,
-            'new_requisitions': new_requisitions_week
-        },
-        'average_scores': {
-            'cv_score': round(float(avg_cv_score), 2),
-            'assessment_score': round(float(avg_assessment_score), 2)
-        }
-    })
+    return jsonify(admin_analytics_service.dashboard_stats())
 
 @admin_bp.route('/analytics/users-growth', methods=['GET'])
 @role_required(["admin", "hiring_manager"])
@@ -101,57 +65,7 @@ def get_users_growth():
 @role_required(["admin", "hiring_manager"])
 def get_applications_analysis():
     """Get detailed applications analysis"""
-    
-    # Applications by requisition
-    apps_by_requisition = db.session.query(
-        Requisition.title,
-        func.count(Application.id).label('application_count')
-    ).join(
-        Application, Requisition.id == Application.requisition_id
-    ).group_by(
-        Requisition.id, Requisition.title
-    ).order_by(
-        func.count(Application.id).desc()
-    ).limit(10).all()
-    
-    # Score distribution
-    score_ranges = [
-        ('0-20', 0, 20),
-        ('21-40', 21, 40),
-        ('41-60', 41, 60),
-        ('61-80', 61, 80),
-        ('81-100', 81, 100)
-    ]
-    
-    cv_score_distribution = []
-    for label, min_score, max_score in score_ranges:
-        count = Application.query.filter(
-            and_(
-                Application.cv_score >= min_score,
-                Application.cv_score <= max_score
-            )
-        ).count()
-        cv_score_distribution.append({'range': label, 'count': count})
-    
-    # Monthly applications
-    monthly_apps = db.session.query(
-        func.date_trunc('month', Application.created_at).label('month'),
-        func.count(Application.id).label('count')
-    ).group_by(
-        func.date_trunc('month', Application.created_at)
-    ).order_by('month').all()
-    
-    return jsonify({
-        'applications_by_requisition': [
-            {'requisition': title, 'count': count} 
-            for title, count in apps_by_requisition
-        ],
-        'cv_score_distribution': cv_score_distribution,
-        'monthly_applications': [
-            {'month': month.strftime('%Y-%m'), 'count': count} 
-            for month, count in monthly_apps
-        ]
-    })
+    return jsonify(admin_analytics_service.applications_analysis())
 
 @admin_bp.route('/analytics/interviews-analysis', methods=['GET'])
 @role_required(["admin", "hiring_manager"])
@@ -197,53 +111,8 @@ def get_interviews_analysis():
 @role_required(["admin", "hiring_manager"])
 def get_assessments_analysis():
     """Get assessments analysis"""
-    
-    # Assessment score distribution
-    assessment_score_ranges = [
-        ('0-20', 0, 20),
-        ('21-40', 21, 40),
-        ('41-60', 41, 60),
-        ('61-80', 61, 80),
-        ('81-100', 81, 100)
-    ]
-    
-    assessment_score_distribution = []
-    for label, min_score, max_score in assessment_score_ranges:
-        count = AssessmentResult.query.filter(
-            and_(
-                AssessmentResult.percentage_score >= min_score,
-                AssessmentResult.percentage_score <= max_score
-            )
-        ).count()
-        assessment_score_distribution.append({'range': label, 'count': count})
-    
-    # Recommendation breakdown
-    recommendation_breakdown = db.session.query(
-        AssessmentResult.recommendation,
-        func.count(AssessmentResult.id)
-    ).filter(AssessmentResult.recommendation.isnot(None)).group_by(
-        AssessmentResult.recommendation
-    ).all()
-    
-    # Average scores by requisition
-    avg_scores_by_req = db.session.query(
-        Requisition.title,
-        func.avg(AssessmentResult.percentage_score).label('avg_score')
-    ).join(Application, Application.requisition_id == Requisition.id).join(
-        AssessmentResult, AssessmentResult.application_id == Application.id
-    ).group_by(Requisition.id, Requisition.title).all()
-    
-    return jsonify({
-        'assessment_score_distribution': assessment_score_distribution,
-        'recommendation_breakdown': [
-            {'recommendation': rec, 'count': count} 
-            for rec, count in recommendation_breakdown
-        ],
-        'average_scores_by_requisition': [
-            {'requisition': title, 'avg_score': round(float(avg_score or 0), 2)} 
-            for title, avg_score in avg_scores_by_req
-        ]
-    })
+    return jsonify(admin_analytics_service.assessments_analysis())
+
 # ----------------- JOB CRUD -----------------
 @admin_bp.route("/jobs", methods=["POST"])
 @role_required(["admin", "hiring_manager"])
@@ -307,18 +176,42 @@ def get_job(job_id):
     job = Requisition.query.get_or_404(job_id)
     return jsonify(job.to_dict())
 
+# Columns that ?fields= may project on the list endpoints: what their serializers return
+JOB_FIELDS = (
+    "id", "title", "description", "job_summary", "responsibilities", "company_details", "qualifications",
+    "category", "required_skills", "min_experience", "knockout_rules", "weightings", "assessment_pack",
+    "created_by", "created_at", "published_on", "vacancy",
+)
+CANDIDATE_FIELDS = (
+    "id", "user_id", "full_name", "phone", "dob", "address", "gender", "bio", "title", "location",
+    "nationality", "id_number", "linkedin", "github", "cv_url", "cv_text", "portfolio", "cover_letter",
+    "profile_picture", "profile_picture_variants", "education", "skills", "work_experience",
+    "certifications", "languages", "documents", "profile", "cv_score", "dark_mode",
+    "notifications_email", "notifications_push",
+)
+USER_FIELDS = ("id", "email", "role", "is_verified", "enrollment_completed", "dark_mode", "created_at")
+
+
 @admin_bp.route("/jobs", methods=["GET"])
 @role_required(["admin", "hiring_manager"])
 def list_jobs():
-    jobs = Requisition.query.all()
-    return jsonify([job.to_dict() for job in jobs])
+    try:
+        jobs, page = paginate_request(Requisition.query, Requisition, lambda job: job.to_dict(),
+                                      fields_allowed=JOB_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return with_next_cursor(jsonify(jobs), page)
 
 # ----------------- CANDIDATE MANAGEMENT -----------------
 @admin_bp.route("/candidates", methods=["GET"])
 @role_required(["admin", "hiring_manager"])
 def list_candidates():
-    candidates = Candidate.query.all()
-    return jsonify([c.to_dict() for c in candidates])
+    try:
+        candidates, page = paginate_request(Candidate.query, Candidate, lambda c: c.to_dict(),
+                                            fields_allowed=CANDIDATE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return with_next_cursor(jsonify(candidates), page)
 
 @admin_bp.route("/applications/<int:application_id>", methods=["GET"])
 @role_required(["admin", "hiring_manager"])
@@ -408,45 +301,102 @@ def get_notifications(user_id):
 
 
 
+CV_REVIEW_SORTS = {
+    "id": Application.id,
+    "cv_score": Application.cv_score,
+    "assessment_score": Application.assessment_score,
+    "overall_score": Application.overall_score,
+}
+
+
 @admin_bp.route("/cv-reviews", methods=["GET", "OPTIONS"])
 @role_required(["admin", "hiring_manager"])
-@cross_origin()
+@cross_origin(expose_headers=[NEXT_CURSOR_HEADER])
 def list_cv_reviews():
+    """
+    One page of CV reviews, from a single joined query.
+
+    Query params:
+    - status, job_id: filters
+    - min_score, max_score: range on score_field (cv_score, assessment_score or overall_score; default cv_score)
+    - sort: id (default), cv_score, assessment_score or overall_score; order: asc (default) or desc
+    - limit (default 200, max 1000), cursor: from the previous page's X-Next-Cursor header
+    """
     if request.method == "OPTIONS":
         return '', 200
 
-    applications = Application.query.all()
-    reviews = []
-
-    for app in applications:
-        candidate = None
-        cv_url = None
-        cv_parser = app.cv_parser_result or {}
-
-        if app.candidate_id:
-            candidate = Candidate.query.get(app.candidate_id)
-            cv_url = candidate.cv_url if candidate else None
+    try:
+        sort = request.args.get("sort", "id")
+        score_field = request.args.get("score_field", "cv_score")
+        if sort not in CV_REVIEW_SORTS or score_field not in CV_REVIEW_SORTS or score_field == "id":
+            return jsonify({"error": "Invalid sort or score_field"}), 400
+        descending = request.args.get("order", "asc").lower() == "desc"
+        limit = parse_limit(request.args.get("limit"), default=200, maximum=1000)
+
+        parser = Application.cv_parser_result
+        query = db.session.query(
+            Application.id,
+            Application.status,
+            Application.resume_url,
+            Application.cv_score,
+            Application.recommendation,
+            Application.assessment_score,
+            Application.overall_score,
+            parser["skills"].label("skills"),
+            parser["education"].label("education"),
+            parser["work_experience"].label("work_experience"),
+            Candidate.id.label("candidate_id"),
+            Candidate.full_name,
+            Candidate.cv_url,
+        ).outerjoin(Candidate, Candidate.id == Application.candidate_id)
+
+        status = request.args.get("status")
+        if status:
+            query = query.filter(Application.status == status)
+        job_id = request.args.get("job_id", type=int)
+        if job_id:
+            query = query.filter(Application.requisition_id == job_id)
+        score_column = CV_REVIEW_SORTS[score_field]
+        min_score = request.args.get("min_score", type=float)
+        if min_score is not None:
+            query = query.filter(score_column >= min_score)
+        max_score = request.args.get("max_score", type=float)
+        if max_score is not None:
+            query = query.filter(score_column <= max_score)
+
+        # Scores may be NULL; sort them as -1 so the keyset stays total
+        if sort == "id":
+            sort_keys = [Application.id]
+            row_key = lambda row: [row.id]
+        else:
+            sort_value = func.coalesce(CV_REVIEW_SORTS[sort], -1)
+            sort_keys = [sort_value, Application.id]
+            row_key = lambda row: [getattr(row, sort) if getattr(row, sort) is not None else -1, row.id]
+
+        page = keyset_page(query, sort_keys, request.args.get("cursor"), limit, row_key, descending=descending)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+
+    reviews = [{
+        "application_id": row.id,
+        "status": row.status,
+        "resume_url": row.resume_url,
+        "cv_score": row.cv_score,
+        "cv_parser_result": {
+            "skills": row.skills or [],
+            "education": row.education or [],
+            "work_experience": row.work_experience or [],
+        },
+        "application_recommendation": row.recommendation,
+        "assessment_score": row.assessment_score,
+        "overall_score": row.overall_score,
 
-        reviews.append({
-            "application_id": app.id,
-            "status": app.status,
-            "resume_url": app.resume_url,
-            "cv_score": app.cv_score,
-            "cv_parser_result": {
-                "skills": cv_parser.get("skills", []),
-                "education": cv_parser.get("education", []),
-                "work_experience": cv_parser.get("work_experience", []),
-            },
-            "application_recommendation": app.recommendation,
-            "assessment_score": app.assessment_score,
-            "overall_score": app.overall_score,
-
-            "candidate_id": candidate.id if candidate else None,
-            "full_name": candidate.full_name if candidate else None,
-            "cv_url": cv_url,
-        })
+        "candidate_id": row.candidate_id,
+        "full_name": row.full_name,
+        "cv_url": row.cv_url,
+    } for row in page.items]
 
-    return jsonify(reviews), 200
+    return with_next_cursor((jsonify(reviews), 200), page)
 
 
 
@@ -454,13 +404,11 @@ def list_cv_reviews():
 @admin_bp.route("/users", methods=["GET"])
 @role_required(["admin"])
 def list_users():
-    users = User.query.all()
-    result = []
-    for u in users:
+    def serialize(u):
         profile = u.profile or {}
         full_name = profile.get("full_name") or profile.get("name") or None
 
-        result.append({
+        return {
             "id": u.id,
             "email": u.email,
             "role": u.role,
@@ -469,9 +417,13 @@ def list_users():
             "enrollment_completed": u.enrollment_completed,
             "dark_mode": u.dark_mode,
             "created_at": u.created_at.isoformat() if u.created_at else None
-        })
+        }
 
-    return jsonify(result), 200
+    try:
+        result, page = paginate_request(User.query, User, serialize, fields_allowed=USER_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return with_next_cursor((jsonify(result), 200), page)
 
 
 @admin_bp.route("/users/<int:user_id>", methods=["DELETE"])
@@ -606,14 +558,17 @@ def manage_interviews():
             enriched = []
             for i in interviews:
                 candidate_profile_picture = None
+                candidate_profile_thumbnail = None
                 if i.candidate and getattr(i.candidate, "profile_picture", None):
                     candidate_profile_picture = i.candidate.profile_picture
+                    candidate_profile_thumbnail = i.candidate.profile_picture_url(128)
 
                 enriched.append({
                     "id": i.id,
                     "candidate_id": i.candidate_id,
                     "candidate_name": i.candidate.full_name if i.candidate else None,
                     "candidate_profile_picture": candidate_profile_picture,
+                    "candidate_profile_thumbnail": candidate_profile_thumbnail,
                     "hiring_manager_id": i.hiring_manager_id,
                     "application_id": i.application_id,
                     "job_title": i.application.requisition.title if i.application and i.application.requisition else None,
@@ -682,6 +637,7 @@ def manage_interviews():
                 "candidate_id": interview.candidate_id,
                 "candidate_name": candidate_profile.full_name if candidate_profile else None,
                 "candidate_profile_picture": candidate_profile.profile_picture if candidate_profile and getattr(candidate_profile, "profile_picture", None) else None,
+                "candidate_profile_thumbnail": candidate_profile.profile_picture_url(128) if candidate_profile else None,
                 "hiring_manager_id": interview.hiring_manager_id,
                 "application_id": interview.application_id,
                 "job_title": interview.application.requisition.title if interview.application and interview.application.requisition else None,
@@ -1022,133 +978,50 @@ def powerbi_data():
     - candidate_id
     - status
     - start_date, end_date
+    - format: json (default, one array), ndjson or csv
+
+    Built by one set-based query (see powerbi_export_service) and streamed
+    one application at a time in every format.
     """
     try:
-        job_id = request.args.get("job_id", type=int)
-        candidate_id = request.args.get("candidate_id", type=int)
-        status = request.args.get("status", type=str)
-        start_date_str = request.args.get("start_date")
-        end_date_str = request.args.get("end_date")
-
-        # --- Base query ---
-        query = Application.query
-
-        if job_id:
-            query = query.filter_by(requisition_id=job_id)
-        if candidate_id:
-            query = query.filter_by(candidate_id=candidate_id)
-        if status:
-            query = query.filter_by(status=status)
-
-        if start_date_str:
-            try:
-                start_date = datetime.fromisoformat(start_date_str)
-                query = query.filter(Application.created_at >= start_date)
-            except ValueError:
-                return jsonify({"error": "Invalid start_date format"}), 400
-
-        if end_date_str:
-            try:
-                end_date = datetime.fromisoformat(end_date_str)
-                query = query.filter(Application.created_at <= end_date)
-            except ValueError:
-                return jsonify({"error": "Invalid end_date format"}), 400
-
-        applications = query.all()
-        data = []
-
-        for app in applications:
-            candidate = app.candidate
-            user = candidate.user if candidate else None
-            job = app.requisition
-
-            assessment = AssessmentResult.query.filter_by(application_id=app.id).first()
-            interviews = Interview.query.filter_by(application_id=app.id).all()
-
-            # Pull latest CV Analysis
-            cv_analysis = CVAnalysis.query.filter_by(candidate_id=app.candidate_id) \
-                .order_by(CVAnalysis.created_at.desc()).first()
-
-            # Count experience & education
-            experience_count = (
-                Experience.query.filter_by(candidate_id=candidate.id).count()
-                if candidate else 0
-            )
-
-            education_count = (
-                Education.query.filter_by(candidate_id=candidate.id).count()
-                if candidate else 0
-            )
-
-            data.append({
-                # ------------------
-                # APPLICATION
-                # ------------------
-                "application_id": app.id,
-                "application_status": app.status,
-                "cv_score": app.cv_score,
-                "assessment_score": app.assessment_score,
-                "overall_score": app.overall_score,
-                "created_at": app.created_at.isoformat() if app.created_at else None,
-                "saved_at": app.saved_at.isoformat() if hasattr(app, "saved_at") else None,
-                "last_saved_screen": getattr(app, "last_saved_screen", None),
-
-                # Assessment extra fields
-                "assessment_total_score": assessment.total_score if assessment else None,
-                "assessment_percentage": assessment.percentage if assessment else None,
-                "recommendation": assessment.recommendation if assessment else None,
-
-                # ------------------
-                # CANDIDATE
-                # ------------------
-                "candidate_id": candidate.id if candidate else None,
-                "candidate_name": candidate.full_name if candidate else None,
-                "candidate_email": user.email if user else None,
-                "candidate_phone": candidate.phone if candidate else None,
-                "candidate_title": candidate.title if candidate else None,
-                "candidate_location": candidate.location if candidate else None,
-                "candidate_skills": candidate.skills if candidate else None,
-                "candidate_verified": user.is_verified if user else None,
-                "experience_count": experience_count,
-                "education_count": education_count,
-                "linkedin": candidate.linkedin if candidate else None,
-
-                # ------------------
-                # JOB
-                # ------------------
-                "job_id": job.id if job else None,
-                "job_title": job.title if job else None,
-                "job_category": job.category if job else None,
-                "job_created_at": job.created_at.isoformat() if job and job.created_at else None,
-                "job_published_on": job.published_on.isoformat() if job and job.published_on else None,
-                "job_required_skills": job.required_skills if job else None,
-
-                # ------------------
-                # INTERVIEWS
-                # ------------------
-                "interview_count": len(interviews),
-                "interview_dates": [i.scheduled_time.isoformat() for i in interviews],
-                "interview_types": [i.type for i in interviews],
-                "interview_statuses": [i.status for i in interviews],
-                "interview_hiring_managers": [
-                    User.query.get(i.hiring_manager_id).full_name
-                    if i.hiring_manager_id else None for i in interviews
-                ],
-
-                # ------------------
-                # CV ANALYSIS
-                # ------------------
-                "cv_skills_match": cv_analysis.skills_match if cv_analysis else None,
-                "cv_missing_skills": cv_analysis.missing_skills if cv_analysis else None,
-                "cv_analysis_date": cv_analysis.created_at.isoformat() if cv_analysis else None,
-            })
-
-        return jsonify(data), 200
-
+        export_format = request.args.get("format", "json").lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({"error": f"Unsupported format; use one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+        filters = {
+            "job_id": request.args.get("job_id", type=int),
+            "candidate_id": request.args.get("candidate_id", type=int),
+            "status": request.args.get("status", type=str),
+        }
+        for name in ("start_date", "end_date"):
+            value = request.args.get(name)
+            if value:
+                try:
+                    filters[name] = datetime.fromisoformat(value)
+                except ValueError:
+                    return jsonify({"error": f"Invalid {name} format"}), 400
+
+        query = build_export_query(**filters)
     except Exception as e:
         current_app.logger.error(f"Power BI filtered data error: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
+    mimetype, serialise = EXPORT_FORMATS[export_format]
+
+    def generate():
+        try:
+            yield from serialise(export_records(query), export_columns(query))
+        except Exception as e:
+            # Headers are already sent; the truncated body tells the client it failed
+            current_app.logger.error(f"Power BI export failed mid-stream: {e}", exc_info=True)
+
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    if export_format == "csv":
+        response.headers["Content-Disposition"] = "attachment; filename=powerbi_data.csv"
+    # Stop reverse proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 
 @admin_bp.route("/powerbi/status", methods=["GET"])
 @role_required(["admin"])
@@ -1204,20 +1077,75 @@ def download_application_cv(application_id):
 @role_required(["admin", "hiring_manager"])
 def get_all_candidates():
     """
-    Fetch all candidates with their profile info.
+    Fetch candidates with their profile info, a page at a time.
+    "total" counts all candidates; the next page's cursor is in X-Next-Cursor.
     """
     try:
-        candidates = Candidate.query.all()
-        enriched = [c.to_dict() for c in candidates]
+        enriched, page = paginate_request(Candidate.query, Candidate, lambda c: c.to_dict(),
+                                          fields_allowed=CANDIDATE_FIELDS)
 
-        return jsonify({
-            "total": len(enriched),
+        return with_next_cursor((jsonify({
+            "total": db.session.query(func.count(Candidate.id)).scalar(),
             "candidates": enriched
-        }), 200
+        }), 200), page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching candidates: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
-    
+
+
+def _skill_list(name):
+    """Skills from ?name=python,aws or repeated ?name=python&name=aws."""
+    return [s.strip() for value in request.args.getlist(name) for s in value.split(",") if s.strip()]
+
+
+@admin_bp.route("/candidates/skill-search", methods=["GET"])
+@role_required(["admin", "hiring_manager"])
+def search_candidates_by_skill():
+    """
+    Boolean skill search over the candidate_skills index.
+    ?all=python,aws  -> candidates with every listed skill
+    ?any=react,vue   -> candidates with at least one listed skill
+    Both may be combined. Aliases are resolved (js -> javascript).
+    Paged with ?limit and ?cursor like the other listings; the next page's
+    cursor is in the X-Next-Cursor header.
+    """
+    all_skills = _skill_list("all")
+    any_skills = _skill_list("any")
+    if not all_skills and not any_skills:
+        return jsonify({"error": "Provide skills via 'all' and/or 'any'"}), 400
+
+    def serialize(candidate):
+        return {
+            "id": candidate.id,
+            "user_id": candidate.user_id,
+            "full_name": candidate.full_name,
+            "title": candidate.title,
+            "location": candidate.location,
+            "cv_score": candidate.cv_score,
+        }
+
+    try:
+        from app.services.skill_index_service import matched_skills, search_candidate_ids
+
+        ids_query = search_candidate_ids(all_skills, any_skills)
+        total = ids_query.count()
+        matching = Candidate.query.filter(Candidate.id.in_(ids_query.order_by(None)))
+        candidates, page = paginate_request(matching, Candidate, serialize, default_limit=50, max_limit=200)
+
+        page_ids = [c["id"] for c in candidates]
+        matches = matched_skills(page_ids, all_skills + any_skills) if page_ids else {}
+        for candidate in candidates:
+            candidate["matched_skills"] = matches.get(candidate["id"], [])
+
+        return with_next_cursor((jsonify({"total": total, "candidates": candidates}), 200), page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error searching candidates by skill: {e}", exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
 @admin_bp.route('/api/auth/enroll_mfa/<int:user_id>', methods=['POST'])
 @jwt_required()
 def enroll_mfa(user_id):
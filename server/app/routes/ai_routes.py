@@ -1,23 +1,68 @@
 # app/routes/ai_routes.py
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import get_jwt_identity
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 from app.utils.decorators import role_required
 from app.services.ai_parser_service import analyse_resume_gemini
 from app.extensions import db, cloudinary_client
-from app.models import CVAnalysis, Conversation, Candidate, User
+from app.models import CVAnalysis, Conversation, Candidate, LLMUsageDaily, User
+from app.utils.token_bucket import BudgetExhaustedError
 import cloudinary.uploader
 import datetime
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 ai_bp = Blueprint("ai_bp", __name__, url_prefix="/api/ai")
 
 
+def _optional_user_id():
+    """JWT identity if the caller sent a valid token, otherwise None."""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _save_conversation(user_id, message, reply):
+    try:
+        conv = Conversation(user_id=user_id, user_message=message, assistant_message=reply)
+        db.session.add(conv)
+        db.session.commit()
+        return conv
+    except Exception:
+        db.session.rollback()
+        logger.exception("Failed to save conversation")
+        return None
+
+
+def _throttled(retry_after):
+    """429 for callers over their AI budget (or while the global budget is saturated)."""
+    response = jsonify({"error": "Too many AI requests, please retry shortly"})
+    response.headers["Retry-After"] = str(max(1, int(retry_after or 1)))
+    return response, 429
+
+
+def _sse(data, event=None):
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+def _wants_stream(data):
+    flag = request.args.get("stream", data.get("stream"))
+    if str(flag).lower() in ("1", "true", "yes"):
+        return True
+    return "text/event-stream" in request.headers.get("Accept", "")
+
+
 @ai_bp.route("/chat", methods=["POST"])
 def chat():
     """
     Public chat endpoint (optionally require auth if desired).
     body: {"message": "hello"}
+    Add ?stream=true (or Accept: text/event-stream) to receive the reply as
+    server-sent events: "data: {"delta": ...}" frames followed by a final
+    "event: done" frame carrying the full reply.
     """
     data = request.get_json(silent=True) or {}
     message = (data.get("message") or "").strip()
@@ -28,27 +73,22 @@ def chat():
     from app.services.ai_service import AIService
     ai = AIService()
 
+    # Optionally persist conversation if authenticated
+    user_id = _optional_user_id()
+
+    if _wants_stream(data):
+        return _stream_chat(ai, message, user_id)
+
     try:
         reply = ai.chat(message)
 
-        # Optionally persist conversation if authenticated
-        user_id = None
-        try:
-            user_id = get_jwt_identity()
-        except Exception:
-            user_id = None
-
         if user_id:
-            try:
-                conv = Conversation(user_id=user_id, user_message=message, assistant_message=reply)
-                db.session.add(conv)
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
-                logger.exception("Failed to save conversation")
+            _save_conversation(user_id, message, reply)
 
         return jsonify({"reply": reply}), 200
 
+    except BudgetExhaustedError as e:
+        return _throttled(e.retry_after)
     except Exception as e:
         logger.exception("Chat error")
         return jsonify({
@@ -57,6 +97,44 @@ def chat():
         }), 502  # use 502 Bad Gateway for upstream AI errors
 
 
+def _stream_chat(ai, message, user_id):
+    try:
+        # Connects (and retries) up front so upstream failures still get a 502
+        deltas = ai.chat_stream(message)
+    except BudgetExhaustedError as e:
+        return _throttled(e.retry_after)
+    except Exception as e:
+        logger.exception("Chat stream error")
+        return jsonify({
+            "error": "AI chat failed",
+            "details": str(e)
+        }), 502
+
+    def generate():
+        parts = []
+        try:
+            for delta in deltas:
+                parts.append(delta)
+                yield _sse({"delta": delta})
+        except Exception as e:
+            logger.exception("Chat stream interrupted")
+            yield _sse({"error": "AI chat failed", "details": str(e)}, event="error")
+            return
+
+        reply = "".join(parts)
+        conv = _save_conversation(user_id, message, reply) if user_id else None
+        yield _sse({"reply": reply, "conversation_id": conv.id if conv else None}, event="done")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # keep proxies from buffering the stream
+        },
+    )
+
+
 @ai_bp.route("/parse_cv", methods=["POST"])
 @role_required(["candidate"])
 def parse_cv():
@@ -96,8 +174,30 @@ def parse_cv():
         if not cv_text:
             return jsonify({"error": "cv_text is required (or upload text)"}), 400
 
+    # ?refresh=true (or "refresh" in the body) skips the analysis cache
+    refresh = request.args.get("refresh") or request.form.get("refresh") or (request.get_json(silent=True) or {}).get("refresh")
+    use_cache = str(refresh).lower() not in ("1", "true", "yes")
+
     # Run Gemini CV analysis with safe fallback
-    parser_result = analyse_resume_gemini(cv_text=cv_text, job_description=job_description)
+    parser_result = analyse_resume_gemini(cv_text=cv_text, job_description=job_description,
+                                          use_cache=use_cache, candidate_id=candidate.id)
+
+    if parser_result.get("throttled"):
+        return _throttled(parser_result.get("retry_after"))
+
+    if parser_result.get("circuit_open"):
+        # AI provider is down and there is nothing to fall back on; fail fast
+        response = jsonify({"error": "AI analysis is temporarily unavailable, please retry shortly"})
+        response.headers["Retry-After"] = str(int(parser_result.get("retry_after") or 30))
+        return response, 503
+
+    if parser_result.get("stale"):
+        # Served from an earlier analysis; nothing new to store
+        return jsonify({
+            "message": "AI analysis is temporarily unavailable; returning your last analysis for this job",
+            "parser_result": parser_result,
+            "cv_url": resume_url,
+        }), 200
 
     # Save analysis record
     try:
@@ -138,6 +238,50 @@ def parse_cv():
 
 
 
+@ai_bp.route("/cache/stats", methods=["GET"])
+@role_required(["admin"])
+def cache_stats():
+    """Hit/miss counters and size of the CV analysis cache."""
+    from app.services.ai_service import analysis_cache
+    return jsonify(analysis_cache.stats()), 200
+
+
+@ai_bp.route("/transport/stats", methods=["GET"])
+@role_required(["admin"])
+def transport_stats():
+    """Per-attempt latency, outcome counts and retry sleep time for OpenRouter calls (this worker)."""
+    from app.services.ai_service import AIService
+    return jsonify(AIService.transport_stats()), 200
+
+
+@ai_bp.route("/usage", methods=["GET"])
+@role_required(["admin"])
+def llm_usage():
+    """
+    Daily LLM usage rollup (all workers): calls, failures, retries, tokens,
+    cost and latency per model and calling route. ?days=7 (max 90).
+    """
+    days = min(max(request.args.get("days", 7, type=int), 1), 90)
+    since = datetime.datetime.utcnow().date() - datetime.timedelta(days=days - 1)
+    rows = (
+        LLMUsageDaily.query
+        .filter(LLMUsageDaily.day >= since)
+        .order_by(LLMUsageDaily.day.desc(), LLMUsageDaily.cost_usd.desc())
+        .all()
+    )
+    return jsonify({
+        "since": since.isoformat(),
+        "rows": [row.to_dict() for row in rows],
+        "totals": {
+            "calls": sum(r.calls for r in rows),
+            "failures": sum(r.failures for r in rows),
+            "prompt_tokens": sum(r.prompt_tokens for r in rows),
+            "completion_tokens": sum(r.completion_tokens for r in rows),
+            "cost_usd": round(sum(r.cost_usd or 0 for r in rows), 6),
+        },
+    }), 200
+
+
 @ai_bp.route("/analysis/<int:analysis_id>", methods=["GET"])
 @role_required(["candidate"])
 def get_analysis(analysis_id):
@@ -1,11 +1,12 @@
 from flask import Blueprint, jsonify
-from sqlalchemy import func, cast, Date, text, case
+from sqlalchemy import func, cast, Date, text
 from app.extensions import db
 from app.models import (
     Application, Requisition, Interview,
     AssessmentResult, Candidate, CVAnalysis
 )
 import json
+from app.services import analytics_rollup_service, skill_index_service
 
 analytics_bp = Blueprint("analytics_bp", __name__)
 
@@ -123,49 +124,25 @@ def time_per_stage():
 # ------------------------------------------------------------
 @analytics_bp.route("/analytics/applications/monthly")
 def monthly_applications():
-    results = (
-        db.session.query(
-            func.date_trunc("month", Application.created_at).label("month"),
-            func.count(Application.id)
-        )
-        .group_by(func.date_trunc("month", Application.created_at))
-        .order_by(func.date_trunc("month", Application.created_at))
-        .all()
-    )
-
     return jsonify([
-        {"month": r.month.strftime("%Y-%m"), "applications": r[1]}
-        for r in results
+        {"month": r["month"], "applications": r["total"]}
+        for r in analytics_rollup_service.monthly(analytics_rollup_service.APPLICATIONS)
     ])
 
 
 # ------------------------------------------------------------
 # 7. CV SCREENING DROP TREND
 # ------------------------------------------------------------
-# CV SCREENING DROP TREND
 @analytics_bp.route("/analytics/cv-screening-drop")
 def cv_screening_drop():
-    results = (
-        db.session.query(
-            func.date_trunc("month", Application.created_at).label("month"),
-            func.count(Application.id).label("total"),
-            func.sum(
-                case(
-                    (Application.status == "rejected", 1),
-                    else_=0
-                )
-            ).label("rejected")
-        )
-        .group_by(func.date_trunc("month", Application.created_at))
-        .all()
-    )
+    results = analytics_rollup_service.monthly(analytics_rollup_service.APPLICATIONS, "rejected")
 
     return jsonify([
         {
-            "month": r.month.strftime("%Y-%m"),
-            "total_applications": r.total,
-            "rejected": r.rejected,
-            "drop_rate_percent": round((r.rejected / r.total * 100), 2) if r.total else 0
+            "month": r["month"],
+            "total_applications": r["total"],
+            "rejected": r["rejected"],
+            "drop_rate_percent": round((r["rejected"] / r["total"] * 100), 2) if r["total"] else 0
         }
         for r in results
     ])
@@ -174,27 +151,14 @@ def cv_screening_drop():
 # ASSESSMENT PASS RATE TREND
 @analytics_bp.route("/analytics/assessments/pass-rate")
 def assessment_pass_rate():
-    results = (
-        db.session.query(
-            func.date_trunc("month", AssessmentResult.created_at).label("month"),
-            func.count(AssessmentResult.id).label("taken"),
-            func.sum(
-                case(
-                    (AssessmentResult.percentage_score >= 50, 1),
-                    else_=0
-                )
-            ).label("passed")
-        )
-        .group_by(func.date_trunc("month", AssessmentResult.created_at))
-        .all()
-    )
+    results = analytics_rollup_service.monthly(analytics_rollup_service.ASSESSMENTS, "passed")
 
     return jsonify([
         {
-            "month": r.month.strftime("%Y-%m") if r.month else None,
-            "taken": r.taken,
-            "passed": r.passed,
-            "pass_rate_percent": round((r.passed / r.taken * 100), 2) if r.taken else 0
+            "month": r["month"],
+            "taken": r["total"],
+            "passed": r["passed"],
+            "pass_rate_percent": round((r["passed"] / r["total"] * 100), 2) if r["total"] else 0
         }
         for r in results
     ])
@@ -206,19 +170,9 @@ def assessment_pass_rate():
 # ------------------------------------------------------------
 @analytics_bp.route("/analytics/interviews/scheduled")
 def interview_scheduling():
-    results = (
-        db.session.query(
-            func.date_trunc("month", Interview.created_at).label("month"),
-            func.count(Interview.id)
-        )
-        .group_by(func.date_trunc("month", Interview.created_at))
-        .order_by(func.date_trunc("month", Interview.created_at))
-        .all()
-    )
-
     return jsonify([
-        {"month": r.month.strftime("%Y-%m"), "interviews": r[1]}
-        for r in results
+        {"month": r["month"], "interviews": r["total"]}
+        for r in analytics_rollup_service.monthly(analytics_rollup_service.INTERVIEWS)
     ])
 
 
@@ -227,18 +181,8 @@ def interview_scheduling():
 # ------------------------------------------------------------
 @analytics_bp.route("/analytics/offers-by-category")
 def offers_by_category():
-    results = (
-        db.session.query(
-            Requisition.category,
-            func.count(Application.id)
-        )
-        .join(Application, Application.requisition_id == Requisition.id)
-        .filter(Application.status == "recommended")
-        .group_by(Requisition.category)
-        .all()
-    )
-
-    return jsonify([{"category": r[0], "offers": r[1]} for r in results])
+    results = analytics_rollup_service.count_by_category(analytics_rollup_service.APPLICATIONS, "recommended")
+    return jsonify([{"category": category, "offers": offers} for category, offers in results])
 
 
 # ============================================================
@@ -268,16 +212,8 @@ def avg_assessment_score():
 # ------------------------------------------------------------
 @analytics_bp.route("/analytics/candidate/skills-frequency")
 def skill_frequency():
-    candidates = Candidate.query.with_entities(Candidate.skills).all()
-    freq = {}
-
-    for c in candidates:
-        if not c.skills:
-            continue
-        for skill in c.skills:
-            freq[skill] = freq.get(skill, 0) + 1
-
-    return jsonify(freq)
+    # Served from the candidate_skills index instead of scanning every candidate
+    return jsonify(skill_index_service.skill_frequency())
 
 
 # ------------------------------------------------------------
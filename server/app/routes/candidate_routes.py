@@ -3,6 +3,8 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.extensions import db, cloudinary_client
 from werkzeug.security import check_password_hash, generate_password_hash
 from app.extensions import bcrypt
+import io
+import uuid
 import cloudinary.uploader
 from app.models import (
     User, Candidate, Requisition, Application, AssessmentResult, Notification, AuditLog
@@ -10,11 +12,17 @@ from app.models import (
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
-from app.services.cv_parser_service import HybridResumeAnalyzer
+from app.services.resume_processing_service import (
+    enqueue_resume_analysis, resume_queue, RESUME_JOB_TYPE
+)
+from app.services.resume_document_service import read_and_hash
+from app.services.direct_upload_service import DirectUploadError, consume_upload, issue_upload, verify_upload
+from app.services.profile_picture_service import enqueue_variants
+from app.services.text_extraction_service import DocumentTooLarge, UnsupportedDocument, get_extractor
 from app.utils.decorators import role_required
 from app.utils.helper import get_current_candidate
+from app.utils.pagination import paginate_request, with_next_cursor
 from app.services.audit2 import AuditService
-import fitz
 
 
 
@@ -78,6 +86,14 @@ def apply_job(job_id):
 
 
 # ----------------- GET AVAILABLE JOBS -----------------
+# Columns that ?fields= may project: those the serializer below returns
+AVAILABLE_JOB_FIELDS = (
+    "id", "title", "description", "responsibilities", "qualifications", "required_skills", "min_experience",
+    "knockout_rules", "weightings", "assessment_pack", "company_details", "category", "published_on",
+    "vacancy", "created_by",
+)
+
+
 @candidate_bp.route("/jobs", methods=["GET"])
 @role_required(["candidate"])
 def get_available_jobs():
@@ -85,11 +101,8 @@ def get_available_jobs():
         # Get the candidate's user ID from JWT
         user_id = get_jwt_identity()
 
-        jobs = Requisition.query.all()
-        result = []
-
-        for job in jobs:
-            result.append({
+        def serialize(job):
+            return {
                 "id": job.id,
                 "title": job.title or "",
                 "description": job.description or "",
@@ -105,17 +118,24 @@ def get_available_jobs():
                 "published_on": job.published_on.strftime("%d %b, %Y") if job.published_on else "",
                 "vacancy": str(job.vacancy or 0),
                 "created_by": job.created_by
-            })
+            }
 
-        # Audit log (candidate viewed jobs)
-        AuditService.record_action(
-            admin_id=user_id,          # user_id is the candidate ID
-            action="Candidate Viewed Available Jobs",
-            target_user_id=user_id,
-            details="Retrieved list of available jobs"
-        )
+        try:
+            result, page = paginate_request(Requisition.query, Requisition, serialize,
+                                            fields_allowed=AVAILABLE_JOB_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Audit log (candidate viewed jobs), once per listing rather than per page
+        if not request.args.get("cursor"):
+            AuditService.record_action(
+                admin_id=user_id,          # user_id is the candidate ID
+                action="Candidate Viewed Available Jobs",
+                target_user_id=user_id,
+                details="Retrieved list of available jobs"
+            )
 
-        return jsonify(result), 200
+        return with_next_cursor((jsonify(result), 200), page)
 
     except Exception as e:
         current_app.logger.error(f"Get available jobs error: {e}", exc_info=True)
@@ -128,7 +148,6 @@ def get_available_jobs():
 def upload_resume(application_id):
     try:
         application = Application.query.get_or_404(application_id)
-        candidate = application.candidate
         job = application.requisition
 
         if application.candidate.user.id != int(get_jwt_identity()):
@@ -141,42 +160,33 @@ def upload_resume(application_id):
             return jsonify({"error": "No resume uploaded"}), 400
 
         file = request.files["resume"]
+        user_id = get_jwt_identity()
+        file_bytes, content_sha256 = read_and_hash(file.stream)
+
+        # Formats are sniffed from the content, not the file extension
+        try:
+            get_extractor(file_bytes)
+        except UnsupportedDocument:
+            return jsonify({"error": "Unsupported resume format. Upload a PDF, DOCX, RTF or TXT file."}), 415
+        except DocumentTooLarge as e:
+            return jsonify({"error": f"Resume is too large (max {e.limit // (1024 * 1024)} MB for {e.kind.upper()})"}), 413
+
+        # --- Hand the slow work (upload, extraction, AI analysis) to the worker ---
+        job_id, created = enqueue_resume_analysis(
+            application,
+            user_id=user_id,
+            file_bytes=file_bytes,
+            filename=secure_filename(file.filename or "") or "resume",
+            resume_text=request.form.get("resume_text", ""),
+            content_sha256=content_sha256,
+        )
+        if not created:
+            return jsonify({
+                "error": "Resume is already being processed",
+                "job_id": job_id,
+                "status_url": f"/api/candidate/upload_resume/jobs/{job_id}"
+            }), 409
 
-        # --- Upload to Cloudinary ---
-        resume_url = HybridResumeAnalyzer.upload_cv(file)
-        if not resume_url:
-            return jsonify({"error": "Failed to upload resume"}), 500
-
-        # --- Extract PDF text if needed ---
-        resume_text = request.form.get("resume_text", "")
-        if not resume_text and file.filename.lower().endswith(".pdf"):
-            file.stream.seek(0)
-            pdf_doc = fitz.open(stream=file.stream.read(), filetype="pdf")
-            resume_text = ""
-            for page in pdf_doc:
-                resume_text += page.get_text()
-
-        # --- Hybrid Resume Analysis ---
-        analyzer = HybridResumeAnalyzer()
-        parser_result = analyzer.analyse(resume_text, job.id)
-
-        # --- Save results ---
-        application.resume_url = resume_url
-        application.cv_score = parser_result.get("match_score", 0)
-        application.cv_parser_result = parser_result
-        application.recommendation = parser_result.get("recommendation", "")
-        db.session.commit()
-
-        # --- Notify admins ---
-        admins = User.query.filter_by(role="admin").all()
-        for admin in admins:
-            notif = Notification(
-                user_id=admin.id,
-                message=f"{candidate.full_name} submitted resume for {job.title}."
-            )
-            db.session.add(notif)
-        db.session.commit()
-        
         # Audit log
         AuditService.record_action(
             admin_id=user_id,
@@ -186,26 +196,56 @@ def upload_resume(application_id):
             extra_data={
                 "application_id": application_id,
                 "job_id": job.id,
-                "cv_score": parser_result.get("match_score", 0),
-                "recommendation": parser_result.get("recommendation", "")
+                "processing_job_id": job_id
             }
         )
 
         return jsonify({
-            "message": "Resume uploaded and analyzed",
-            "cv_score": application.cv_score,
-            "missing_skills": parser_result.get("missing_skills", []),
-            "suggestions": parser_result.get("suggestions", []),
-            "recommendation": application.recommendation,
-            "resume_url": resume_url,
-            "raw_parser_text": parser_result.get("raw_text", "")
-        }), 200
+            "message": "Resume received and queued for analysis",
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/candidate/upload_resume/jobs/{job_id}"
+        }), 202
 
     except Exception as e:
         current_app.logger.error(f"Upload resume error: {e}", exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 
+# ----------------- RESUME PROCESSING STATUS -----------------
+@candidate_bp.route("/upload_resume/jobs/<job_id>", methods=["GET"])
+@role_required(["candidate"])
+def get_resume_job_status(job_id):
+    """
+    Poll the state of a queued resume upload.
+    Once status is "succeeded", "result" holds the analysis summary.
+    """
+    try:
+        job = resume_queue.get(job_id)
+        if not job or job.get("type") != RESUME_JOB_TYPE:
+            return jsonify({"error": "Job not found"}), 404
+
+        if job["payload"].get("user_id") != int(get_jwt_identity()):
+            return jsonify({"error": "Unauthorized"}), 403
+
+        return jsonify({
+            "job_id": job["id"],
+            "status": job.get("status"),
+            "stage": job.get("stage"),
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "timings_ms": job.get("timings", {}),
+            "error": job.get("error") or None,
+            "result": job.get("result"),
+            "created_at": job.get("created_at"),
+            "finished_at": job.get("finished_at"),
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Resume job status error: {e}", exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+
 # ----------------- CANDIDATE APPLICATIONS -----------------
 @candidate_bp.route("/applications", methods=["GET"])
 @role_required(["candidate"])
@@ -523,20 +563,22 @@ def upload_profile_picture():
             return jsonify({"success": False, "message": "Invalid image type"}), 400
 
         # ---- Upload to Cloudinary ----
+        image_bytes = file.read()
         result = cloudinary.uploader.upload(
-            file,
+            io.BytesIO(image_bytes),
             folder="profile_pics/",
             format="jpg",  # convert everything to jpg
             resource_type="image",
-            public_id=f"candidate_{candidate.id}"
+            public_id=f"candidate_{candidate.id}_{uuid.uuid4().hex[:8]}"
         )
         url = result.get("secure_url")
         if not url:
             return jsonify({"success": False, "message": "Failed to upload image"}), 500
 
-        # ---- Save to candidate profile ----
+        # ---- Save to candidate profile; resized variants follow from the media worker ----
         candidate.profile_picture = url
         db.session.commit()
+        enqueue_variants(candidate, url, result.get("public_id"), image_bytes)
         
         # Audit log
         AuditService.record_action(
@@ -557,6 +599,156 @@ def upload_profile_picture():
         db.session.rollback()
         return jsonify({"success": False, "message": "Internal server error"}), 500
 
+# ----------------- DIRECT UPLOADS (client -> Cloudinary) -----------------
+def _resume_application(application_id, user_id):
+    """The caller's application that still needs a resume, or an error response."""
+    application = Application.query.get(application_id) if application_id else None
+    if not application:
+        return None, (jsonify({"error": "Application not found"}), 404)
+    if application.candidate.user.id != int(user_id):
+        return None, (jsonify({"error": "Unauthorized"}), 403)
+    if getattr(application, "resume_url", None):
+        return None, (jsonify({"error": "Resume already uploaded"}), 400)
+    return application, None
+
+
+@candidate_bp.route("/uploads/sign", methods=["POST"])
+@role_required(["candidate"])
+def sign_upload():
+    """
+    Signed parameters for uploading a file straight to Cloudinary.
+    Body: {"kind": "resume" | "document" | "profile_picture", "application_id": <for resumes>}
+    Only issued to callers who can complete the upload: the application's
+    candidate for resumes, a user with a candidate profile otherwise.
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        kind = data.get("kind")
+
+        context = {}
+        if kind == "resume":
+            application, error = _resume_application(data.get("application_id"), user_id)
+            if error:
+                return error
+            context["application_id"] = application.id
+        elif not get_current_candidate():
+            return jsonify({"success": False, "message": "Candidate not found"}), 404
+
+        return jsonify(issue_upload(kind, user_id, context)), 200
+
+    except DirectUploadError as e:
+        return jsonify({"error": str(e)}), e.status
+    except Exception as e:
+        current_app.logger.error(f"Sign upload error: {e}", exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@candidate_bp.route("/uploads/complete", methods=["POST"])
+@role_required(["candidate"])
+def complete_direct_upload():
+    """
+    Called after the client uploaded to Cloudinary with the signed parameters.
+    Body: {"upload_id", "version", "signature"} (version and signature from Cloudinary's response)
+    The upload is consumed only once it has been applied, so a failed or
+    refused completion can be retried.
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        upload_id = data.get("upload_id")
+
+        upload = verify_upload(upload_id, user_id, data.get("version"), data.get("signature"))
+
+        if upload["kind"] == "resume":
+            # Re-checked: a resume may have arrived through another upload meanwhile
+            application, error = _resume_application(upload["context"].get("application_id"), user_id)
+            if error:
+                return error
+            job_id, created = enqueue_resume_analysis(
+                application,
+                user_id=user_id,
+                file_bytes=None,
+                filename=upload["public_id"].rsplit("/", 1)[-1],
+                resume_text=data.get("resume_text", ""),
+                resume_url=upload["url"],
+                size_bytes=upload["bytes"],
+            )
+            if not created:
+                return jsonify({
+                    "error": "Resume is already being processed",
+                    "job_id": job_id,
+                    "status_url": f"/api/candidate/upload_resume/jobs/{job_id}"
+                }), 409
+            consume_upload(upload_id)
+
+            AuditService.record_action(
+                admin_id=user_id,
+                action="Candidate Uploaded Resume",
+                target_user_id=user_id,
+                details=f"Uploaded resume for application ID {application.id}",
+                extra_data={
+                    "application_id": application.id,
+                    "job_id": application.requisition_id,
+                    "processing_job_id": job_id,
+                    "direct_upload": True
+                }
+            )
+            return jsonify({
+                "message": "Resume received and queued for analysis",
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/api/candidate/upload_resume/jobs/{job_id}"
+            }), 202
+
+        candidate = get_current_candidate()
+        if not candidate:
+            return jsonify({"success": False, "message": "Candidate not found"}), 404
+
+        if upload["kind"] == "document":
+            candidate.cv_url = upload["url"]
+            db.session.commit()
+            if not consume_upload(upload_id):
+                return jsonify({"error": "Upload already completed"}), 409
+            AuditService.record_action(
+                admin_id=user_id,
+                action="Candidate Uploaded Document",
+                target_user_id=user_id,
+                details="Uploaded candidate document",
+                extra_data={"document_type": upload["format"], "direct_upload": True}
+            )
+            return jsonify({
+                "success": True,
+                "message": "Document uploaded successfully",
+                "data": {"cv_url": upload["url"]},
+            }), 200
+
+        candidate.profile_picture = upload["url"]
+        db.session.commit()
+        # A concurrent completion already queued the variants
+        if not consume_upload(upload_id):
+            return jsonify({"error": "Upload already completed"}), 409
+        enqueue_variants(candidate, upload["url"], upload["public_id"])
+        AuditService.record_action(
+            admin_id=user_id,
+            action="Candidate Uploaded Profile Picture",
+            target_user_id=user_id,
+            details="Uploaded new profile picture"
+        )
+        return jsonify({
+            "success": True,
+            "message": "Profile picture updated successfully",
+            "data": {"profile_picture": upload["url"]},
+        }), 200
+
+    except DirectUploadError as e:
+        return jsonify({"error": str(e)}), e.status
+    except Exception as e:
+        current_app.logger.error(f"Complete upload error: {e}", exc_info=True)
+        db.session.rollback()
+        return jsonify({"error": "Internal server error"}), 500
+
+
 # ----------------- UPDATE GENERAL SETTINGS -----------------
 @candidate_bp.route("/settings", methods=["PUT"])
 @role_required(["candidate", "admin", "hiring_manager"])
@@ -0,0 +1,26 @@
+# app/routes/metrics_routes.py
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from app.extensions import limiter
+from app.utils.metrics import REGISTRY
+
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+@limiter.exempt
+def metrics():
+    """
+    Prometheus scrape endpoint (LLM calls, OpenRouter transport, circuit breaker).
+    Values are per worker process. If METRICS_TOKEN is set, scrapers must send
+    "Authorization: Bearer <token>".
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, token):
+            return jsonify({"error": "Unauthorized"}), 401
+
+    return Response(REGISTRY.render_prometheus(), mimetype="text/plain; version=0.0.4")
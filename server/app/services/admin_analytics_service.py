@@ -0,0 +1,201 @@
+# app/services/admin_analytics_service.py
+"""
+Admin analytics, one SQL round trip per endpoint.
+
+Each function builds a single statement: the independent aggregates are
+CTEs or scalar subqueries, counts that differ only by a condition share one
+scan through ``COUNT(*) FILTER (WHERE ...)``, and row-shaped parts (top
+requisitions, monthly series, breakdowns) come back as ``json_agg`` values.
+Score buckets are inclusive (low, high) ranges passed to the query as bound
+parameters, so changing ``SCORE_BUCKETS`` needs no SQL changes.
+
+PostgreSQL only (FILTER, date_trunc, json aggregates).
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.extensions import db
+from app.models import Application, AssessmentResult, Candidate, Requisition, User
+
+# (label, lowest score, highest score), both ends inclusive
+SCORE_BUCKETS: Sequence[Tuple[str, float, float]] = (
+    ('0-20', 0, 20),
+    ('21-40', 21, 40),
+    ('41-60', 41, 60),
+    ('61-80', 61, 80),
+    ('81-100', 81, 100),
+)
+
+# Round trips each function makes; checked by ``flask analytics-queries``
+EXPECTED_QUERIES = {"dashboard_stats": 1, "applications_analysis": 1, "assessments_analysis": 1}
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _bucket_counts(column, buckets) -> List[Any]:
+    return [
+        func.count().filter(column.between(low, high)).label(f"bucket_{index}")
+        for index, (_, low, high) in enumerate(buckets)
+    ]
+
+
+def _bucket_distribution(row, buckets) -> List[Dict[str, Any]]:
+    return [{'range': label, 'count': row[f"bucket_{index}"]} for index, (label, _, _) in enumerate(buckets)]
+
+
+def _json_rows(order_by, **fields):
+    """``json_agg`` of one object per row, built from ``fields``; ``[]`` when there are none."""
+    pairs = []
+    for key, column in fields.items():
+        pairs += [key, column]
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(func.json_build_object(*pairs), *order_by)),
+        EMPTY_JSON_ARRAY,
+    )
+
+
+def _monthly_counts(column, id_column):
+    month = func.date_trunc('month', column)
+    per_month = (
+        select(month.label('month'), func.count(id_column).label('count'))
+        .group_by(month)
+        .subquery()
+    )
+    return select(_json_rows(
+        [per_month.c.month],
+        month=func.to_char(per_month.c.month, 'YYYY-MM'), count=per_month.c.count,
+    )).scalar_subquery()
+
+
+def dashboard_stats(now: datetime = None) -> Dict[str, Any]:
+    week_ago = (now or datetime.utcnow()) - timedelta(days=7)
+
+    users = select(
+        func.count().label('total'),
+        func.count().filter(User.created_at >= week_ago).label('new'),
+    ).cte('user_stats')
+    requisitions = select(
+        func.count().label('total'),
+        func.count().filter(Requisition.created_at >= week_ago).label('new'),
+    ).cte('requisition_stats')
+    candidates = select(func.count().label('total')).select_from(Candidate).cte('candidate_stats')
+    applications = select(
+        func.count().label('total'),
+        func.count().filter(Application.created_at >= week_ago).label('new'),
+        func.avg(Application.cv_score).label('avg_cv_score'),
+        func.avg(Application.assessment_score).label('avg_assessment_score'),
+    ).cte('application_stats')
+
+    per_status = select(Application.status, func.count().label('count')).group_by(Application.status).subquery()
+    status_breakdown = select(
+        func.json_object_agg(func.coalesce(per_status.c.status, 'null'), per_status.c.count)
+    ).scalar_subquery()
+
+    row = db.session.execute(
+        select(
+            users.c.total.label('total_users'),
+            users.c.new.label('new_users'),
+            candidates.c.total.label('total_candidates'),
+            requisitions.c.total.label('total_requisitions'),
+            requisitions.c.new.label('new_requisitions'),
+            applications.c.total.label('total_applications'),
+            applications.c.new.label('new_applications'),
+            applications.c.avg_cv_score,
+            applications.c.avg_assessment_score,
+            status_breakdown.label('status_breakdown'),
+        ).select_from(users, candidates, requisitions, applications)
+    ).mappings().one()
+
+    return {
+        'total_users': row['total_users'],
+        'total_candidates': row['total_candidates'],
+        'total_requisitions': row['total_requisitions'],
+        'total_applications': row['total_applications'],
+        'application_status_breakdown': row['status_breakdown'] or {},
+        'recent_activity': {
+            'new_users': row['new_users'],
+            'new_applications': row['new_applications'],
+            'new_requisitions': row['new_requisitions'],
+        },
+        'average_scores': {
+            'cv_score': round(float(row['avg_cv_score'] or 0), 2),
+            'assessment_score': round(float(row['avg_assessment_score'] or 0), 2),
+        },
+    }
+
+
+def applications_analysis(buckets: Sequence[Tuple[str, float, float]] = SCORE_BUCKETS) -> Dict[str, Any]:
+    application_count = func.count(Application.id)
+    top_requisitions = (
+        select(Requisition.title, application_count.label('count'))
+        .join(Application, Requisition.id == Application.requisition_id)
+        .group_by(Requisition.id, Requisition.title)
+        .order_by(application_count.desc())
+        .limit(10)
+        .subquery()
+    )
+    by_requisition = select(_json_rows(
+        [top_requisitions.c.count.desc()],
+        requisition=top_requisitions.c.title, count=top_requisitions.c.count,
+    )).scalar_subquery()
+
+    cv_buckets = select(*_bucket_counts(Application.cv_score, buckets)).cte('cv_buckets')
+
+    row = db.session.execute(
+        select(
+            by_requisition.label('by_requisition'),
+            _monthly_counts(Application.created_at, Application.id).label('monthly'),
+            *cv_buckets.c,
+        ).select_from(cv_buckets)
+    ).mappings().one()
+
+    return {
+        'applications_by_requisition': row['by_requisition'],
+        'cv_score_distribution': _bucket_distribution(row, buckets),
+        'monthly_applications': row['monthly'],
+    }
+
+
+def assessments_analysis(buckets: Sequence[Tuple[str, float, float]] = SCORE_BUCKETS) -> Dict[str, Any]:
+    score_buckets = select(*_bucket_counts(AssessmentResult.percentage_score, buckets)).cte('score_buckets')
+
+    per_recommendation = (
+        select(AssessmentResult.recommendation, func.count(AssessmentResult.id).label('count'))
+        .where(AssessmentResult.recommendation.isnot(None))
+        .group_by(AssessmentResult.recommendation)
+        .subquery()
+    )
+    recommendations = select(_json_rows(
+        [per_recommendation.c.recommendation],
+        recommendation=per_recommendation.c.recommendation, count=per_recommendation.c.count,
+    )).scalar_subquery()
+
+    per_requisition = (
+        select(Requisition.id, Requisition.title, func.avg(AssessmentResult.percentage_score).label('avg_score'))
+        .join(Application, Application.requisition_id == Requisition.id)
+        .join(AssessmentResult, AssessmentResult.application_id == Application.id)
+        .group_by(Requisition.id, Requisition.title)
+        .subquery()
+    )
+    averages = select(_json_rows(
+        [per_requisition.c.id],
+        requisition=per_requisition.c.title,
+        avg_score=func.round(func.coalesce(per_requisition.c.avg_score, 0).cast(db.Numeric), 2),
+    )).scalar_subquery()
+
+    row = db.session.execute(
+        select(
+            recommendations.label('recommendations'),
+            averages.label('averages'),
+            *score_buckets.c,
+        ).select_from(score_buckets)
+    ).mappings().one()
+
+    return {
+        'assessment_score_distribution': _bucket_distribution(row, buckets),
+        'recommendation_breakdown': row['recommendations'],
+        'average_scores_by_requisition': row['averages'],
+    }
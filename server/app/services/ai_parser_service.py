@@ -1,19 +1,73 @@
 # app/services/cv_parser_service.py
 from .ai_service import AIService
-from typing import Dict, Any
+from app.models import CVAnalysis
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.token_bucket import BudgetExhaustedError
+from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 ai = AIService()
 
-def analyse_resume_gemini(cv_text: str, job_description: str) -> Dict[str, Any]:
+
+def last_known_analysis(candidate_id: Optional[int], job_description: str) -> Optional[Dict[str, Any]]:
+    """Most recent stored analysis of this candidate against the same job description, marked stale."""
+    if not candidate_id:
+        return None
+    analysis = (
+        CVAnalysis.query
+        .filter_by(candidate_id=candidate_id, job_description=job_description)
+        .order_by(CVAnalysis.created_at.desc())
+        .first()
+    )
+    if not analysis or not analysis.result or analysis.result.get("error"):
+        return None
+    return {
+        **analysis.result,
+        "stale": True,
+        "stale_as_of": analysis.created_at.isoformat() if analysis.created_at else None,
+        "analysis_id": analysis.id,
+    }
+
+
+def analyse_resume_gemini(cv_text: str, job_description: str, use_cache: bool = True,
+                          candidate_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Public function used by routes: returns structured parser result.
+    Set use_cache=False to bypass the analysis cache.
+    While the OpenRouter circuit is open the candidate's last analysis for the
+    same job description is returned with "stale": True; without one the
+    result carries "circuit_open": True. Over the AI request budget the
+    result carries "throttled": True and "retry_after".
     """
     try:
-        result = ai.analyze_cv_vs_job(cv_text= cv_text, job_description=job_description)
+        result = ai.analyze_cv_vs_job(cv_text= cv_text, job_description=job_description, use_cache=use_cache)
         return result
+    except BudgetExhaustedError as e:
+        return {
+            "match_score": 0,
+            "missing_skills": [],
+            "suggestions": [],
+            "interview_questions": [],
+            "error": str(e),
+            "throttled": True,
+            "retry_after": e.retry_after,
+        }
+    except CircuitOpenError as e:
+        logger.warning("OpenRouter circuit open, trying last known analysis: %s", e)
+        stale = last_known_analysis(candidate_id, job_description)
+        if stale:
+            return stale
+        return {
+            "match_score": 0,
+            "missing_skills": [],
+            "suggestions": [],
+            "interview_questions": [],
+            "error": str(e),
+            "circuit_open": True,
+            "retry_after": e.retry_after,
+        }
     except Exception as e:
         logger.exception("Error analyzing resume: %s", e)
         # Return safe fallback
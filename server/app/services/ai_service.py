@@ -1,51 +1,320 @@
 import os
 import requests
 import json
+import hashlib
 import logging
+import random
+import threading
 import time
-from typing import Dict, Any, Optional
+import unicodedata
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+
+from app.extensions import redis_client
+from app.services.cv_condenser_service import condense_cv, condense_job_description
+from app.services.llm_usage_service import LLMCall
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.metrics import REGISTRY
+from app.utils.single_flight import SingleFlight
+from app.utils.token_bucket import BudgetExhaustedError, RateBudget
 
 logger = logging.getLogger(__name__)
 
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
+# Override the base URL to point at a local stand-in (see bench/openrouter_stub.py)
+OPENROUTER_BASE_URL = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1").rstrip("/")
 OPENROUTER_URL = os.environ.get(
-    "OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions"
+    "OPENROUTER_URL", f"{OPENROUTER_BASE_URL}/chat/completions"
 )
 DEFAULT_MODEL = os.environ.get("OPENROUTER_MODEL", "openai/gpt-4o-mini")
 
+# HTTP transport
+AI_HTTP_POOL_SIZE = int(os.environ.get("AI_HTTP_POOL_SIZE", 10))
+AI_CONNECT_TIMEOUT = float(os.environ.get("AI_CONNECT_TIMEOUT", 5))
+AI_READ_TIMEOUT = float(os.environ.get("AI_READ_TIMEOUT", 60))
+AI_BACKOFF_MAX = float(os.environ.get("AI_BACKOFF_MAX", 30))
+
+# 4xx responses other than these will not succeed on retry
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Circuit breaker shared by every worker (state lives in Redis)
+AI_CB_FAILURE_RATE = float(os.environ.get("AI_CB_FAILURE_RATE", 0.5))
+AI_CB_SLOW_CALL_SECONDS = float(os.environ.get("AI_CB_SLOW_CALL_SECONDS", 20))
+AI_CB_SLOW_CALL_RATE = float(os.environ.get("AI_CB_SLOW_CALL_RATE", 0.8))
+AI_CB_MIN_CALLS = int(os.environ.get("AI_CB_MIN_CALLS", 5))
+AI_CB_WINDOW = int(os.environ.get("AI_CB_WINDOW", 60))
+AI_CB_OPEN_SECONDS = float(os.environ.get("AI_CB_OPEN_SECONDS", 30))
+
+openrouter_breaker = CircuitBreaker(
+    "openrouter",
+    failure_rate=AI_CB_FAILURE_RATE,
+    slow_call_seconds=AI_CB_SLOW_CALL_SECONDS,
+    slow_call_rate=AI_CB_SLOW_CALL_RATE,
+    min_calls=AI_CB_MIN_CALLS,
+    window=AI_CB_WINDOW,
+    open_seconds=AI_CB_OPEN_SECONDS,
+)
+
+# Request budget for all OpenRouter calls: a global bucket sized to the
+# upstream quota plus one bucket per user (or client IP for anonymous chat)
+AI_BUDGET_ENABLED = os.environ.get("AI_BUDGET_ENABLED", "true").lower() == "true"
+AI_BUDGET_GLOBAL_RPM = float(os.environ.get("AI_BUDGET_GLOBAL_RPM", 120))
+AI_BUDGET_GLOBAL_BURST = float(os.environ.get("AI_BUDGET_GLOBAL_BURST", 20))
+AI_BUDGET_USER_RPM = float(os.environ.get("AI_BUDGET_USER_RPM", 20))
+AI_BUDGET_USER_BURST = float(os.environ.get("AI_BUDGET_USER_BURST", 5))
+AI_BUDGET_MAX_WAIT = float(os.environ.get("AI_BUDGET_MAX_WAIT", 15))
+
+openrouter_budget = RateBudget(
+    "openrouter",
+    global_rate=AI_BUDGET_GLOBAL_RPM / 60,
+    global_burst=AI_BUDGET_GLOBAL_BURST,
+    user_rate=AI_BUDGET_USER_RPM / 60,
+    user_burst=AI_BUDGET_USER_BURST,
+    max_wait=AI_BUDGET_MAX_WAIT,
+)
+
+
+def acquire_budget():
+    """Wait for a slot in the OpenRouter budget; raises BudgetExhaustedError on timeout."""
+    if AI_BUDGET_ENABLED:
+        openrouter_budget.acquire()
+
+
+_http_session = None
+_http_session_pid = None
+_http_session_lock = threading.Lock()
+
+attempt_latency = REGISTRY.histogram(
+    "ai_http_attempt_seconds",
+    "Latency of individual OpenRouter HTTP attempts",
+    labelnames=("outcome",),
+)
+attempt_total = REGISTRY.counter(
+    "ai_http_attempts_total",
+    "OpenRouter HTTP attempts by outcome and status code",
+    labelnames=("outcome", "status"),
+)
+retry_sleep_total = REGISTRY.counter(
+    "ai_http_retry_sleep_seconds_total",
+    "Seconds spent sleeping between OpenRouter retries",
+    labelnames=("reason",),
+)
+
+
+def get_http_session() -> requests.Session:
+    """
+    Process-wide keep-alive session for OpenRouter calls.
+    Re-created after a fork so workers never share sockets.
+    """
+    global _http_session, _http_session_pid
+    pid = os.getpid()
+    if _http_session is None or _http_session_pid != pid:
+        with _http_session_lock:
+            if _http_session is None or _http_session_pid != pid:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=AI_HTTP_POOL_SIZE,
+                    pool_maxsize=AI_HTTP_POOL_SIZE,
+                    max_retries=0,  # retries are handled by AIService
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+                _http_session_pid = pid
+    return _http_session
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After may be delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AIServiceError(RuntimeError):
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = True):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+# Bump whenever the analysis prompt or its post-processing changes so that
+# cached results produced by the old prompt are no longer served.
+ANALYSIS_PROMPT_VERSION = "v2"
+
+AI_CACHE_ENABLED = os.environ.get("AI_CACHE_ENABLED", "true").lower() == "true"
+AI_CACHE_TTL = int(os.environ.get("AI_CACHE_TTL", 7 * 24 * 3600))
+AI_CACHE_MAX_ENTRIES = int(os.environ.get("AI_CACHE_MAX_ENTRIES", 5000))
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    """Collapse whitespace and unicode variants so trivially different copies hash alike."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+class AnalysisCache:
+    """
+    Content-addressed Redis cache for CV-vs-job analyses.
+
+    Entries live under ``ai:analysis:<sha256>`` with a TTL counted from their
+    last access (a hit renews it). A sorted set keeps the last access time of
+    every entry so the cache can be trimmed back to ``max_entries`` (least
+    recently used first) and expired entries can be left out of ``stats()``. Hit/miss counters are shared
+    across workers through Redis. Any Redis failure degrades to a cache miss.
+    """
+
+    PREFIX = "ai:analysis"
+
+    def __init__(self, client=None, ttl: int = AI_CACHE_TTL, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.client = client if client is not None else redis_client
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @property
+    def index_key(self) -> str:
+        return f"{self.PREFIX}:index"
+
+    def entry_key(self, digest: str) -> str:
+        return f"{self.PREFIX}:{digest}"
+
+    @staticmethod
+    def make_key(cv_text: str, job_description: str, model: str,
+                 prompt_version: str = ANALYSIS_PROMPT_VERSION) -> str:
+        material = "\x1f".join([
+            prompt_version,
+            model or "",
+            _normalize_text(job_description),
+            _normalize_text(cv_text),
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self.entry_key(digest))
+            if raw is None:
+                self.client.incr(f"{self.PREFIX}:stats:misses")
+                return None
+            # A hit renews the entry's TTL along with its LRU score, so both
+            # measure from the last access
+            pipe = self.client.pipeline()
+            pipe.incr(f"{self.PREFIX}:stats:hits")
+            pipe.expire(self.entry_key(digest), self.ttl)
+            pipe.zadd(self.index_key, {digest: time.time()})
+            pipe.execute()
+            return json.loads(raw)
+        except Exception as e:
+            logger.debug("Analysis cache read failed: %s", e)
+            return None
+
+    def set(self, digest: str, value: Dict[str, Any]) -> None:
+        try:
+            now = time.time()
+            pipe = self.client.pipeline()
+            pipe.setex(self.entry_key(digest), self.ttl, json.dumps(value))
+            pipe.zadd(self.index_key, {digest: now})
+            # Drop index members whose entries have already expired
+            pipe.zremrangebyscore(self.index_key, 0, now - self.ttl)
+            pipe.zcard(self.index_key)
+            size = pipe.execute()[-1]
+
+            overflow = size - self.max_entries
+            if overflow > 0:
+                evicted = self.client.zrange(self.index_key, 0, overflow - 1)
+                if evicted:
+                    pipe = self.client.pipeline()
+                    pipe.delete(*[self.entry_key(d) for d in evicted])
+                    pipe.zrem(self.index_key, *evicted)
+                    pipe.incrby(f"{self.PREFIX}:stats:evictions", len(evicted))
+                    pipe.execute()
+        except Exception as e:
+            logger.debug("Analysis cache write failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            pipe = self.client.pipeline()
+            pipe.get(f"{self.PREFIX}:stats:hits")
+            pipe.get(f"{self.PREFIX}:stats:misses")
+            pipe.get(f"{self.PREFIX}:stats:evictions")
+            # Count only live entries: drop index members that have expired
+            pipe.zremrangebyscore(self.index_key, 0, time.time() - self.ttl)
+            pipe.zcard(self.index_key)
+            hits, misses, evictions, _, size = pipe.execute()
+        except Exception as e:
+            logger.debug("Analysis cache stats unavailable: %s", e)
+            return {"available": False}
+
+        hits, misses = int(hits or 0), int(misses or 0)
+        lookups = hits + misses
+        return {
+            "available": True,
+            "hits": hits,
+            "misses": misses,
+            "evictions": int(evictions or 0),
+            "entries": int(size or 0),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+analysis_cache = AnalysisCache()
+
+# Identical analyses running at the same time (double submits, several admin
+# tabs) share one upstream call across all workers
+AI_SINGLEFLIGHT_ENABLED = os.environ.get("AI_SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+AI_SINGLEFLIGHT_WAIT = float(os.environ.get("AI_SINGLEFLIGHT_WAIT", 120))
+AI_SINGLEFLIGHT_LOCK_TTL = float(os.environ.get("AI_SINGLEFLIGHT_LOCK_TTL", 300))
+
+analysis_flight = SingleFlight(
+    "ai_analysis",
+    lock_ttl=AI_SINGLEFLIGHT_LOCK_TTL,
+    wait_timeout=AI_SINGLEFLIGHT_WAIT,
+)
+
 
 class AIService:
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-        timeout: int = 60,
+        timeout: float = AI_READ_TIMEOUT,
         retries: int = 3,
-        backoff: int = 5,
+        backoff: float = 5,
+        connect_timeout: float = AI_CONNECT_TIMEOUT,
+        max_backoff: float = AI_BACKOFF_MAX,
     ):
         self.api_key = api_key or OPENROUTER_API_KEY
         self.model = model or DEFAULT_MODEL
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
         self.retries = retries
         self.backoff = backoff
+        self.max_backoff = max_backoff
 
         if not self.api_key:
             logger.warning(
                 "No OPENROUTER_API_KEY found in environment. AI calls will fail without a key."
             )
 
-    def _call_generation(
-        self, prompt: str, temperature: float = 0.7, max_output_tokens: int = 512
-    ) -> str:
-        if not self.api_key:
-            raise RuntimeError("OPENROUTER_API_KEY not set")
-
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff; a server-provided Retry-After wins if longer."""
+        ceiling = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
 
-        payload = {
+    def _build_payload(self, prompt: str, temperature: float, max_output_tokens: int) -> Dict[str, Any]:
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": "You are an expert recruitment assistant."},
@@ -53,50 +322,228 @@ class AIService:
             ],
             "temperature": temperature,
             "max_tokens": max_output_tokens,
+            # Ask OpenRouter to report token counts and cost in "usage"
+            "usage": {"include": True},
+        }
+
+    def _post_with_retries(self, payload: Dict[str, Any], handle_response, stream: bool = False,
+                           call: Optional[LLMCall] = None):
+        """
+        POST ``payload`` to OpenRouter, retrying transient failures, and return
+        ``handle_response(resp)`` for the first 200 response. Errors raised by
+        ``handle_response`` for malformed bodies are retried as well.
+
+        The call is recorded (latency, retries, tokens, outcome) through
+        ``call``; for streams that is left to the stream reader on success.
+        """
+        call = call or LLMCall(payload.get("model"))
+        try:
+            acquire_budget()
+            result = self._post_attempts(payload, handle_response, stream, call)
+        except BudgetExhaustedError:
+            call.finish("throttled")
+            raise
+        except CircuitOpenError:
+            call.finish("circuit_open")
+            raise
+        except Exception:
+            call.finish("error")
+            raise
+        if not stream:
+            call.finish("success")
+        return result
+
+    def _post_attempts(self, payload: Dict[str, Any], handle_response, stream: bool, call: LLMCall):
+        if not self.api_key:
+            raise RuntimeError("OPENROUTER_API_KEY not set")
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
         }
 
+        session = get_http_session()
+        last_error = None
+
         for attempt in range(1, self.retries + 1):
+            # Fails fast (CircuitOpenError) while OpenRouter is known to be down,
+            # including between retries of this call
+            openrouter_breaker.before_call()
+            call.attempts = attempt
+            retry_after = None
+            status = ""
+            start = time.perf_counter()
             try:
-                resp = requests.post(
-                    OPENROUTER_URL, headers=headers, json=payload, timeout=self.timeout
-                )
-                if resp.status_code != 200:
-                    logger.error(
-                        "OpenRouter API error [%s]: %s", resp.status_code, resp.text
-                    )
-                    raise RuntimeError(
-                        f"OpenRouter API error: {resp.status_code} {resp.text}"
-                    )
-                data = resp.json()
-                return data["choices"][0]["message"]["content"]
-            except requests.exceptions.Timeout:
-                logger.warning(
-                    "Timeout on attempt %d/%d, retrying in %d seconds...",
-                    attempt,
-                    self.retries,
-                    self.backoff,
+                resp = session.post(
+                    OPENROUTER_URL, headers=headers, json=payload,
+                    timeout=(self.connect_timeout, self.timeout), stream=stream,
                 )
-                time.sleep(self.backoff)
-            except requests.exceptions.RequestException as e:
+                status = resp.status_code
+                if resp.status_code == 200:
+                    result = handle_response(resp)
+                    self._record_attempt(start, "success", status)
+                    return result
+
                 logger.error(
-                    "RequestException on attempt %d/%d: %s", attempt, self.retries, e
+                    "OpenRouter API error [%s] on attempt %d/%d: %s",
+                    resp.status_code, attempt, self.retries, resp.text[:500],
                 )
-                time.sleep(self.backoff)
-            except Exception as e:
-                logger.exception(
-                    "Unexpected error on attempt %d/%d: %s", attempt, self.retries, e
+                retryable = resp.status_code in RETRYABLE_STATUS_CODES
+                last_error = AIServiceError(
+                    f"OpenRouter API error: {resp.status_code} {resp.text[:500]}",
+                    status_code=resp.status_code, retryable=retryable,
                 )
-                time.sleep(self.backoff)
+                self._record_attempt(start, "http_error", status)
+                resp.close()
+                if not retryable:
+                    raise last_error
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            except AIServiceError:
+                raise
+            except requests.exceptions.Timeout as e:
+                self._record_attempt(start, "timeout", status)
+                logger.warning("Timeout on attempt %d/%d: %s", attempt, self.retries, e)
+                last_error = e
+            except requests.exceptions.RequestException as e:
+                self._record_attempt(start, "connection_error", status)
+                logger.error("RequestException on attempt %d/%d: %s", attempt, self.retries, e)
+                last_error = e
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                self._record_attempt(start, "invalid_response", status)
+                logger.exception("Malformed OpenRouter response on attempt %d/%d", attempt, self.retries)
+                last_error = e
+
+            if attempt < self.retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                retry_sleep_total.inc(delay, reason="retry_after" if retry_after is not None else "backoff")
+                logger.info("Retrying OpenRouter call in %.2fs", delay)
+                time.sleep(delay)
+
+        raise AIServiceError(
+            f"Failed to call OpenRouter API after {self.retries} attempts: {last_error}"
+        )
+
+    def _call_generation(
+        self, prompt: str, temperature: float = 0.7, max_output_tokens: int = 512
+    ) -> str:
+        payload = self._build_payload(prompt, temperature, max_output_tokens)
+        call = LLMCall(self.model)
+
+        def handle_response(resp):
+            body = resp.json()
+            content = body["choices"][0]["message"]["content"]
+            call.add_usage(body.get("usage"), model=body.get("model"))
+            return content
 
-        raise RuntimeError("Failed to call OpenRouter API after multiple retries")
+        return self._post_with_retries(payload, handle_response, call=call)
+
+    def _stream_generation(
+        self, prompt: str, temperature: float = 0.7, max_output_tokens: int = 512
+    ) -> Iterator[str]:
+        """
+        Open a streaming completion and return an iterator of content deltas.
+        The connection (and any retries) happens before this returns, so
+        upstream errors surface here rather than mid-stream.
+        """
+        payload = self._build_payload(prompt, temperature, max_output_tokens)
+        payload["stream"] = True
+        call = LLMCall(self.model)
+        resp = self._post_with_retries(payload, lambda r: r, stream=True, call=call)
+        return self._iter_stream(resp, call)
+
+    @staticmethod
+    def _iter_stream(resp, call: Optional[LLMCall] = None) -> Iterator[str]:
+        outcome = "error"
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                # Blank lines separate events; ":" lines are keep-alive comments
+                if not line or line.startswith(":") or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise AIServiceError(f"OpenRouter stream error: {chunk['error']}")
+                if call and chunk.get("usage"):
+                    # Sent with the final chunk
+                    call.add_usage(chunk["usage"], model=chunk.get("model"))
+                choices = chunk.get("choices") or []
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if delta:
+                    yield delta
+            outcome = "success"
+        except GeneratorExit:
+            outcome = "aborted"  # client went away mid-stream
+            raise
+        finally:
+            resp.close()
+            if call:
+                call.finish(outcome)
+
+    @staticmethod
+    def _record_attempt(start: float, outcome: str, status) -> None:
+        elapsed = time.perf_counter() - start
+        attempt_latency.observe(elapsed, outcome=outcome)
+        attempt_total.inc(outcome=outcome, status=status)
+        # Non-retryable 4xx are our fault, not a sign of an unhealthy upstream
+        upstream_ok = outcome == "success" or (
+            outcome == "http_error" and status not in RETRYABLE_STATUS_CODES
+        )
+        openrouter_breaker.record(upstream_ok, elapsed)
+
+    @staticmethod
+    def transport_stats() -> Dict[str, Any]:
+        stats = REGISTRY.snapshot(prefix="ai_http_")
+        stats["circuit"] = openrouter_breaker.stats()
+        stats["singleflight"] = REGISTRY.snapshot(prefix="singleflight_")
+        stats["budget"] = openrouter_budget.stats()
+        return stats
 
     def chat(self, message: str, temperature: float = 0.2) -> str:
         prompt = f"User:\n{message}\n\nAssistant:"
         return self._call_generation(prompt, temperature=temperature, max_output_tokens=400)
 
+    def chat_stream(self, message: str, temperature: float = 0.2) -> Iterator[str]:
+        """Same as chat() but yields the reply incrementally as tokens arrive."""
+        prompt = f"User:\n{message}\n\nAssistant:"
+        return self._stream_generation(prompt, temperature=temperature, max_output_tokens=400)
+
     def analyze_cv_vs_job(
-        self, cv_text: str, job_description: str, want_json: bool = True
+        self, cv_text: str, job_description: str, want_json: bool = True,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
+        """
+        Compare a CV with a job description. Results are cached by content,
+        so repeating an analysis of the same inputs costs no tokens; pass
+        ``use_cache=False`` to force a fresh call (the new result still
+        replaces the cached one). Concurrent calls with the same inputs wait
+        for a single upstream call and share its result.
+        """
+        # Cut page furniture and fit both texts to their token budgets; the
+        # cache is keyed on what is actually sent
+        cv_text = condense_cv(cv_text)
+        job_description = condense_job_description(job_description)
+
+        cache_key = AnalysisCache.make_key(cv_text, job_description, self.model)
+        if AI_CACHE_ENABLED and use_cache:
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Analysis cache hit %s", cache_key[:12])
+                return cached
+
+        def run():
+            parsed = self._analyze_cv_vs_job_uncached(cv_text, job_description)
+            # Only cache well-formed answers; parse failures should be retried.
+            if AI_CACHE_ENABLED and "raw_output" not in parsed:
+                analysis_cache.set(cache_key, parsed)
+            return parsed
+
+        if not AI_SINGLEFLIGHT_ENABLED:
+            return run()
+        return analysis_flight.do(cache_key, run)
+
+    def _analyze_cv_vs_job_uncached(self, cv_text: str, job_description: str) -> Dict[str, Any]:
         prompt = f"""
 You are a hiring assistant specializing in parsing resumes and comparing them to job descriptions.
 Please analyze the candidate CV below and the job description below.
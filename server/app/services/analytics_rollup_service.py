@@ -0,0 +1,236 @@
+# app/services/analytics_rollup_service.py
+"""
+Monthly analytics rollups (``analytics_rollups``).
+
+The trend endpoints under ``/api/analytics`` read pre-aggregated counts
+keyed by (metric, month, requisition, status) instead of grouping the
+source tables on every request, so their cost grows with the number of
+months, not rows:
+
+- ``applications``: by ``Application.created_at`` month and application status
+- ``assessments``: by ``AssessmentResult.created_at`` month, status
+  "passed" (``percentage_score >= PASS_MARK``) or "failed"
+- ``interviews``: by ``Interview.created_at`` month and interview status
+
+Assessments and interviews take the requisition of their application. The
+job category is read from ``requisitions`` at query time, so renaming a
+category needs no rollup changes.
+
+An ``after_flush`` hook turns every insert, delete and change of a key
+column into +1/-1 deltas, upserted in the same transaction as the change
+itself. Bulk ``Query.update()``/``delete()`` calls bypass the hook, as does
+moving an application to another requisition (its assessments and
+interviews keep the old one); ``flask rebuild-rollups`` recomputes
+everything from the source tables. Deltas are upserted in key order, so
+concurrent transactions lock rollup rows in the same order. A failed
+update is logged and counted in ``analytics_rollup_failures_total``; it
+never fails the caller's save.
+"""
+import logging
+from collections import Counter
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import AnalyticsRollup, Application, AssessmentResult, Interview, Requisition
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+rollup_failures_total = REGISTRY.counter(
+    "analytics_rollup_failures_total",
+    "Flushes whose analytics rollup update failed (rollups stale until rebuilt)",
+)
+
+APPLICATIONS = "applications"
+ASSESSMENTS = "assessments"
+INTERVIEWS = "interviews"
+
+PASS_MARK = 50
+# Rows without a timestamp are counted under this month and reported as None
+UNKNOWN_MONTH = date(1970, 1, 1)
+
+# model -> (metric, the attributes its rollup key is built from)
+TRACKED = {
+    Application: (APPLICATIONS, ("created_at", "requisition_id", "status")),
+    AssessmentResult: (ASSESSMENTS, ("created_at", "application_id", "percentage_score")),
+    Interview: (INTERVIEWS, ("created_at", "application_id", "status")),
+}
+
+RollupKey = Tuple[str, date, int, str]
+
+
+def month_of(value) -> date:
+    return date(value.year, value.month, 1) if value else UNKNOWN_MONTH
+
+
+def format_month(value: date) -> Optional[str]:
+    return None if value == UNKNOWN_MONTH else value.strftime("%Y-%m")
+
+
+def rollup_key(metric: str, created_at, requisition_id: Optional[int], detail: Any) -> RollupKey:
+    """``detail`` is the status, or for assessments the percentage score."""
+    if metric == ASSESSMENTS:
+        status = "passed" if detail is not None and detail >= PASS_MARK else "failed"
+    else:
+        status = detail or ""
+    return metric, month_of(created_at), requisition_id or 0, status[:50]
+
+
+def apply_deltas(connection, deltas: Dict[RollupKey, int]):
+    rows = [
+        {"metric": metric, "month": month, "requisition_id": requisition_id, "status": status, "count": delta}
+        for (metric, month, requisition_id, status), delta in sorted(deltas.items()) if delta
+    ]
+    if not rows:
+        return
+    table = AnalyticsRollup.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.metric, table.c.month, table.c.requisition_id, table.c.status],
+        set_={"count": table.c.count + stmt.excluded["count"]},
+    )
+    connection.execute(stmt)
+
+
+# ------------------- write path -------------------
+def _values(obj, attributes, old: bool) -> Tuple[Any, ...]:
+    """Attribute values as of before this flush (``old``) or after it."""
+    state = inspect(obj)
+    values = []
+    for name in attributes:
+        history = state.attrs[name].history
+        values.append(history.deleted[0] if old and history.deleted else getattr(obj, name))
+    return tuple(values)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Setting an expired attribute would otherwise leave no old value in its
+# history, and the -1 for the row's previous key would be lost
+for _model, (_, _attributes) in TRACKED.items():
+    for _name in _attributes:
+        event.listen(getattr(_model, _name), "set", _keep_old_value, active_history=True, retval=True)
+
+
+def _changes(session) -> List[Tuple[str, Tuple[Any, ...], int]]:
+    changes = []
+    for obj in session.new:
+        if type(obj) in TRACKED:
+            metric, attributes = TRACKED[type(obj)]
+            changes.append((metric, _values(obj, attributes, old=False), 1))
+    for obj in session.dirty:
+        if type(obj) in TRACKED and session.is_modified(obj):
+            metric, attributes = TRACKED[type(obj)]
+            before, after = _values(obj, attributes, old=True), _values(obj, attributes, old=False)
+            if before != after:
+                changes += [(metric, before, -1), (metric, after, 1)]
+    for obj in session.deleted:
+        if type(obj) in TRACKED:
+            metric, attributes = TRACKED[type(obj)]
+            changes.append((metric, _values(obj, attributes, old=True), -1))
+    return changes
+
+
+def _requisition_lookup(connection, application_ids: Iterable[int]) -> Callable[[Optional[int]], Optional[int]]:
+    ids = {i for i in application_ids if i}
+    requisitions = {}
+    if ids:
+        rows = connection.execute(select(Application.id, Application.requisition_id).where(Application.id.in_(ids)))
+        requisitions = dict(rows.all())
+    return requisitions.get
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_rollups(session, flush_context):
+    changes = _changes(session)
+    if not changes:
+        return
+
+    connection = session.connection()
+    try:
+        # Savepoint so a rollup failure cannot abort the caller's transaction
+        with connection.begin_nested():
+            requisition_of = _requisition_lookup(
+                connection, (values[1] for metric, values, _ in changes if metric != APPLICATIONS))
+            deltas: Dict[RollupKey, int] = Counter()
+            for metric, (created_at, reference, detail), delta in changes:
+                requisition_id = reference if metric == APPLICATIONS else requisition_of(reference)
+                deltas[rollup_key(metric, created_at, requisition_id, detail)] += delta
+            apply_deltas(connection, deltas)
+    except Exception:
+        # Stale rollups are recoverable with `flask rebuild-rollups`; a failed save is not
+        rollup_failures_total.inc()
+        logger.exception("Failed to update analytics rollups")
+
+
+def rebuild_rollups(batch_size: int = 1000) -> int:
+    """Recompute every rollup from the source tables; returns the number of rollup rows."""
+    sources = {
+        APPLICATIONS: db.session.query(Application.created_at, Application.requisition_id, Application.status),
+        ASSESSMENTS: db.session.query(AssessmentResult.created_at, Application.requisition_id,
+                                      AssessmentResult.percentage_score)
+        .outerjoin(Application, Application.id == AssessmentResult.application_id),
+        INTERVIEWS: db.session.query(Interview.created_at, Application.requisition_id, Interview.status)
+        .outerjoin(Application, Application.id == Interview.application_id),
+    }
+    counts: Dict[RollupKey, int] = Counter()
+    for metric, query in sources.items():
+        for created_at, requisition_id, detail in query.yield_per(batch_size):
+            counts[rollup_key(metric, created_at, requisition_id, detail)] += 1
+
+    connection = db.session.connection()
+    connection.execute(delete(AnalyticsRollup.__table__))
+    apply_deltas(connection, counts)
+    db.session.commit()
+    return len(counts)
+
+
+# ------------------- queries -------------------
+def monthly(metric: str, *statuses: str) -> List[Dict[str, Any]]:
+    """
+    Per month (oldest first): {"month", "total", <status>: count for each of
+    ``statuses``}. ``month`` is "YYYY-MM", or None for rows without a date.
+    """
+    rollup = AnalyticsRollup
+    total = func.sum(rollup.count)
+    rows = db.session.execute(
+        select(
+            rollup.month,
+            total.label("total"),
+            *[func.sum(case((rollup.status == status, rollup.count), else_=0)).label(f"status_{index}")
+              for index, status in enumerate(statuses)],
+        )
+        .where(rollup.metric == metric)
+        .group_by(rollup.month)
+        .having(total > 0)
+        .order_by(rollup.month)
+    ).mappings().all()
+
+    return [
+        {
+            "month": format_month(row["month"]),
+            "total": int(row["total"]),
+            **{status: int(row[f"status_{index}"]) for index, status in enumerate(statuses)},
+        }
+        for row in rows
+    ]
+
+
+def count_by_category(metric: str, status: str) -> List[Tuple[Optional[str], int]]:
+    """(job category, count) of ``metric`` rows in ``status``, over rows with a requisition."""
+    total = func.sum(AnalyticsRollup.count)
+    rows = db.session.execute(
+        select(Requisition.category, total)
+        .join(AnalyticsRollup, AnalyticsRollup.requisition_id == Requisition.id)
+        .where(AnalyticsRollup.metric == metric, AnalyticsRollup.status == status)
+        .group_by(Requisition.category)
+        .having(total > 0)
+    ).all()
+    return [(category, int(count)) for category, count in rows]
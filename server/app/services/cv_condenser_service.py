@@ -0,0 +1,196 @@
+# app/services/cv_condenser_service.py
+"""
+Shrinks CV / job description text before it is pasted into an LLM prompt.
+
+PyMuPDF output of a multi-page CV carries repeated page headers and footers,
+page numbers and filler ("References available on request"). ``condense_cv``
+drops those, splits the CV into sections and, when it is still over the
+token budget, keeps the most useful sections (skills, experience, education)
+first. Sections are emitted in their original order.
+"""
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+AI_CONDENSE_ENABLED = os.environ.get("AI_CONDENSE_ENABLED", "true").lower() == "true"
+AI_CV_TOKEN_BUDGET = int(os.environ.get("AI_CV_TOKEN_BUDGET", 1500))
+AI_JD_TOKEN_BUDGET = int(os.environ.get("AI_JD_TOKEN_BUDGET", 800))
+
+EDGE_LINES = 3  # lines at the top/bottom of a page checked for headers/footers
+CHARS_PER_TOKEN = 4  # rough average for English text with the OpenRouter models we use
+TRUNCATION_MARK = "[...]"
+MIN_PARTIAL_TOKENS = 20  # smaller leftovers are not worth a truncated section
+
+# Canonical section -> heading variants (compared lower-cased, without trailing ":")
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "personal profile", "objective",
+                "career objective", "about me", "personal statement"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "technologies", "tools", "skills & tools", "skills and tools",
+               "technical proficiencies"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"],
+    "education": ["education", "academic background", "academic qualifications", "qualifications",
+                  "education and training", "education & training"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses & certifications",
+                       "courses", "training"],
+    "projects": ["projects", "key projects", "personal projects", "portfolio"],
+    "languages": ["languages"],
+    "awards": ["awards", "achievements", "honours", "honors", "publications"],
+    "volunteering": ["volunteering", "volunteer experience", "community involvement"],
+    "interests": ["interests", "hobbies", "hobbies and interests", "hobbies & interests"],
+    "references": ["references", "referees"],
+}
+HEADING_LOOKUP = {variant: section for section, variants in SECTION_HEADINGS.items() for variant in variants}
+
+# Lower index = kept first when over budget. "header" is the text before the
+# first heading (name, contact details, often an untitled summary).
+SECTION_PRIORITY = [
+    "skills", "experience", "education", "certifications", "header", "summary",
+    "projects", "languages", "awards", "volunteering", "interests", "references",
+]
+# Never worth tokens once the CV has to be cut
+DROPPABLE_SECTIONS = {"interests", "references"}
+
+BOILERPLATE_RE = re.compile(
+    r"^(?:"
+    r"page\s*\d+(?:\s*(?:of|/)\s*\d+)?"
+    r"|\d+\s*(?:of|/)\s*\d+"
+    r"|-?\s*\d{1,3}\s*-?"
+    r"|curriculum\s+vitae|resume|résumé|cv"
+    r"|references\s+(?:are\s+)?(?:available\s+)?(?:up)?on\s+request\.?"
+    r")$",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def _page_furniture(pages: List[List[str]]) -> set:
+    """Lines at the top/bottom of several pages (digits ignored, so "Page 2" matches "Page 3")."""
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        content = [line for line in lines if line]
+        edges = content[:EDGE_LINES] + content[-EDGE_LINES:]
+        counts.update({_furniture_key(line) for line in edges})
+    return {key for key, n in counts.items() if n >= 2}
+
+
+def _furniture_key(line: str) -> str:
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalise whitespace and drop page furniture. Pages are expected to be
+    separated by form feeds (see extract_pdf_text); repeated page headers and
+    footers keep only their first occurrence.
+    """
+    pages = [
+        [" ".join(line.split()) for line in page.replace("\r", "\n").splitlines()]
+        for page in (text or "").split("\f")
+    ]
+    furniture = _page_furniture(pages)
+
+    cleaned, seen = [], set()
+    for line in (line for page in pages for line in page):
+        if not line:
+            if cleaned and cleaned[-1]:
+                cleaned.append("")
+            continue
+        if BOILERPLATE_RE.match(line):
+            continue
+        key = _furniture_key(line)
+        if key in furniture:
+            if key in seen:
+                continue
+            seen.add(key)
+        cleaned.append(line)
+    return "\n".join(cleaned).strip()
+
+
+def _heading(line: str):
+    if len(line) > 40:
+        return None
+    key = line.lower().strip(" :-–—•*#").strip()
+    return HEADING_LOOKUP.get(key)
+
+
+def split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """[(section, lines)] in document order; the heading line is the first line of each section."""
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in text.splitlines():
+        section = _heading(line) if line else None
+        if section:
+            sections.append((section, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if any(lines)]
+
+
+def _fit_lines(lines: List[str], budget: int) -> List[str]:
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            kept.append(TRUNCATION_MARK)
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """Plain line-boundary truncation, used for job descriptions."""
+    text = clean_text(text)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return "\n".join(_fit_lines(text.splitlines(), max_tokens))
+
+
+def condense_cv(text: str, max_tokens: int = None) -> str:
+    """Clean the CV and, if needed, cut it to ``max_tokens`` keeping high-value sections."""
+    if not AI_CONDENSE_ENABLED or not text:
+        return text or ""
+    max_tokens = max_tokens or AI_CV_TOKEN_BUDGET
+
+    cleaned = clean_text(text)
+    if estimate_tokens(cleaned) <= max_tokens:
+        result = cleaned
+    else:
+        sections = split_sections(cleaned)
+        order = sorted(range(len(sections)), key=lambda i: SECTION_PRIORITY.index(sections[i][0]))
+        order = [i for i in order if sections[i][0] not in DROPPABLE_SECTIONS]
+        remaining = max_tokens
+        kept = {}
+        # Whole sections first, by priority, so a huge experience section
+        # cannot crowd out a short education section...
+        for i in order:
+            cost = estimate_tokens("\n".join(sections[i][1])) + 1
+            if cost <= remaining:
+                kept[i] = sections[i][1]
+                remaining -= cost
+        # ...then whatever is left goes to the highest priority sections that did not fit
+        for i in order:
+            if i not in kept and remaining > MIN_PARTIAL_TOKENS:
+                kept[i] = _fit_lines(sections[i][1], remaining)
+                remaining -= estimate_tokens("\n".join(kept[i])) + 1
+        result = "\n".join("\n".join(kept[i]) for i in sorted(kept))
+
+    logger.debug("Condensed CV from ~%d to ~%d tokens", estimate_tokens(text), estimate_tokens(result))
+    return result
+
+
+def condense_job_description(text: str, max_tokens: int = None) -> str:
+    if not AI_CONDENSE_ENABLED or not text:
+        return text or ""
+    return fit_to_budget(text, max_tokens or AI_JD_TOKEN_BUDGET)
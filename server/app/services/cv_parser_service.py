@@ -3,29 +3,54 @@ import os
 from dotenv import load_dotenv
 from openai import OpenAI
 from app.models import Requisition
+from app.services.cv_condenser_service import condense_cv, condense_job_description
 from cloudinary.uploader import upload as cloudinary_upload
+from app.services.ai_service import (
+    AI_CACHE_ENABLED, AI_READ_TIMEOUT, OPENROUTER_BASE_URL, RETRYABLE_STATUS_CODES, AnalysisCache,
+    acquire_budget, analysis_cache, openrouter_breaker,
+)
+from app.services.llm_usage_service import LLMCall
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.token_bucket import BudgetExhaustedError
 
 load_dotenv()
 
 # OpenRouter API configuration
 api_key = os.getenv("OPENROUTER_API_KEY")
 openai_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
+    base_url=OPENROUTER_BASE_URL,
     api_key=api_key,
+    timeout=AI_READ_TIMEOUT,  # the SDK default (10 min) would hold a worker hostage
+    max_retries=0,  # one request per call, so the breaker and usage accounting see every attempt
     default_headers={"HTTP-Referer": "http://localhost:5000"}  # replace with your frontend URL
 )
 
+
+HYBRID_MODEL = "openrouter/auto"
+# Bump when the prompt or the parsing below changes; part of the result cache key
+HYBRID_PROMPT_VERSION = "hybrid-v1"
+
+
+def _is_upstream_failure(exc):
+    """Client errors (bad request, auth) do not mean OpenRouter is unhealthy."""
+    status = getattr(exc, "status_code", None)
+    return status is None or status in RETRYABLE_STATUS_CODES
+
+
 class HybridResumeAnalyzer:
     @staticmethod
-    def upload_cv(file):
+    def upload_cv(file, filename=None):
         """
         Upload resume file to Cloudinary and return secure URL.
+        Pass filename when uploading an in-memory stream.
         """
         try:
+            options = {"filename": filename} if filename else {}
             result = cloudinary_upload(
                 file,
                 resource_type="raw",
-                folder="candidate_cvs"
+                folder="candidate_cvs",
+                **options
             )
             return result.get("secure_url")
         except Exception as e:
@@ -33,10 +58,13 @@ class HybridResumeAnalyzer:
             return None
 
     @staticmethod
-    def analyse_resume(resume_content, job_id):
+    def analyse_resume(resume_content, job_id, raise_errors=False):
         """
         Analyse resume against job description from the Requisition table.
         Returns structured data: match_score, missing_skills, suggestions
+        With raise_errors=True upstream failures propagate (so a job can retry)
+        instead of being folded into a zero-score result. CircuitOpenError
+        always propagates so callers can fall back to a previous analysis.
         """
         # Fetch job from DB
         job = Requisition.query.get(job_id)
@@ -48,7 +76,17 @@ class HybridResumeAnalyzer:
                 "raw_text": "Job not found"
             }
 
-        job_description = job.description or ""
+        job_description = condense_job_description(job.description or "")
+        resume_content = condense_cv(resume_content or "")
+
+        # The same CV analysed against the same job description (re-uploads,
+        # retried jobs) is answered from the shared analysis cache
+        cache_key = AnalysisCache.make_key(resume_content, job_description, HYBRID_MODEL,
+                                           prompt_version=HYBRID_PROMPT_VERSION)
+        if AI_CACHE_ENABLED:
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         # Construct prompt
         prompt = f"""
@@ -73,17 +111,36 @@ Suggestions:
 """
 
         try:
-            # Call OpenRouter
-            response = openai_client.chat.completions.create(
-                model="openrouter/auto",
-                messages=[
-                    {"role": "system", "content": "You are an AI recruitment assistant. Always return results in the required format only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                top_p=0.9,
-                max_tokens=1024
-            )
+            # Call OpenRouter (within the request budget, through the shared circuit breaker)
+            call = LLMCall(HYBRID_MODEL)
+            call.attempts = 1
+            try:
+                acquire_budget()
+                response = openrouter_breaker.call(
+                    openai_client.chat.completions.create,
+                    is_failure=_is_upstream_failure,
+                    model=HYBRID_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are an AI recruitment assistant. Always return results in the required format only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    top_p=0.9,
+                    max_tokens=1024,
+                    extra_body={"usage": {"include": True}},
+                )
+            except BudgetExhaustedError:
+                call.finish("throttled")
+                raise
+            except CircuitOpenError:
+                call.finish("circuit_open")
+                raise
+            except Exception:
+                call.finish("error")
+                raise
+            # openrouter/auto resolves to a concrete model, reported in the response
+            call.add_usage(response.usage, model=response.model)
+            call.finish("success")
 
             text = response.choices[0].message.content or ""
 
@@ -106,14 +163,20 @@ Suggestions:
                 suggestions_text = suggestions_match.group(1)
                 suggestions = [line.strip("- ").strip() for line in suggestions_text.strip().splitlines() if line.strip()]
 
-            return {
+            result = {
                 "match_score": match_score,
                 "missing_skills": missing_skills,
                 "suggestions": suggestions,
                 "raw_text": text
             }
+            # Only cache answers that followed the requested format
+            if AI_CACHE_ENABLED and score_match:
+                analysis_cache.set(cache_key, result)
+            return result
 
         except Exception as e:
+            if raise_errors or isinstance(e, (CircuitOpenError, BudgetExhaustedError)):
+                raise
             return {
                 "match_score": 0,
                 "missing_skills": [],
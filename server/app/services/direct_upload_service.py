@@ -0,0 +1,164 @@
+# app/services/direct_upload_service.py
+"""
+Signed direct-to-Cloudinary uploads.
+
+Instead of streaming files through a Flask worker, the client asks
+``issue_upload`` for signed upload parameters, posts the file straight to
+Cloudinary and then reports back:
+
+1. ``issue_upload`` picks the public_id (inside the kind's folder, containing
+   a random nonce), signs it together with the folder, timestamp and allowed
+   formats, and stores the nonce in Redis for ``DIRECT_UPLOAD_TTL`` seconds.
+   The client cannot change any signed parameter without invalidating the
+   signature.
+2. ``verify_upload`` checks the nonce belongs to the caller, verifies the
+   response signature Cloudinary returned to the client, then looks the
+   resource up with the Admin API to enforce the size limit (Cloudinary
+   cannot enforce one on a signed upload). Rejected uploads are deleted.
+3. Once the upload has been applied (resume job queued, profile updated)
+   ``consume_upload`` deletes the nonce, so each upload completes once; a
+   failure before that leaves the upload open for the client to retry.
+
+Background jobs fetch completed uploads with ``download_upload``.
+"""
+import json
+import logging
+import secrets
+import time
+from typing import Any, Dict, Optional
+
+import cloudinary
+import cloudinary.api
+import requests
+import cloudinary.uploader
+import cloudinary.utils
+from cloudinary.exceptions import NotFound
+from flask import current_app
+
+from app.extensions import redis_client
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_KINDS = {
+    "resume": {"folder": "candidate_cvs", "resource_type": "raw", "limit": "DIRECT_UPLOAD_MAX_DOCUMENT_BYTES"},
+    "document": {"folder": "candidate_cvs", "resource_type": "raw", "limit": "DIRECT_UPLOAD_MAX_DOCUMENT_BYTES"},
+    "profile_picture": {"folder": "profile_pics", "resource_type": "image", "limit": "DIRECT_UPLOAD_MAX_IMAGE_BYTES",
+                        "allowed_formats": "png,jpg,jpeg,webp", "format": "jpg"},
+}
+
+
+class DirectUploadError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _nonce_key(nonce: str) -> str:
+    return f"upload:nonce:{nonce}"
+
+
+def issue_upload(kind: str, user_id: int, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Signed parameters for one upload of ``kind``. ``context`` (e.g. the
+    application id) is kept server-side and handed back on completion.
+    """
+    spec = UPLOAD_KINDS.get(kind)
+    if spec is None:
+        raise DirectUploadError(f"Unknown upload kind: {kind}")
+
+    config = cloudinary.config()
+    if not config.api_secret:
+        raise DirectUploadError("Direct uploads are not configured", status=503)
+
+    nonce = secrets.token_urlsafe(16)
+    ttl = current_app.config["DIRECT_UPLOAD_TTL"]
+    max_bytes = current_app.config[spec["limit"]]
+    params = {
+        "folder": spec["folder"],
+        "public_id": f"{kind}_{user_id}_{nonce}",
+        "timestamp": int(time.time()),
+    }
+    for option in ("allowed_formats", "format"):
+        if option in spec:
+            params[option] = spec[option]
+    params["signature"] = cloudinary.utils.api_sign_request(params, config.api_secret)
+
+    redis_client.set(_nonce_key(nonce), json.dumps({
+        "kind": kind,
+        "user_id": int(user_id),
+        "public_id": f"{spec['folder']}/{params['public_id']}",
+        "context": context or {},
+    }), ex=ttl)
+
+    return {
+        "upload_id": nonce,
+        "upload_url": cloudinary.utils.cloudinary_api_url("upload", resource_type=spec["resource_type"]),
+        "params": {**params, "api_key": config.api_key},
+        "max_bytes": max_bytes,
+        "expires_in": ttl,
+    }
+
+
+def verify_upload(upload_id: str, user_id: int, version: Any, signature: str) -> Dict[str, Any]:
+    """
+    Verify a finished upload and return {"kind", "url", "bytes", "format",
+    "public_id", "context"}. Raises DirectUploadError. The upload stays open
+    until ``consume_upload``.
+    """
+    key = _nonce_key(upload_id or "")
+    raw = redis_client.get(key)
+    if not raw:
+        raise DirectUploadError("Upload not found or expired", status=404)
+    issued = json.loads(raw)
+    if issued["user_id"] != int(user_id):
+        raise DirectUploadError("Upload belongs to another user", status=403)
+
+    public_id = issued["public_id"]
+    if not signature or not cloudinary.utils.verify_api_response_signature(public_id, version, signature):
+        raise DirectUploadError("Invalid upload signature")
+
+    spec = UPLOAD_KINDS[issued["kind"]]
+    try:
+        resource = cloudinary.api.resource(public_id, resource_type=spec["resource_type"])
+    except NotFound:
+        raise DirectUploadError("Uploaded file not found", status=404) from None
+
+    max_bytes = current_app.config[spec["limit"]]
+    if resource.get("bytes", 0) > max_bytes:
+        _destroy(public_id, spec["resource_type"])
+        redis_client.delete(key)
+        raise DirectUploadError(f"File is larger than {max_bytes // (1024 * 1024)} MB", status=413)
+
+    return {
+        "kind": issued["kind"],
+        "url": resource.get("secure_url"),
+        "bytes": resource.get("bytes", 0),
+        "format": resource.get("format"),
+        "public_id": public_id,
+        "context": issued["context"],
+    }
+
+
+def consume_upload(upload_id: str) -> bool:
+    """Close a verified upload; False when a concurrent request already did."""
+    return bool(redis_client.delete(_nonce_key(upload_id or "")))
+
+
+def _destroy(public_id: str, resource_type: str):
+    try:
+        cloudinary.uploader.destroy(public_id, resource_type=resource_type, invalidate=True)
+    except Exception as e:
+        logger.warning("Could not delete rejected upload %s: %s", public_id, e)
+
+
+def download_upload(url: str, max_bytes: int) -> bytes:
+    """Fetch an uploaded file, refusing anything over ``max_bytes``."""
+    with requests.get(url, stream=True, timeout=(5, 60)) as response:
+        response.raise_for_status()
+        chunks, size = [], 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise DirectUploadError(f"File is larger than {max_bytes} bytes", status=413)
+            chunks.append(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,314 @@
+# app/services/job_queue.py
+"""
+Small Redis-backed job queue used to move slow work (resume processing,
+image processing, ...) out of the gunicorn request cycle.
+
+Layout in Redis for a queue called ``resume``:
+    jobs:resume:pending      list of job ids waiting to run
+    jobs:resume:processing   list of job ids currently held by a worker
+    jobs:resume:delayed      sorted set of job ids waiting for a retry (score = run at)
+    jobs:resume:dead         list of job ids that exhausted their attempts
+    job:<id>                 hash with status, payload, result, timings, ...
+    job:<id>:blob            optional base64 file payload (e.g. the uploaded CV)
+
+Workers are started with ``flask worker`` (see app/cli.py).
+"""
+import base64
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from app.extensions import redis_client
+from app.services.llm_usage_service import llm_route
+from app.utils.token_bucket import llm_budget_user
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "JOB_MAX_ATTEMPTS": 3,
+    "JOB_RETRY_BACKOFF": 10,
+    "JOB_RESULT_TTL": 24 * 3600,
+    "JOB_VISIBILITY_TIMEOUT": 15 * 60,
+    "JOB_LLM_BUDGET_WAIT": 120,
+}
+
+# job_type -> handler(ctx) -> result dict
+HANDLERS: Dict[str, Callable[["JobContext"], Dict[str, Any]]] = {}
+
+
+def register_handler(job_type: str):
+    """Decorator registering the function that processes jobs of ``job_type``."""
+    def decorator(fn):
+        HANDLERS[job_type] = fn
+        return fn
+    return decorator
+
+
+def job_setting(name: str) -> int:
+    if has_app_context():
+        return int(current_app.config.get(name, DEFAULTS[name]))
+    return DEFAULTS[name]
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class PermanentJobError(Exception):
+    """Raise from a handler when retrying cannot help; the job goes straight to dead."""
+
+
+class JobContext:
+    """Handed to job handlers: payload access, stage timing and checkpointed state."""
+
+    def __init__(self, queue: "JobQueue", job: Dict[str, Any]):
+        self.queue = queue
+        self.job = job
+        self.id = job["id"]
+        self.payload = job.get("payload") or {}
+        # State survives retries, so completed stages can be skipped
+        self.state = job.get("state") or {}
+        self.timings = job.get("timings") or {}
+        self._blob = None
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_timing(name, round((time.perf_counter() - start) * 1000, 1))
+
+    def record_timing(self, name: str, elapsed_ms: float):
+        """Record a stage timed elsewhere (e.g. one that ran in a background thread)."""
+        self.timings[name] = elapsed_ms
+        self.queue._update(self.id, timings=self.timings, stage=name)
+
+    def checkpoint(self, **values):
+        self.state.update(values)
+        self.queue._update(self.id, state=self.state)
+
+    def blob(self) -> Optional[bytes]:
+        # Loaded once per attempt so stages share a single copy of the file
+        if self._blob is None:
+            self._blob = self.queue.get_blob(self.id)
+        return self._blob
+
+
+class JobQueue:
+    def __init__(self, name: str, client=None):
+        self.name = name
+        self.client = client if client is not None else redis_client
+
+    # ------------------- keys -------------------
+    @property
+    def pending_key(self):
+        return f"jobs:{self.name}:pending"
+
+    @property
+    def processing_key(self):
+        return f"jobs:{self.name}:processing"
+
+    @property
+    def delayed_key(self):
+        return f"jobs:{self.name}:delayed"
+
+    @property
+    def dead_key(self):
+        return f"jobs:{self.name}:dead"
+
+    @staticmethod
+    def job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def blob_key(job_id: str) -> str:
+        return f"job:{job_id}:blob"
+
+    # ------------------- producer side -------------------
+    @staticmethod
+    def new_job_id() -> str:
+        return uuid.uuid4().hex
+
+    def enqueue(self, job_type: str, payload: Dict[str, Any], blob: Optional[bytes] = None,
+                max_attempts: Optional[int] = None, job_id: Optional[str] = None) -> str:
+        """Queue a job; pass ``job_id`` (from new_job_id) when the id must be known beforehand."""
+        job_id = job_id or self.new_job_id()
+        record = {
+            "id": job_id,
+            "queue": self.name,
+            "type": job_type,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts or job_setting("JOB_MAX_ATTEMPTS"),
+            "payload": json.dumps(payload),
+            "state": json.dumps({}),
+            "timings": json.dumps({}),
+            "created_at": _now_iso(),
+        }
+        pipe = self.client.pipeline()
+        if blob is not None:
+            # Keep the blob around long enough to cover every retry
+            pipe.setex(self.blob_key(job_id), job_setting("JOB_RESULT_TTL"),
+                       base64.b64encode(blob).decode("ascii"))
+        pipe.hset(self.job_key(job_id), mapping=record)
+        pipe.lpush(self.pending_key, job_id)
+        pipe.execute()
+        logger.info("Enqueued %s job %s on %s", job_type, job_id, self.name)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.hgetall(self.job_key(job_id))
+        if not raw:
+            return None
+        job = dict(raw)
+        for field in ("payload", "state", "timings", "result"):
+            if job.get(field):
+                job[field] = json.loads(job[field])
+        job["attempts"] = int(job.get("attempts") or 0)
+        job["max_attempts"] = int(job.get("max_attempts") or 0)
+        return job
+
+    def get_blob(self, job_id: str) -> Optional[bytes]:
+        raw = self.client.get(self.blob_key(job_id))
+        return base64.b64decode(raw) if raw else None
+
+    def dead_letters(self, limit: int = 50):
+        ids = self.client.lrange(self.dead_key, 0, limit - 1)
+        return [job for job in (self.get(job_id) for job_id in ids) if job]
+
+    def stats(self) -> Dict[str, int]:
+        pipe = self.client.pipeline()
+        pipe.llen(self.pending_key)
+        pipe.llen(self.processing_key)
+        pipe.zcard(self.delayed_key)
+        pipe.llen(self.dead_key)
+        pending, processing, delayed, dead = pipe.execute()
+        return {"pending": pending, "processing": processing, "delayed": delayed, "dead": dead}
+
+    # ------------------- consumer side -------------------
+    def _update(self, job_id: str, **fields):
+        mapping = {
+            k: json.dumps(v) if isinstance(v, (dict, list)) else v
+            for k, v in fields.items() if v is not None
+        }
+        if mapping:
+            self.client.hset(self.job_key(job_id), mapping=mapping)
+
+    def promote_due(self) -> int:
+        """Move delayed (retrying) jobs whose backoff has elapsed back to pending."""
+        due = self.client.zrangebyscore(self.delayed_key, 0, time.time())
+        moved = 0
+        for job_id in due:
+            # zrem guards against two workers promoting the same job
+            if self.client.zrem(self.delayed_key, job_id):
+                self.client.lpush(self.pending_key, job_id)
+                moved += 1
+        return moved
+
+    def requeue_stalled(self) -> int:
+        """Return jobs to pending whose worker died mid-run."""
+        cutoff = time.time() - job_setting("JOB_VISIBILITY_TIMEOUT")
+        requeued = 0
+        for job_id in self.client.lrange(self.processing_key, 0, -1):
+            started = self.client.hget(self.job_key(job_id), "started_ts")
+            if started and float(started) < cutoff:
+                if self.client.lrem(self.processing_key, 1, job_id):
+                    self._update(job_id, status="queued")
+                    self.client.lpush(self.pending_key, job_id)
+                    requeued += 1
+        return requeued
+
+    def reserve(self, timeout: int = 5) -> Optional[Dict[str, Any]]:
+        self.promote_due()
+        job_id = self.client.brpoplpush(self.pending_key, self.processing_key, timeout=timeout)
+        if not job_id:
+            return None
+        self.client.hincrby(self.job_key(job_id), "attempts", 1)
+        self._update(job_id, status="running", started_at=_now_iso(), started_ts=time.time())
+        job = self.get(job_id)
+        if job is None:
+            # Record expired underneath us; drop it
+            self.client.lrem(self.processing_key, 1, job_id)
+        return job
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        ttl = job_setting("JOB_RESULT_TTL")
+        self._update(job_id, status="succeeded", result=result, error="", finished_at=_now_iso())
+        pipe = self.client.pipeline()
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.expire(self.job_key(job_id), ttl)
+        pipe.delete(self.blob_key(job_id))
+        pipe.execute()
+
+    def fail(self, job_id: str, error: str) -> str:
+        job = self.get(job_id) or {}
+        attempts = job.get("attempts", 0)
+        self.client.lrem(self.processing_key, 1, job_id)
+
+        if attempts < job.get("max_attempts", 0):
+            delay = job_setting("JOB_RETRY_BACKOFF") * (2 ** (attempts - 1))
+            self._update(job_id, status="retrying", error=error, retry_at=time.time() + delay)
+            self.client.zadd(self.delayed_key, {job_id: time.time() + delay})
+            logger.warning("Job %s failed (attempt %d), retrying in %ss: %s", job_id, attempts, delay, error)
+            return "retrying"
+
+        self._update(job_id, status="dead", error=error, finished_at=_now_iso())
+        self.client.lpush(self.dead_key, job_id)
+        logger.error("Job %s moved to dead-letter list after %d attempts: %s", job_id, attempts, error)
+        return "dead"
+
+    def process(self, job: Dict[str, Any]) -> str:
+        handler = HANDLERS.get(job.get("type"))
+        if handler is None:
+            self._update(job["id"], max_attempts=0)
+            return self.fail(job["id"], f"No handler registered for job type {job.get('type')!r}")
+
+        ctx = JobContext(self, job)
+        # LLM calls made by the handler are attributed to the job type and
+        # charged to the user who queued the job (jobs may wait longer for budget)
+        user_id = ctx.payload.get("user_id")
+        budget_user = f"user:{user_id}" if user_id else f"job:{job.get('type')}"
+        try:
+            with llm_route(f"job:{job.get('type')}"), \
+                    llm_budget_user(budget_user, max_wait=job_setting("JOB_LLM_BUDGET_WAIT")):
+                result = handler(ctx)
+        except PermanentJobError as e:
+            logger.error("Job %s (%s) failed permanently: %s", job["id"], job.get("type"), e)
+            self._update(job["id"], max_attempts=0)
+            return self.fail(job["id"], str(e))
+        except Exception as e:
+            logger.exception("Job %s (%s) raised", job["id"], job.get("type"))
+            return self.fail(job["id"], str(e))
+
+        self.complete(job["id"], result or {})
+        return "succeeded"
+
+
+def run_worker(queue_names, poll_timeout: int = 5, burst: bool = False, after_job=None):
+    """
+    Process jobs from one or more queues until interrupted.
+    With ``burst`` the worker exits once every queue is empty.
+    """
+    queues = [JobQueue(name) for name in queue_names]
+    logger.info("Worker started for queues: %s", ", ".join(queue_names))
+    while True:
+        did_work = False
+        for queue in queues:
+            queue.requeue_stalled()
+            job = queue.reserve(timeout=poll_timeout if len(queues) == 1 else 1)
+            if job is None:
+                continue
+            did_work = True
+            status = queue.process(job)
+            logger.info("Job %s finished with status %s", job["id"], status)
+            if after_job:
+                after_job()
+        if not did_work and burst:
+            return
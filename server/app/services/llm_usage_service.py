@@ -0,0 +1,189 @@
+# app/services/llm_usage_service.py
+"""
+Per-call instrumentation of LLM requests.
+
+Every logical call (all retries included) records model, calling route,
+outcome, latency, retry count, prompt/completion tokens and cost into the
+in-process metrics registry (exported on /metrics) and upserts a per-day
+rollup row in ``llm_usage_daily``, which aggregates across all processes.
+
+The route is the Flask endpoint for web requests, or whatever was set with
+``llm_route(...)`` (background jobs use "job:<type>").
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from flask import has_app_context, has_request_context, request
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.extensions import db
+from app.models import LLMUsageDaily
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Fallback prices (USD per 1M prompt / completion tokens) used when the
+# provider does not report cost, e.g. '{"openai/gpt-4o-mini": [0.15, 0.6]}'
+LLM_PRICES = json.loads(os.environ.get("LLM_PRICES_JSON") or "{}")
+LLM_USAGE_ROLLUP_ENABLED = os.environ.get("LLM_USAGE_ROLLUP_ENABLED", "true").lower() == "true"
+
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 240)
+
+call_latency = REGISTRY.histogram(
+    "llm_call_seconds",
+    "Latency of logical LLM calls, retries included",
+    labelnames=("model", "route", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+calls_total = REGISTRY.counter(
+    "llm_calls_total",
+    "LLM calls by outcome",
+    labelnames=("model", "route", "outcome"),
+)
+retries_total = REGISTRY.counter(
+    "llm_retries_total",
+    "Retried attempts within LLM calls",
+    labelnames=("model", "route"),
+)
+tokens_total = REGISTRY.counter(
+    "llm_tokens_total",
+    "Tokens reported by the provider",
+    labelnames=("model", "route", "kind"),
+)
+cost_total = REGISTRY.counter(
+    "llm_cost_usd_total",
+    "Cost of LLM calls in USD",
+    labelnames=("model", "route"),
+)
+
+_route: ContextVar[Optional[str]] = ContextVar("llm_route", default=None)
+
+
+@contextmanager
+def llm_route(name: str):
+    """Label LLM calls made inside the block with ``name``."""
+    token = _route.set(name)
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+def current_route() -> str:
+    route = _route.get()
+    if route:
+        return route
+    if has_request_context():
+        return request.endpoint or request.path
+    return "unknown"
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prices = LLM_PRICES.get(model)
+    if not prices:
+        return 0.0
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class LLMCall:
+    """Tracks one logical LLM call; ``finish`` records it exactly once."""
+
+    def __init__(self, model: Optional[str], route: Optional[str] = None):
+        self.model = model or "unknown"
+        self.route = route or current_route()
+        self.start = time.perf_counter()
+        self.attempts = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost: Optional[float] = None
+        self.finished = False
+
+    def add_usage(self, usage: Optional[Dict[str, Any]], model: Optional[str] = None):
+        """Accepts an OpenAI-style usage dict (or SDK object) from the response."""
+        if model:
+            self.model = model
+        if not usage:
+            return
+        if not isinstance(usage, dict):
+            usage = {k: getattr(usage, k, None) for k in ("prompt_tokens", "completion_tokens", "cost")}
+        self.prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        self.completion_tokens = int(usage.get("completion_tokens") or 0)
+        if usage.get("cost") is not None:
+            self.cost = float(usage["cost"])
+
+    def finish(self, outcome: str):
+        if self.finished:
+            return
+        self.finished = True
+        elapsed = time.perf_counter() - self.start
+        retries = max(0, self.attempts - 1)
+        cost = self.cost if self.cost is not None else estimate_cost(
+            self.model, self.prompt_tokens, self.completion_tokens)
+        labels = {"model": self.model, "route": self.route}
+
+        call_latency.observe(elapsed, outcome=outcome, **labels)
+        calls_total.inc(outcome=outcome, **labels)
+        if retries:
+            retries_total.inc(retries, **labels)
+        if self.prompt_tokens:
+            tokens_total.inc(self.prompt_tokens, kind="prompt", **labels)
+        if self.completion_tokens:
+            tokens_total.inc(self.completion_tokens, kind="completion", **labels)
+        if cost:
+            cost_total.inc(cost, **labels)
+
+        logger.info(
+            "LLM call model=%s route=%s outcome=%s latency=%.2fs retries=%d tokens=%d/%d cost=%.6f",
+            self.model, self.route, outcome, elapsed, retries,
+            self.prompt_tokens, self.completion_tokens, cost,
+        )
+        record_daily_usage(self.model, self.route, outcome, elapsed, retries,
+                           self.prompt_tokens, self.completion_tokens, cost)
+
+
+def record_daily_usage(model: str, route: str, outcome: str, elapsed: float, retries: int,
+                       prompt_tokens: int, completion_tokens: int, cost: float):
+    """Upsert today's rollup row on its own connection, outside the caller's transaction."""
+    if not LLM_USAGE_ROLLUP_ENABLED or not has_app_context():
+        return
+
+    table = LLMUsageDaily.__table__
+    latency_ms = elapsed * 1000
+    values = {
+        "day": datetime.utcnow().date(),
+        "model": model[:150],
+        "route": route[:150],
+        "calls": 1,
+        "failures": 0 if outcome == "success" else 1,
+        "retries": retries,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": cost,
+        "latency_ms_total": latency_ms,
+        "latency_ms_max": latency_ms,
+        "updated_at": datetime.utcnow(),
+    }
+    try:
+        stmt = insert(table).values(**values)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_llm_usage_daily",
+            set_={
+                **{col: table.c[col] + excluded[col] for col in (
+                    "calls", "failures", "retries", "prompt_tokens", "completion_tokens",
+                    "cost_usd", "latency_ms_total")},
+                "latency_ms_max": func.greatest(table.c.latency_ms_max, excluded.latency_ms_max),
+                "updated_at": excluded.updated_at,
+            },
+        )
+        with db.engine.begin() as connection:
+            connection.execute(stmt)
+    except Exception as e:
+        logger.warning("Could not record LLM usage rollup: %s", e)
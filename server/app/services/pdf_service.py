@@ -1,10 +1,13 @@
-from pdfminer.high_level import extract_text
 import os
 
+from app.services.text_extraction_service import extract_pdf_text
+
+
 class PDFService:
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
         if not os.path.exists(file_path):
             raise FileNotFoundError("PDF file not found")
-        text = extract_text(file_path)
+        # Read by the extraction pool process straight from disk
+        text = extract_pdf_text(file_path)
         return text.strip()
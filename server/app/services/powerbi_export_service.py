@@ -0,0 +1,217 @@
+# app/services/powerbi_export_service.py
+"""
+Set-based Power BI export.
+
+One query returns one row per application, whatever the dataset size:
+the filtered applications form a CTE, the latest CV analysis per candidate is
+picked with ``DISTINCT ON``, the first assessment per application likewise,
+and each application's interviews (with their hiring managers) are
+aggregated into arrays. Rows are fetched from a server-side cursor in
+batches of ``EXPORT_BATCH_SIZE`` and serialised one at a time, so memory
+stays flat and the response starts streaming immediately.
+
+Records can be written as a JSON array (the default), NDJSON (one object
+per line) or CSV, where list and object values are JSON-encoded cells.
+
+PostgreSQL only (DISTINCT ON, array_agg ... ORDER BY, json functions).
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.extensions import db
+from app.models import Application, AssessmentResult, Candidate, CVAnalysis, Interview, Requisition, User
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _json_array_length(column):
+    return case((func.json_typeof(column) == "array", func.json_array_length(column)), else_=0)
+
+
+def _display_name(user):
+    """Users have no name column; use the profile's names, else the email."""
+    profile = user.profile
+    full_name = func.nullif(func.trim(func.concat_ws(
+        " ", profile.op("->>")("first_name"), profile.op("->>")("last_name"))), "")
+    return func.coalesce(profile.op("->>")("full_name"), full_name, user.email)
+
+
+def build_export_query(job_id: Optional[int] = None, candidate_id: Optional[int] = None,
+                       status: Optional[str] = None, start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None):
+    conditions = []
+    if job_id:
+        conditions.append(Application.requisition_id == job_id)
+    if candidate_id:
+        conditions.append(Application.candidate_id == candidate_id)
+    if status:
+        conditions.append(Application.status == status)
+    if start_date:
+        conditions.append(Application.created_at >= start_date)
+    if end_date:
+        conditions.append(Application.created_at <= end_date)
+
+    apps = select(Application).where(*conditions).cte("apps")
+
+    assessment = (
+        select(AssessmentResult.application_id, AssessmentResult.total_score,
+               AssessmentResult.percentage_score, AssessmentResult.recommendation)
+        .join(apps, apps.c.id == AssessmentResult.application_id)
+        .distinct(AssessmentResult.application_id)
+        .order_by(AssessmentResult.application_id, AssessmentResult.id)
+        .cte("assessment")
+    )
+
+    manager = User.__table__.alias("manager")
+    interview_order = (Interview.scheduled_time, Interview.id)
+
+    def ordered(column):
+        return func.array_agg(aggregate_order_by(column, *interview_order))
+
+    interviews = (
+        select(
+            Interview.application_id,
+            func.count(Interview.id).label("interview_count"),
+            ordered(Interview.scheduled_time).label("interview_dates"),
+            ordered(Interview.interview_type).label("interview_types"),
+            ordered(Interview.status).label("interview_statuses"),
+            ordered(_display_name(manager.c)).label("interview_hiring_managers"),
+        )
+        .join(apps, apps.c.id == Interview.application_id)
+        .outerjoin(manager, manager.c.id == Interview.hiring_manager_id)
+        .group_by(Interview.application_id)
+        .cte("interview_summary")
+    )
+
+    latest_cv = (
+        select(
+            CVAnalysis.candidate_id,
+            CVAnalysis.result.op("->")("match_score").label("skills_match"),
+            CVAnalysis.result.op("->")("missing_skills").label("missing_skills"),
+            CVAnalysis.created_at,
+        )
+        .where(CVAnalysis.candidate_id.in_(select(apps.c.candidate_id)))
+        .distinct(CVAnalysis.candidate_id)
+        .order_by(CVAnalysis.candidate_id, CVAnalysis.created_at.desc().nulls_last(), CVAnalysis.id.desc())
+        .cte("latest_cv")
+    )
+
+    return (
+        select(
+            apps.c.id.label("application_id"),
+            apps.c.status.label("application_status"),
+            apps.c.cv_score,
+            apps.c.assessment_score,
+            apps.c.overall_score,
+            apps.c.created_at,
+            apps.c.saved_at,
+            apps.c.last_saved_screen,
+            assessment.c.total_score.label("assessment_total_score"),
+            assessment.c.percentage_score.label("assessment_percentage"),
+            assessment.c.recommendation,
+            Candidate.id.label("candidate_id"),
+            Candidate.full_name.label("candidate_name"),
+            User.email.label("candidate_email"),
+            Candidate.phone.label("candidate_phone"),
+            Candidate.title.label("candidate_title"),
+            Candidate.location.label("candidate_location"),
+            Candidate.skills.label("candidate_skills"),
+            User.is_verified.label("candidate_verified"),
+            _json_array_length(Candidate.work_experience).label("experience_count"),
+            _json_array_length(Candidate.education).label("education_count"),
+            Candidate.linkedin,
+            Requisition.id.label("job_id"),
+            Requisition.title.label("job_title"),
+            Requisition.category.label("job_category"),
+            Requisition.created_at.label("job_created_at"),
+            Requisition.published_on.label("job_published_on"),
+            Requisition.required_skills.label("job_required_skills"),
+            func.coalesce(interviews.c.interview_count, 0).label("interview_count"),
+            interviews.c.interview_dates,
+            interviews.c.interview_types,
+            interviews.c.interview_statuses,
+            interviews.c.interview_hiring_managers,
+            latest_cv.c.skills_match.label("cv_skills_match"),
+            latest_cv.c.missing_skills.label("cv_missing_skills"),
+            latest_cv.c.created_at.label("cv_analysis_date"),
+        )
+        .select_from(apps)
+        .outerjoin(Candidate, Candidate.id == apps.c.candidate_id)
+        .outerjoin(User, User.id == Candidate.user_id)
+        .outerjoin(Requisition, Requisition.id == apps.c.requisition_id)
+        .outerjoin(assessment, assessment.c.application_id == apps.c.id)
+        .outerjoin(interviews, interviews.c.application_id == apps.c.id)
+        .outerjoin(latest_cv, latest_cv.c.candidate_id == apps.c.candidate_id)
+        .order_by(apps.c.id)
+    )
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def export_records(query) -> Iterator[Dict[str, Any]]:
+    """Run the export query on a server-side cursor and yield one dict per application."""
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for row in result.mappings():
+        record = {key: _plain(value) for key, value in row.items()}
+        for key in ("interview_dates", "interview_types", "interview_statuses", "interview_hiring_managers"):
+            if record[key] is None:
+                record[key] = []
+        yield record
+
+
+def json_array_stream(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Serialise records as one JSON array, a record at a time."""
+    yield "["
+    for index, record in enumerate(records):
+        yield ("," if index else "") + json.dumps(record, default=str)
+    yield "]"
+
+
+def ndjson_stream(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, default=str) + "\n"
+
+
+def csv_stream(records: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue()
+
+    yield line(columns)
+    for record in records:
+        yield line(_csv_cell(record.get(column)) for column in columns)
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return "" if value is None else value
+
+
+def export_columns(query) -> List[str]:
+    return [column.key for column in query.selected_columns]
+
+
+# format -> (mimetype, serialiser(records, columns))
+EXPORT_FORMATS = {
+    "json": ("application/json", lambda records, columns: json_array_stream(records)),
+    "ndjson": ("application/x-ndjson", lambda records, columns: ndjson_stream(records)),
+    "csv": ("text/csv", csv_stream),
+}
@@ -0,0 +1,219 @@
+# app/services/prescreen_service.py
+"""
+Deterministic, in-process pre-screen of a resume against a requisition.
+
+Runs in a few milliseconds and decides whether the expensive LLM analysis
+is worth paying for: candidates that trip a knockout rule or score below
+PRESCREEN_LLM_THRESHOLD are scored locally and never reach the LLM.
+"""
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+DEFAULT_THRESHOLD = 30
+
+# Weights of the three components of the local score (sum to 1)
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+QUALIFICATION_WEIGHT = 0.15
+
+STOPWORDS = {
+    "and", "the", "with", "for", "from", "into", "that", "this", "have", "has",
+    "must", "should", "will", "able", "ability", "strong", "good", "excellent",
+    "knowledge", "experience", "years", "year", "degree", "related", "field",
+    "equivalent", "preferred", "minimum", "least", "plus", "other", "etc", "such",
+    "skills", "working", "work", "understanding", "proficiency", "proficient",
+}
+
+EXPLICIT_YEARS_RE = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+YEAR_RANGE_RE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|date)\b",
+    re.IGNORECASE,
+)
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def _config(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def contains_term(text: str, term: str) -> bool:
+    """Whole-term match that keeps tokens like c++, c#, node.js intact."""
+    term = normalize(term)
+    if not term:
+        return False
+    pattern = r"(?<![a-z0-9])" + re.escape(term) + r"(?![a-z0-9+#])"
+    return re.search(pattern, text) is not None
+
+
+def _keywords(phrase: str) -> List[str]:
+    return [w.strip(".-") for w in WORD_RE.findall(normalize(phrase))
+            if len(w.strip(".-")) > 2 and w.strip(".-") not in STOPWORDS]
+
+
+def extract_experience_years(text: str) -> Optional[float]:
+    """
+    Best-effort years of experience: the larger of any explicit
+    "N years" claim and the merged span of year ranges (2016 - 2020, 2019 - present).
+    """
+    explicit = [float(m) for m in EXPLICIT_YEARS_RE.findall(text) if float(m) <= 50]
+
+    current_year = datetime.utcnow().year
+    spans = []
+    for start, end in YEAR_RANGE_RE.findall(text):
+        start_year = int(start)
+        end_year = current_year if not end[:1].isdigit() else int(end)
+        if start_year <= end_year <= current_year:
+            spans.append((start_year, end_year))
+
+    span_years = 0
+    if spans:
+        spans.sort()
+        merged = [list(spans[0])]
+        for start, end in spans[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        span_years = sum(end - start for start, end in merged)
+
+    best = max(explicit + [span_years]) if (explicit or span_years) else None
+    return float(best) if best is not None else None
+
+
+def evaluate_knockout_rules(rules, text: str, experience_years: Optional[float]) -> Dict[str, List[str]]:
+    """
+    Supported rule shapes:
+      "AWS Certified"                                  -> term must appear
+      {"type": "skill" | "keyword", "value": "..."}    -> term must appear
+      {"type": "exclude", "value": "..."}              -> term must not appear
+      {"type": "experience", "min_years": 3}           -> at least N years
+    Anything else is reported as unevaluated and never knocks a candidate out.
+    """
+    failed, passed, unevaluated = [], [], []
+    for rule in rules or []:
+        if isinstance(rule, str):
+            rule = {"type": "keyword", "value": rule}
+        if not isinstance(rule, dict):
+            unevaluated.append(str(rule))
+            continue
+
+        rule_type = str(rule.get("type") or rule.get("field") or "").lower()
+        value = rule.get("value")
+        label = rule.get("label") or f"{rule_type}: {value if value is not None else rule.get('min_years')}"
+
+        if rule_type in ("skill", "keyword", "required", "certification"):
+            ok = bool(value) and contains_term(text, str(value))
+        elif rule_type in ("exclude", "excluded", "keyword_absent"):
+            ok = bool(value) and not contains_term(text, str(value))
+        elif rule_type in ("experience", "min_experience", "years"):
+            try:
+                minimum = float(rule.get("min_years", value))
+            except (TypeError, ValueError):
+                unevaluated.append(label)
+                continue
+            ok = experience_years is not None and experience_years >= minimum
+        else:
+            unevaluated.append(label)
+            continue
+
+        (passed if ok else failed).append(label)
+
+    return {"failed": failed, "passed": passed, "unevaluated": unevaluated}
+
+
+def prescreen_resume(resume_text: str, requisition) -> Dict[str, Any]:
+    """Score a resume locally and decide whether to escalate to the LLM."""
+    started = time.perf_counter()
+    text = normalize(resume_text)
+    threshold = float(_config("PRESCREEN_LLM_THRESHOLD", DEFAULT_THRESHOLD))
+    rationale = []
+
+    # --- Skills ---
+    required_skills = [s for s in (requisition.required_skills or []) if isinstance(s, str) and s.strip()]
+    matched = [s for s in required_skills if contains_term(text, s)]
+    missing = [s for s in required_skills if s not in matched]
+    skill_score = len(matched) / len(required_skills) if required_skills else 1.0
+    if required_skills:
+        rationale.append(f"Matched {len(matched)}/{len(required_skills)} required skills.")
+
+    # --- Qualifications: a line counts as met when most of its keywords appear ---
+    qualifications = [q for q in (requisition.qualifications or []) if isinstance(q, str) and q.strip()]
+    met_qualifications = []
+    for qualification in qualifications:
+        words = _keywords(qualification)
+        if words and sum(contains_term(text, w) for w in words) / len(words) >= 0.5:
+            met_qualifications.append(qualification)
+    qualification_score = len(met_qualifications) / len(qualifications) if qualifications else 1.0
+    if qualifications:
+        rationale.append(f"Met {len(met_qualifications)}/{len(qualifications)} qualifications.")
+
+    # --- Experience ---
+    experience_years = extract_experience_years(resume_text or "")
+    min_experience = float(requisition.min_experience or 0)
+    if min_experience <= 0:
+        experience_score = 1.0
+    elif experience_years is None:
+        experience_score = 0.5  # unknown, neither reward nor punish fully
+        rationale.append("Could not determine years of experience.")
+    else:
+        experience_score = min(1.0, experience_years / min_experience)
+        rationale.append(f"Found ~{experience_years:g} years of experience (requires {min_experience:g}).")
+
+    score = round(100 * (
+        SKILL_WEIGHT * skill_score
+        + QUALIFICATION_WEIGHT * qualification_score
+        + EXPERIENCE_WEIGHT * experience_score
+    ))
+
+    # --- Knockout rules ---
+    knockouts = evaluate_knockout_rules(requisition.knockout_rules, text, experience_years)
+    knocked_out = bool(knockouts["failed"])
+    if knocked_out:
+        rationale.append("Failed knockout rules: " + ", ".join(knockouts["failed"]) + ".")
+
+    if not text.strip():
+        escalate = False
+        rationale.append("Resume text is empty.")
+    else:
+        escalate = not knocked_out and score >= threshold
+    if not escalate and not knocked_out and text.strip():
+        rationale.append(f"Score {score} is below the LLM threshold of {threshold:g}.")
+
+    return {
+        "score": score,
+        "escalate": escalate,
+        "knocked_out": knocked_out,
+        "threshold": threshold,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "met_qualifications": met_qualifications,
+        "experience_years": experience_years,
+        "required_experience": min_experience,
+        "knockout_rules": knockouts,
+        "rationale": rationale,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def prescreen_parser_result(prescreen: Dict[str, Any]) -> Dict[str, Any]:
+    """Parser result stored for applications that were not escalated to the LLM."""
+    suggestions = [f"Highlight experience with {skill}." for skill in prescreen["missing_skills"]]
+    return {
+        "match_score": prescreen["score"],
+        "missing_skills": prescreen["missing_skills"],
+        "suggestions": suggestions,
+        "recommendation": "reject" if prescreen["knocked_out"] else "not_shortlisted",
+        "raw_text": " ".join(prescreen["rationale"]),
+        "source": "prescreen",
+        "prescreen": prescreen,
+    }
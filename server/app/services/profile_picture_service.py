@@ -0,0 +1,179 @@
+# app/services/profile_picture_service.py
+"""
+Background resizing of profile pictures.
+
+An uploaded picture is stored as-is first (so the upload response can return
+a URL straight away), then a ``profile_picture_variants`` job on the
+``media`` queue decodes it once with Pillow, applies and strips the EXIF
+orientation (no EXIF or other metadata is written out), centre-crops it to
+squares of ``VARIANT_SIZES`` and encodes each as WebP and progressive JPEG.
+
+The variants go to ``profile_pics/candidate_<id>/<job>_<size>_<format>`` on
+Cloudinary and their URLs to ``Candidate.profile_picture_variants``;
+``profile_picture`` then points at the largest JPEG, and the original and the
+previous set of variants are deleted. List views use
+``Candidate.profile_picture_url(size)`` to pick a thumbnail.
+"""
+import io
+import logging
+import posixpath
+from typing import Any, Dict, Optional
+
+import cloudinary.api
+import cloudinary.uploader
+from flask import current_app
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.extensions import db
+from app.models import Candidate
+from app.services.direct_upload_service import DirectUploadError, download_upload
+from app.services.job_queue import JobQueue, PermanentJobError, register_handler
+
+logger = logging.getLogger(__name__)
+
+MEDIA_QUEUE = "media"
+VARIANTS_JOB_TYPE = "profile_picture_variants"
+
+VARIANT_SIZES = (512, 256, 128, 64)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+# Decoding larger images is refused (decompression bombs)
+MAX_PIXELS = 40_000_000
+
+media_queue = JobQueue(MEDIA_QUEUE)
+
+
+def enqueue_variants(candidate, source_url: str, source_public_id: Optional[str] = None,
+                     image_bytes: Optional[bytes] = None) -> str:
+    """Queue variant generation for the picture just stored at ``source_url``."""
+    return media_queue.enqueue(
+        VARIANTS_JOB_TYPE,
+        {"candidate_id": candidate.id, "source_url": source_url, "source_public_id": source_public_id},
+        blob=image_bytes,
+    )
+
+
+def build_variants(data: bytes) -> Dict[int, Dict[str, bytes]]:
+    """Encode ``data`` as square WebP and JPEG variants: {size: {"webp": bytes, "jpg": bytes}}."""
+    try:
+        image = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError:
+        raise ValueError("Not an image") from None
+    if image.width * image.height > MAX_PIXELS:
+        raise ValueError(f"Image is {image.width}x{image.height}; too large to process")
+
+    largest = VARIANT_SIZES[0]
+    # JPEG can decode at 1/2, 1/4 or 1/8 scale directly, far cheaper than a full decode
+    image.draft("RGB", (largest * 2, largest * 2))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        flat = Image.new("RGB", rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel("A"))
+        image = flat
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    variants = {}
+    current = image
+    for size in VARIANT_SIZES:
+        # Each size is cut from the previous one: less work, no visible loss
+        current = ImageOps.fit(current, (size, size), method=Image.Resampling.LANCZOS)
+        jpg, webp = io.BytesIO(), io.BytesIO()
+        current.save(jpg, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        current.save(webp, "WEBP", quality=WEBP_QUALITY, method=4)
+        variants[size] = {"jpg": jpg.getvalue(), "webp": webp.getvalue()}
+    return variants
+
+
+def _variant_prefix(candidate_id: int, token: str) -> str:
+    return f"profile_pics/candidate_{candidate_id}/{token}_"
+
+
+def _variant_token(variants: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The job token of a stored variant set, read back from one of its URLs."""
+    for formats in (variants or {}).values():
+        for url in formats.values():
+            return posixpath.basename(url).split("_", 1)[0]
+    return None
+
+
+def _upload_variant(prefix: str, size: int, fmt: str, data: bytes) -> str:
+    result = cloudinary.uploader.upload(
+        io.BytesIO(data),
+        public_id=f"{prefix}{size}_{fmt}",
+        resource_type="image",
+        overwrite=True,
+    )
+    return result["secure_url"]
+
+
+def _destroy(public_id: str = None, prefix: str = None):
+    try:
+        if prefix:
+            cloudinary.api.delete_resources_by_prefix(prefix, resource_type="image", invalidate=True)
+        else:
+            cloudinary.uploader.destroy(public_id, resource_type="image", invalidate=True)
+    except Exception as e:
+        logger.warning("Could not delete profile picture %s: %s", public_id or prefix, e)
+
+
+@register_handler(VARIANTS_JOB_TYPE)
+def process_profile_picture(ctx):
+    payload = ctx.payload
+    candidate = db.session.get(Candidate, payload["candidate_id"])
+    if not candidate:
+        raise PermanentJobError(f"Candidate {payload['candidate_id']} not found")
+    source_url = payload["source_url"]
+
+    with ctx.stage("fetch"):
+        data = ctx.blob()
+        if data is None:
+            try:
+                data = download_upload(source_url, current_app.config["DIRECT_UPLOAD_MAX_IMAGE_BYTES"])
+            except DirectUploadError as e:
+                raise PermanentJobError(f"Profile picture rejected: {e}") from e
+
+    with ctx.stage("resize"):
+        try:
+            variants = build_variants(data)
+        except (ValueError, OSError, Image.DecompressionBombError) as e:
+            # The same file will fail the same way; keep the original picture
+            raise PermanentJobError(f"Could not process profile picture: {e}") from e
+
+    # Unique per job, so a slow job can never overwrite a newer picture's variants
+    token = ctx.id[:12]
+    prefix = _variant_prefix(candidate.id, token)
+    urls = ctx.state.get("urls") or {}
+    with ctx.stage("upload"):
+        for size, encoded in variants.items():
+            for fmt, blob in encoded.items():
+                if not urls.get(str(size), {}).get(fmt):
+                    urls.setdefault(str(size), {})[fmt] = _upload_variant(prefix, size, fmt, blob)
+                    ctx.checkpoint(urls=urls)
+
+    with ctx.stage("save"):
+        db.session.refresh(candidate)
+        if candidate.profile_picture != source_url:
+            # A newer picture arrived meanwhile and has its own job
+            logger.info("Profile picture of candidate %s changed; discarding variants", candidate.id)
+            _destroy(prefix=prefix)
+            return {"candidate_id": candidate.id, "superseded": True}
+        previous = _variant_token(candidate.profile_picture_variants)
+        candidate.profile_picture_variants = urls
+        candidate.profile_picture = urls[str(VARIANT_SIZES[0])]["jpg"]
+        db.session.commit()
+
+    if payload.get("source_public_id"):
+        _destroy(public_id=payload["source_public_id"])
+    if previous and previous != token:
+        _destroy(prefix=_variant_prefix(candidate.id, previous))
+
+    return {
+        "candidate_id": candidate.id,
+        "profile_picture": candidate.profile_picture,
+        "variants": urls,
+        "original_bytes": len(data),
+        "variant_bytes": sum(len(blob) for encoded in variants.values() for blob in encoded.values()),
+    }
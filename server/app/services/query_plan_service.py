@@ -0,0 +1,115 @@
+# app/services/query_plan_service.py
+"""
+EXPLAIN-based check that the hot endpoint queries use their indexes.
+
+Each entry of ``PLAN_CHECKS`` is a query as an endpoint issues it (with
+sample parameters) and the index it must be able to use. ``check_plans``
+runs ``EXPLAIN (FORMAT JSON)`` on each and reports the indexes in the plan.
+
+On a small or freshly loaded table PostgreSQL rightly prefers a sequential
+scan, so by default the check disables sequential scans for its own
+transaction: the question it answers is "can the planner use the index for
+this query", which is what a missing or mismatched index (say, ``email``
+instead of ``lower(email)``) gets wrong. Pass ``natural=True`` to see the
+plans the planner would actually choose on the current data.
+
+PostgreSQL only; run with ``flask explain-queries``.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Set
+
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models import (
+    Application, AssessmentResult, AuditLog, Candidate, Interview, Meeting, Notification, Requisition, User,
+)
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    index: str
+    query: Callable[[], Any]
+
+
+def _since(days: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+PLAN_CHECKS = [
+    PlanCheck("login by email", "ix_users_email_lower",
+              lambda: User.query.filter(func.lower(User.email) == "someone@example.com")),
+    PlanCheck("candidate of user", "ix_candidates_user_id",
+              lambda: Candidate.query.filter_by(user_id=1)),
+    PlanCheck("applications of job", "ix_applications_requisition_id",
+              lambda: Application.query.filter_by(requisition_id=1)),
+    PlanCheck("applications of candidate", "ix_applications_candidate_id",
+              lambda: Application.query.filter_by(candidate_id=1)),
+    PlanCheck("applications by status", "ix_applications_status",
+              lambda: Application.query.filter(Application.status == "reviewed")),
+    PlanCheck("new applications this week", "ix_applications_created_at",
+              lambda: db.session.query(func.count(Application.id)).filter(Application.created_at >= _since(7))),
+    PlanCheck("notifications of user", "ix_notifications_user_id_is_read_created_at",
+              lambda: Notification.query.filter_by(user_id=1).order_by(Notification.created_at.desc())),
+    PlanCheck("unread notification count", "ix_notifications_user_id_is_read_created_at",
+              lambda: db.session.query(func.count(Notification.id)).filter_by(user_id=1, is_read=False)),
+    PlanCheck("interviews of application", "ix_interviews_application_id",
+              lambda: Interview.query.filter_by(application_id=1)),
+    PlanCheck("interviews of candidate", "ix_interviews_candidate_id",
+              lambda: Interview.query.filter_by(candidate_id=1)),
+    PlanCheck("assessment of application", "ix_assessment_results_application_id",
+              lambda: AssessmentResult.query.filter_by(application_id=1)),
+    PlanCheck("audit logs in range", "ix_audit_logs_timestamp",
+              lambda: AuditLog.query.filter(AuditLog.timestamp >= _since(30)).order_by(AuditLog.timestamp.desc())),
+    PlanCheck("upcoming meetings of organizer", "ix_meetings_organizer_id_start_time",
+              lambda: Meeting.query.filter(Meeting.organizer_id == 1, Meeting.start_time > datetime.utcnow())),
+    PlanCheck("meetings page", "ix_meetings_start_time",
+              lambda: Meeting.query.order_by(Meeting.start_time.desc()).limit(20)),
+    PlanCheck("users page after cursor", "ix_users_created_at_id",
+              lambda: User.query.filter(tuple_(User.created_at, User.id) > tuple_(_since(30), 1))
+              .order_by(User.created_at, User.id).limit(100)),
+    PlanCheck("jobs page after cursor", "ix_requisitions_created_at_id",
+              lambda: Requisition.query.filter(tuple_(Requisition.created_at, Requisition.id) > tuple_(_since(30), 1))
+              .order_by(Requisition.created_at, Requisition.id).limit(100)),
+]
+
+
+def _plan_indexes(node: Dict[str, Any], found: Set[str], seq_scans: List[str]):
+    if node.get("Index Name"):
+        found.add(node["Index Name"])
+    if node.get("Node Type") == "Seq Scan":
+        seq_scans.append(node.get("Relation Name"))
+    for child in node.get("Plans", []):
+        _plan_indexes(child, found, seq_scans)
+
+
+def explain(query) -> Dict[str, Any]:
+    statement = getattr(query, "statement", query)
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = db.session.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+    return plan[0]["Plan"]
+
+
+def check_plans(natural: bool = False) -> List[Dict[str, Any]]:
+    """Explain every PLAN_CHECKS query; one result dict per check with ``ok``."""
+    if db.engine.dialect.name != "postgresql":
+        raise RuntimeError("Query plan checks need PostgreSQL")
+
+    results = []
+    try:
+        if not natural:
+            db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        for check in PLAN_CHECKS:
+            found, seq_scans = set(), []
+            _plan_indexes(explain(check.query()), found, seq_scans)
+            results.append({
+                "name": check.name,
+                "index": check.index,
+                "ok": check.index in found,
+                "indexes": sorted(found),
+                "seq_scans": seq_scans,
+            })
+    finally:
+        db.session.rollback()
+    return results
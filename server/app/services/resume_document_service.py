@@ -0,0 +1,84 @@
+# app/services/resume_document_service.py
+"""
+Content-addressed store of uploaded resume files.
+
+Uploads are hashed (SHA-256) while they are read. ``resume_documents`` keeps
+the Cloudinary URL and the extracted text per hash, so when a candidate
+uploads the same CV for another job the worker reuses both instead of
+uploading and extracting again.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.extensions import db
+from app.models import ResumeDocument
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def read_and_hash(stream, chunk_size: int = CHUNK_SIZE) -> Tuple[bytes, str]:
+    """Read an upload stream in chunks, returning its bytes and SHA-256 hex digest."""
+    digest = hashlib.sha256()
+    chunks = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+def find_document(sha256: Optional[str]) -> Optional[ResumeDocument]:
+    if not sha256:
+        return None
+    return db.session.get(ResumeDocument, sha256)
+
+
+def is_complete(document: Optional[ResumeDocument]) -> bool:
+    """True when a worker would need neither the upload nor the file bytes."""
+    return bool(document and document.resume_url and document.text is not None)
+
+
+def record_document(sha256: str, size_bytes: int, filename: str = None, **fields):
+    """
+    Insert or update the row for ``sha256``. Only the given fields (resume_url,
+    text, pages, truncated) are written; existing values are kept otherwise.
+    Commits immediately so concurrent jobs for the same file see it.
+    """
+    table = ResumeDocument.__table__
+    now = datetime.utcnow()
+    values = {"sha256": sha256, "size_bytes": size_bytes, "filename": filename,
+              "created_at": now, "last_used_at": now, "use_count": 1, **fields}
+    stmt = insert(table).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.sha256],
+        set_={
+            **{name: func.coalesce(stmt.excluded[name], table.c[name]) for name in fields},
+            "last_used_at": now,
+        },
+    )
+    try:
+        db.session.execute(stmt)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning("Could not record resume document %s: %s", sha256[:12], e)
+
+
+def touch_document(document: ResumeDocument):
+    """Count a reuse of an existing document."""
+    try:
+        document.use_count = ResumeDocument.use_count + 1
+        document.last_used_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning("Could not update resume document %s: %s", document.sha256[:12], e)
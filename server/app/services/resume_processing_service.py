@@ -0,0 +1,315 @@
+# app/services/resume_processing_service.py
+"""
+Background processing of uploaded resumes.
+
+``upload_resume`` only validates the request and enqueues a ``resume_analysis``
+job; everything slow (Cloudinary upload, text extraction, the LLM call,
+notifications) runs here inside ``flask worker``. Each stage checkpoints its
+output so a retried job resumes where the previous attempt failed.
+"""
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+from app.extensions import db
+from app.models import Application, Notification, User
+from app.services.ai_parser_service import last_known_analysis
+from app.services.cv_parser_service import HybridResumeAnalyzer
+from app.services.direct_upload_service import DirectUploadError, download_upload
+from app.services.job_queue import JobQueue, PermanentJobError, job_setting, register_handler
+from app.services.prescreen_service import prescreen_parser_result, prescreen_resume
+from app.services.resume_document_service import find_document, is_complete, record_document, touch_document
+from app.services.text_extraction_service import ExtractionError, extract_document
+from app.utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+RESUME_QUEUE = "resume"
+RESUME_JOB_TYPE = "resume_analysis"
+
+resume_queue = JobQueue(RESUME_QUEUE)
+
+# Compare-and-delete: only the job named in the lock may release it
+RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def application_lock_key(application_id: int) -> str:
+    return f"resume_job:application:{application_id}"
+
+
+def enqueue_resume_analysis(application, user_id, file_bytes, filename, resume_text="", content_sha256=None,
+                            resume_url=None, size_bytes=None):
+    """
+    Queue a resume for processing. Returns ``(job_id, created)``; when a job for
+    this application is already in flight its id is returned with created=False.
+    ``content_sha256`` (see resume_document_service.read_and_hash) lets the
+    worker reuse the upload and extracted text of an identical earlier file.
+    For files uploaded straight to Cloudinary pass ``resume_url`` and no bytes;
+    the worker downloads the file itself.
+    """
+    client = resume_queue.client
+    lock_key = application_lock_key(application.id)
+    lock_ttl = job_setting("JOB_RESULT_TTL")
+    # The lock is taken with the id of the job about to be queued, so a
+    # request that loses the race always gets back a real job id
+    job_id = resume_queue.new_job_id()
+
+    # One in-flight job per application guards against double submits
+    while not client.set(lock_key, job_id, nx=True, ex=lock_ttl):
+        existing = client.get(lock_key)
+        if existing is None:
+            # Released in between; try again
+            continue
+        existing_job = resume_queue.get(existing)
+        # No record yet: the request holding the lock is still enqueueing it
+        if existing_job is None or existing_job["status"] != "dead":
+            return existing, False
+        # The previous attempt gave up; allow a fresh upload
+        client.eval(RELEASE_LOCK, 1, lock_key, existing)
+
+    # Known file: the worker reuses its URL and text, so the bytes need not be queued
+    known = resume_url is not None or is_complete(find_document(content_sha256))
+    try:
+        resume_queue.enqueue(
+            RESUME_JOB_TYPE,
+            {
+                "application_id": application.id,
+                "user_id": int(user_id),
+                "filename": filename,
+                "resume_text": resume_text or "",
+                "content_sha256": content_sha256,
+                "size_bytes": len(file_bytes) if file_bytes is not None else (size_bytes or 0),
+                "resume_url": resume_url,
+            },
+            blob=None if known else file_bytes,
+            job_id=job_id,
+        )
+    except Exception:
+        client.eval(RELEASE_LOCK, 1, lock_key, job_id)
+        raise
+    return job_id, True
+
+
+def stale_parser_result(application):
+    """
+    The candidate's last stored analysis against this job's description,
+    marked stale, or None; the same fallback parse_cv uses. (The application
+    itself has no parser result yet while its resume is being processed.)
+    """
+    job = application.requisition
+    if not job or not job.description:
+        return None
+    return last_known_analysis(application.candidate_id, job.description)
+
+
+def empty_resume_parser_result():
+    """Parser result stored when no text could be read from the resume."""
+    return {
+        "match_score": 0,
+        "missing_skills": [],
+        "suggestions": ["No text could be read from the resume. Upload a text-based PDF, DOCX, RTF or TXT file."],
+        "recommendation": "",
+        "raw_text": "",
+        "source": "no_text",
+    }
+
+
+def _upload_executor() -> ThreadPoolExecutor:
+    """Bounded pool for Cloudinary uploads, created on first use in each process."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get("RESUME_UPLOAD_THREADS", 4),
+                    thread_name_prefix="resume-upload",
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _timed_upload(data: bytes, filename: str):
+    start = time.perf_counter()
+    resume_url = HybridResumeAnalyzer.upload_cv(io.BytesIO(data), filename=filename)
+    return resume_url, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _download(url: Optional[str]) -> Optional[bytes]:
+    """Fetch a file the client uploaded to Cloudinary directly."""
+    if not url:
+        return None
+    try:
+        return download_upload(url, current_app.config["DIRECT_UPLOAD_MAX_DOCUMENT_BYTES"])
+    except DirectUploadError as e:
+        raise PermanentJobError(f"Uploaded resume rejected: {e}") from e
+
+
+def _raise_if_upload_failed(upload: Optional[Future]):
+    """Fail before spending tokens when the background upload has already failed."""
+    if upload is not None and upload.done():
+        if upload.exception() is not None or not upload.result()[0]:
+            raise RuntimeError("Failed to upload resume")
+
+
+def _finish_upload(ctx, upload: Future, sha256: Optional[str], filename: str) -> str:
+    """Wait for the background upload, checkpoint its URL and return it."""
+    try:
+        resume_url, elapsed_ms = upload.result()
+    except Exception as e:
+        raise RuntimeError(f"Failed to upload resume: {e}") from e
+    ctx.record_timing("upload", elapsed_ms)
+    if not resume_url:
+        raise RuntimeError("Failed to upload resume")
+    ctx.checkpoint(resume_url=resume_url)
+    if sha256:
+        record_document(sha256, ctx.payload.get("size_bytes") or 0, filename, resume_url=resume_url)
+    return resume_url
+
+
+def _extract_and_analyse(ctx, application, document, upload: Optional[Future]) -> Dict[str, Any]:
+    payload = ctx.payload
+    job = application.requisition
+    filename = payload.get("filename") or "resume"
+    sha256 = payload.get("content_sha256")
+
+    # --- Extract text (PDF, DOCX, RTF or plain text) if needed ---
+    resume_text = (ctx.state.get("resume_text") or payload.get("resume_text", "")
+                   or (document.text if document else ""))
+    blob = None if resume_text else (ctx.blob() or _download(payload.get("resume_url")))
+    if blob:
+        with ctx.stage("extract"):
+            try:
+                extracted = extract_document(blob)
+            except ExtractionError as e:
+                # The same file will fail the same way; don't retry it
+                raise PermanentJobError(f"Could not read the uploaded resume: {e}") from e
+            resume_text = extracted["text"]
+        ctx.checkpoint(resume_text=resume_text, resume_pages=extracted["pages"],
+                       resume_truncated=extracted["truncated"])
+        if sha256:
+            record_document(sha256, payload.get("size_bytes") or 0, filename, text=resume_text,
+                            pages=extracted["pages"], truncated=extracted["truncated"])
+
+    if not resume_text.strip():
+        # Nothing to analyse (e.g. a scanned PDF); don't spend an LLM call on it
+        return empty_resume_parser_result()
+
+    # --- Local pre-screen; only promising resumes reach the LLM ---
+    prescreen = None
+    if current_app.config.get("PRESCREEN_ENABLED", True):
+        with ctx.stage("prescreen"):
+            prescreen = prescreen_resume(resume_text, job)
+
+    if prescreen is not None and not prescreen["escalate"]:
+        return prescreen_parser_result(prescreen)
+
+    # --- Hybrid Resume Analysis ---
+    _raise_if_upload_failed(upload)
+    with ctx.stage("analyse"):
+        try:
+            parser_result = HybridResumeAnalyzer.analyse_resume(resume_text, job.id, raise_errors=True)
+        except CircuitOpenError:
+            parser_result = stale_parser_result(application)
+            # Keep retrying while attempts remain; only the last one settles for stale data
+            if parser_result is None or ctx.job["attempts"] < ctx.job["max_attempts"]:
+                raise
+    if prescreen is not None:
+        parser_result = {**parser_result, "prescreen": prescreen}
+    return parser_result
+
+
+@register_handler(RESUME_JOB_TYPE)
+def process_resume_upload(ctx):
+    payload = ctx.payload
+    application = Application.query.get(payload["application_id"])
+    if not application:
+        raise ValueError(f"Application {payload['application_id']} not found")
+
+    candidate = application.candidate
+    job = application.requisition
+    filename = payload.get("filename") or "resume"
+    sha256 = payload.get("content_sha256")
+
+    try:
+        # --- Same file uploaded before? Reuse its URL and text ---
+        document = find_document(sha256)
+        if document and not ctx.state.get("resume_url"):
+            touch_document(document)
+
+        # --- Upload to Cloudinary, in the background while text is extracted and analysed ---
+        resume_url = (ctx.state.get("resume_url") or payload.get("resume_url")
+                      or (document.resume_url if document else None))
+        upload = None
+        if not resume_url:
+            data = ctx.blob()
+            if data is None:
+                raise RuntimeError("Uploaded file is no longer available")
+            upload = _upload_executor().submit(_timed_upload, data, filename)
+        else:
+            ctx.checkpoint(resume_url=resume_url)
+
+        try:
+            parser_result = _extract_and_analyse(ctx, application, document, upload)
+        except BaseException:
+            # Still checkpoint a successful upload so the retry does not upload again
+            if upload is not None:
+                try:
+                    _finish_upload(ctx, upload, sha256, filename)
+                except Exception as e:
+                    logger.warning("Resume upload for job %s also failed: %s", ctx.id, e)
+            raise
+        if upload is not None:
+            resume_url = _finish_upload(ctx, upload, sha256, filename)
+
+        # --- Save results ---
+        with ctx.stage("save"):
+            application.resume_url = resume_url
+            application.cv_score = parser_result.get("match_score", 0)
+            application.cv_parser_result = parser_result
+            application.recommendation = parser_result.get("recommendation", "")
+            db.session.commit()
+
+        # --- Notify admins and the candidate ---
+        with ctx.stage("notify"):
+            admins = User.query.filter_by(role="admin").all()
+            for admin in admins:
+                db.session.add(Notification(
+                    user_id=admin.id,
+                    message=f"{candidate.full_name} submitted resume for {job.title}."
+                ))
+            db.session.add(Notification(
+                user_id=payload["user_id"],
+                message=f"Your resume for {job.title} has been analysed."
+            ))
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    resume_queue.client.eval(RELEASE_LOCK, 1, application_lock_key(application.id), ctx.id)
+
+    return {
+        "message": "Resume uploaded and analyzed",
+        "application_id": application.id,
+        "cv_score": application.cv_score,
+        "missing_skills": parser_result.get("missing_skills", []),
+        "suggestions": parser_result.get("suggestions", []),
+        "recommendation": application.recommendation,
+        "resume_url": resume_url,
+        "raw_parser_text": parser_result.get("raw_text", ""),
+    }
@@ -0,0 +1,242 @@
+# app/services/skill_index_service.py
+"""
+Inverted skill index (``candidate_skills``) over candidates.
+
+Skills are normalised through a small alias taxonomy ("JS" -> "javascript",
+"Postgres" -> "postgresql") and written per source, so a change to one
+application's parsed CV only rewrites that application's rows. The index is
+maintained from an ``after_flush`` hook; ``flask reindex-skills`` rebuilds it.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, event, func, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Application, Candidate, CandidateSkill
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SOURCE = "profile"
+CV_SOURCE = "cv"
+
+# Columns the index is built from; updates to anything else (status,
+# timestamps, scores) leave a row's skills as they were
+CANDIDATE_SKILL_COLUMNS = ("skills", "profile")
+APPLICATION_SKILL_COLUMNS = ("candidate_id", "cv_parser_result")
+
+SKILL_ALIASES: Dict[str, str] = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    "asp.net core": ".net",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "ci/cd": "ci-cd",
+    "cicd": "ci-cd",
+    "power bi": "powerbi",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+}
+
+MAX_SKILL_LENGTH = 100
+
+
+def canonical_skill(name) -> Optional[str]:
+    """Normalise a skill name to its taxonomy key, or None if it is empty."""
+    if not isinstance(name, str):
+        return None
+    skill = " ".join(name.lower().split()).strip(" ,;:")
+    if not skill:
+        return None
+    skill = SKILL_ALIASES.get(skill, skill)
+    return skill[:MAX_SKILL_LENGTH]
+
+
+def _skill_names(value) -> List[str]:
+    """Accept lists of strings, lists of {"name": ...} dicts or a comma separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = re.split(r"[,\n;]", value)
+    names = []
+    for item in value if isinstance(value, (list, tuple)) else []:
+        if isinstance(item, dict):
+            item = item.get("name") or item.get("skill")
+        if isinstance(item, str):
+            names.append(item)
+    return names
+
+
+def canonical_skills(values: Iterable) -> Set[str]:
+    return {s for s in (canonical_skill(v) for v in values) if s}
+
+
+def _parsed_cv_skills(parser_result) -> List[str]:
+    if not isinstance(parser_result, dict):
+        return []
+    skills = _skill_names(parser_result.get("skills"))
+    # Skills the local pre-screen found verbatim in the CV
+    prescreen = parser_result.get("prescreen") or {}
+    skills += _skill_names(prescreen.get("matched_skills"))
+    return skills
+
+
+def application_source(application_id: int) -> str:
+    return f"application:{application_id}"
+
+
+def _replace(connection, candidate_id: int, source: str, skills: Set[str]):
+    table = CandidateSkill.__table__
+    connection.execute(
+        delete(table).where(table.c.candidate_id == candidate_id, table.c.source == source)
+    )
+    if skills:
+        connection.execute(insert(table), [
+            {"skill": skill, "candidate_id": candidate_id, "source": source}
+            for skill in sorted(skills)
+        ])
+
+
+def index_candidate(connection, candidate: Candidate):
+    _replace(connection, candidate.id, PROFILE_SOURCE, canonical_skills(_skill_names(candidate.skills)))
+    profile = candidate.profile if isinstance(candidate.profile, dict) else {}
+    _replace(connection, candidate.id, CV_SOURCE,
+             canonical_skills(_parsed_cv_skills(profile.get("cv_parser_result"))))
+
+
+def index_application(connection, application: Application):
+    if not application.candidate_id:
+        return
+    _replace(connection, application.candidate_id, application_source(application.id),
+             canonical_skills(_parsed_cv_skills(application.cv_parser_result)))
+
+
+def _skills_changed(obj, columns) -> bool:
+    # Attribute history is still intact in after_flush
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in columns)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_skill_index(session, flush_context):
+    candidates = [o for o in session.new | session.dirty if isinstance(o, Candidate)]
+    applications = [o for o in session.new | session.dirty if isinstance(o, Application)]
+    deleted = [o for o in session.deleted if isinstance(o, (Candidate, Application))]
+    if not (candidates or applications or deleted):
+        return
+
+    connection = session.connection()
+    table = CandidateSkill.__table__
+    try:
+        # Savepoint so an index failure cannot abort the caller's transaction
+        with connection.begin_nested():
+            for candidate in candidates:
+                if candidate in session.new or _skills_changed(candidate, CANDIDATE_SKILL_COLUMNS):
+                    index_candidate(connection, candidate)
+            for application in applications:
+                if application in session.new or _skills_changed(application, APPLICATION_SKILL_COLUMNS):
+                    index_application(connection, application)
+            for obj in deleted:
+                if isinstance(obj, Candidate):
+                    connection.execute(delete(table).where(table.c.candidate_id == obj.id))
+                else:
+                    connection.execute(delete(table).where(table.c.source == application_source(obj.id)))
+    except Exception:
+        # A stale index is recoverable with `flask reindex-skills`; a failed save is not
+        logger.exception("Failed to update candidate skill index")
+
+
+# ------------------- queries -------------------
+def search_candidate_ids(all_skills: Iterable[str] = (), any_skills: Iterable[str] = ()):
+    """
+    Candidate ids having every skill in ``all_skills`` and at least one of
+    ``any_skills`` (either list may be empty, not both). Returns a query ordered by id.
+    """
+    required = canonical_skills(all_skills)
+    optional = canonical_skills(any_skills)
+    if not required and not optional:
+        raise ValueError("At least one skill is required")
+
+    query = None
+    if required:
+        query = (
+            db.session.query(CandidateSkill.candidate_id.label("candidate_id"))
+            .filter(CandidateSkill.skill.in_(required))
+            .group_by(CandidateSkill.candidate_id)
+            .having(func.count(func.distinct(CandidateSkill.skill)) == len(required))
+        )
+    if optional:
+        any_query = (
+            db.session.query(CandidateSkill.candidate_id.label("candidate_id"))
+            .filter(CandidateSkill.skill.in_(optional))
+            .distinct()
+        )
+        query = any_query if query is None else query.intersect(any_query)
+    ids = query.subquery()
+    return db.session.query(ids.c.candidate_id).order_by(ids.c.candidate_id)
+
+
+def matched_skills(candidate_ids: List[int], skills: Iterable[str]) -> Dict[int, List[str]]:
+    wanted = canonical_skills(skills)
+    rows = (
+        db.session.query(CandidateSkill.candidate_id, CandidateSkill.skill)
+        .filter(CandidateSkill.candidate_id.in_(candidate_ids), CandidateSkill.skill.in_(wanted))
+        .distinct()
+        .all()
+    )
+    result: Dict[int, List[str]] = {cid: [] for cid in candidate_ids}
+    for candidate_id, skill in rows:
+        result[candidate_id].append(skill)
+    return {cid: sorted(s) for cid, s in result.items()}
+
+
+def skill_frequency() -> Dict[str, int]:
+    """Number of distinct candidates per canonical skill."""
+    rows = (
+        db.session.query(CandidateSkill.skill, func.count(func.distinct(CandidateSkill.candidate_id)))
+        .group_by(CandidateSkill.skill)
+        .order_by(func.count(func.distinct(CandidateSkill.candidate_id)).desc())
+        .all()
+    )
+    return {skill: count for skill, count in rows}
+
+
+def rebuild_index(batch_size: int = 500) -> int:
+    """Rebuild the whole index from candidates and applications; returns rows written."""
+    connection = db.session.connection()
+    connection.execute(delete(CandidateSkill.__table__))
+    for candidate in Candidate.query.yield_per(batch_size):
+        index_candidate(connection, candidate)
+    for application in Application.query.filter(Application.candidate_id.isnot(None)).yield_per(batch_size):
+        index_application(connection, application)
+    db.session.commit()
+    return db.session.query(func.count()).select_from(CandidateSkill).scalar()
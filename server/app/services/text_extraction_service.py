@@ -0,0 +1,252 @@
+# app/services/text_extraction_service.py
+"""
+Text extraction from uploaded documents, isolated in a process pool.
+
+Documents are routed by their sniffed MIME type (``sniff_mime``), never by
+file extension, to an extractor in ``EXTRACTORS``: PDF (PyMuPDF), DOCX
+(streaming parse of word/document.xml), RTF and plain text. The extractors
+themselves are in the top-level ``document_extractors`` module; every one
+takes ``(source, max_pages)`` and returns {"text", "pages", "total_pages",
+"truncated"}; each format has its own size limit and text is capped at
+``EXTRACT_MAX_CHARS`` characters.
+
+PDF, DOCX and RTF run in worker processes so a huge or malformed file cannot block
+the calling worker or grow its memory: each document gets
+``PDF_EXTRACT_TIMEOUT`` seconds (the pool is torn down and rebuilt when one
+overruns), only the first ``PDF_EXTRACT_MAX_PAGES`` pages are read, and pool
+processes are recycled after ``PDF_EXTRACT_TASKS_PER_PROCESS`` documents.
+
+Pages are written to a buffer one at a time, separated by form feeds.
+Pass a file path instead of bytes to ``extract_pdf`` to let the pool process
+read the file itself, so the caller never holds the document.
+"""
+import codecs
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+from app.utils.metrics import REGISTRY
+from document_extractors import ExtractionError, extract_docx, extract_pdf_pages, extract_rtf, extract_text
+
+logger = logging.getLogger(__name__)
+
+PDF_EXTRACT_PROCESSES = int(os.environ.get("PDF_EXTRACT_PROCESSES", 2))
+PDF_EXTRACT_TIMEOUT = float(os.environ.get("PDF_EXTRACT_TIMEOUT", 20))
+PDF_EXTRACT_MAX_PAGES = int(os.environ.get("PDF_EXTRACT_MAX_PAGES", 30))
+PDF_EXTRACT_TASKS_PER_PROCESS = int(os.environ.get("PDF_EXTRACT_TASKS_PER_PROCESS", 50))
+# 0 runs extraction in the calling process (no isolation), e.g. for debugging
+PDF_EXTRACT_POOL_ENABLED = PDF_EXTRACT_PROCESSES > 0
+
+PDF_MAX_BYTES = int(os.environ.get("PDF_MAX_BYTES", 10 * 1024 * 1024))
+DOCX_MAX_BYTES = int(os.environ.get("DOCX_MAX_BYTES", 10 * 1024 * 1024))
+TEXT_MAX_BYTES = int(os.environ.get("TEXT_MAX_BYTES", 2 * 1024 * 1024))
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+RTF = "application/rtf"
+TEXT = "text/plain"
+
+extract_seconds = REGISTRY.histogram(
+    "text_extract_seconds",
+    "Document text extraction time",
+    labelnames=("kind", "outcome"),
+)
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+class ExtractionTimeout(ExtractionError):
+    pass
+
+
+class UnsupportedDocument(ExtractionError):
+    def __init__(self, mime: str):
+        super().__init__(f"Unsupported document type: {mime}")
+        self.mime = mime
+
+
+class DocumentTooLarge(ExtractionError):
+    def __init__(self, kind: str, size: int, limit: int):
+        super().__init__(f"{kind.upper()} is {size} bytes; the limit is {limit}")
+        self.kind = kind
+        self.size = size
+        self.limit = limit
+
+
+class Extractor(NamedTuple):
+    mime: str
+    kind: str
+    extract: Callable[[Union[bytes, str], int], Dict[str, Any]]
+    max_bytes: int
+    # Run in the process pool (parsers of untrusted binary formats)
+    isolated: bool
+
+
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register_extractor(mime: str, kind: str, max_bytes: int, isolated: bool = True):
+    def decorator(fn):
+        EXTRACTORS[mime] = Extractor(mime, kind, fn, max_bytes, isolated)
+        return fn
+    return decorator
+
+
+# ------------------- sniffing -------------------
+def sniff_mime(data: bytes) -> str:
+    """MIME type from the leading bytes of a document."""
+    head = data[:2048]
+    if b"%PDF-" in head[:1024]:
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return "application/octet-stream"
+        return DOCX if "word/document.xml" in names else "application/zip"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        # OLE2 container: legacy .doc (not supported)
+        return "application/msword"
+    if head.removeprefix(codecs.BOM_UTF8).lstrip().startswith(b"{\\rtf"):
+        return RTF
+    if _looks_like_text(head):
+        return TEXT
+    return "application/octet-stream"
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if head.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    if not head or b"\x00" in head:
+        return False
+    control = sum(1 for b in head if b < 32 and b not in (9, 10, 12, 13))
+    return control / len(head) < 0.02
+
+
+# ------------------- extractors -------------------
+# The extractors live in the top-level document_extractors module so pool
+# processes can unpickle them without importing the app package.
+register_extractor(PDF, "pdf", PDF_MAX_BYTES)(extract_pdf_pages)
+register_extractor(DOCX, "docx", DOCX_MAX_BYTES)(extract_docx)
+register_extractor(RTF, "rtf", TEXT_MAX_BYTES)(extract_rtf)
+register_extractor(TEXT, "text", TEXT_MAX_BYTES, isolated=False)(extract_text)
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = _pool_context().Pool(
+                    processes=PDF_EXTRACT_PROCESSES,
+                    maxtasksperchild=PDF_EXTRACT_TASKS_PER_PROCESS,
+                )
+                _pool_pid = pid
+    return _pool
+
+
+def _pool_context():
+    """
+    forkserver where available, else spawn. A plain fork would copy locks
+    held by this process's other threads (Redis, MongoDB and HTTP connection
+    pools, the upload executor) and can leave a child blocked on one
+    forever. The fork server preloads only document_extractors, which
+    imports nothing from the app package, so it stays single-threaded with
+    no open sockets and pool processes forked from it start clean and
+    quickly. Under spawn each pool process imports document_extractors
+    (and the main module) itself.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([extract_pdf_pages.__module__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _discard_pool(pool):
+    """Kill a pool whose worker overran; the next call builds a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.terminate()
+
+
+def get_extractor(data: bytes) -> Extractor:
+    """
+    The extractor for ``data``, chosen by sniffed MIME type. Raises
+    UnsupportedDocument or DocumentTooLarge, so uploads can be rejected
+    before any work is queued.
+    """
+    mime = sniff_mime(data)
+    extractor = EXTRACTORS.get(mime)
+    if extractor is None:
+        raise UnsupportedDocument(mime)
+    if len(data) > extractor.max_bytes:
+        raise DocumentTooLarge(extractor.kind, len(data), extractor.max_bytes)
+    return extractor
+
+
+def extract_document(data: bytes, max_pages: int = None, timeout: float = None) -> Dict[str, Any]:
+    """
+    Extract text from a document of any supported format.
+    Returns {"text", "pages", "total_pages", "truncated", "mime"}; raises ExtractionError.
+    """
+    extractor = get_extractor(data)
+    return {**_run(extractor, data, max_pages, timeout), "mime": extractor.mime}
+
+
+def extract_pdf(source: Union[bytes, str], max_pages: int = None, timeout: float = None) -> Dict[str, Any]:
+    """
+    Extract text from a PDF given as bytes or a file path.
+    Returns {"text", "pages", "total_pages", "truncated"}; raises ExtractionError.
+    """
+    return _run(EXTRACTORS[PDF], source, max_pages, timeout)
+
+
+def _run(extractor: Extractor, source: Union[bytes, str], max_pages: Optional[int],
+         timeout: Optional[float]) -> Dict[str, Any]:
+    max_pages = PDF_EXTRACT_MAX_PAGES if max_pages is None else max_pages
+    timeout = timeout or PDF_EXTRACT_TIMEOUT
+
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        if not (extractor.isolated and PDF_EXTRACT_POOL_ENABLED):
+            return extractor.extract(source, max_pages)
+        pool = _get_pool()
+        pending = pool.apply_async(extractor.extract, (source, max_pages))
+        try:
+            result = pending.get(timeout)
+        except multiprocessing.TimeoutError:
+            outcome = "timeout"
+            _discard_pool(pool)
+            raise ExtractionTimeout(f"{extractor.kind.upper()} extraction took longer than {timeout:g}s") from None
+        if result["truncated"]:
+            logger.info("%s truncated: extracted %d of %d pages, %d characters", extractor.kind.upper(),
+                        result["pages"], result["total_pages"], len(result["text"]))
+        return result
+    except ExtractionTimeout:
+        raise
+    except ExtractionError:
+        outcome = "error"
+        raise
+    except Exception as e:
+        # e.g. MemoryError or a crashed pool process
+        outcome = "error"
+        raise ExtractionError(f"{extractor.kind.upper()} extraction failed: {e}") from e
+    finally:
+        extract_seconds.observe(time.perf_counter() - start, kind=extractor.kind, outcome=outcome)
+
+
+def extract_pdf_text(source: Union[bytes, str], **kwargs) -> str:
+    return extract_pdf(source, **kwargs)["text"]
@@ -0,0 +1,192 @@
+# app/utils/circuit_breaker.py
+"""
+Circuit breaker with its state kept in Redis, so every gunicorn worker and
+job worker sees the same view of an upstream dependency.
+
+closed     calls flow; outcomes are counted in time buckets over ``window`` seconds
+open       calls fail fast with CircuitOpenError for ``open_seconds``
+half_open  one caller (per ``probe_timeout``) is let through as a probe; its
+           success closes the circuit, its failure re-opens it
+
+The circuit opens when, with at least ``min_calls`` outcomes in the window,
+the failure rate or the slow-call rate crosses its threshold. If Redis is
+unreachable the breaker stays out of the way (calls are allowed).
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.extensions import redis_client
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+BUCKET_SECONDS = 10
+
+transitions_total = REGISTRY.counter(
+    "ai_http_circuit_transitions_total",
+    "Circuit breaker state changes",
+    labelnames=("circuit", "state"),
+)
+rejected_total = REGISTRY.counter(
+    "ai_http_circuit_rejected_total",
+    "Calls rejected because the circuit was open",
+    labelnames=("circuit",),
+)
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: Optional[float] = None):
+        super().__init__(f"Circuit '{name}' is open; upstream calls are suspended")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, client=None, failure_rate: float = 0.5, slow_call_seconds: float = 20,
+                 slow_call_rate: float = 0.8, min_calls: int = 5, window: int = 60,
+                 open_seconds: float = 30, probe_timeout: float = 90):
+        self.name = name
+        self.client = client if client is not None else redis_client
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+
+    # ------------------- keys -------------------
+    @property
+    def state_key(self) -> str:
+        return f"circuit:{self.name}"
+
+    @property
+    def probe_key(self) -> str:
+        return f"circuit:{self.name}:probe"
+
+    def bucket_key(self, bucket: int) -> str:
+        return f"circuit:{self.name}:calls:{bucket}"
+
+    def _buckets(self):
+        current = int(time.time() // BUCKET_SECONDS)
+        return range(current - self.window // BUCKET_SECONDS + 1, current + 1)
+
+    # ------------------- state -------------------
+    def _read_state(self) -> Dict[str, Any]:
+        raw = self.client.hgetall(self.state_key) or {}
+        return {
+            "state": raw.get("state", CLOSED),
+            "open_until": float(raw.get("open_until") or 0),
+            "reason": raw.get("reason", ""),
+        }
+
+    def _transition(self, state: str, reason: str = ""):
+        pipe = self.client.pipeline()
+        if state == CLOSED:
+            pipe.delete(self.state_key, self.probe_key, *[self.bucket_key(b) for b in self._buckets()])
+        else:
+            pipe.hset(self.state_key, mapping={
+                "state": state,
+                "open_until": time.time() + self.open_seconds,
+                "reason": reason,
+            })
+            pipe.delete(self.probe_key)
+        pipe.execute()
+        transitions_total.inc(circuit=self.name, state=state)
+        log = logger.info if state == CLOSED else logger.warning
+        log("Circuit %s -> %s %s", self.name, state, reason)
+
+    def before_call(self):
+        """Raise CircuitOpenError unless this call may go upstream."""
+        try:
+            state = self._read_state()
+            if state["state"] == CLOSED:
+                return
+            remaining = state["open_until"] - time.time()
+            if remaining <= 0 and self.client.set(self.probe_key, "1", nx=True, ex=int(self.probe_timeout)):
+                # This caller is the half-open probe
+                if state["state"] != HALF_OPEN:
+                    self.client.hset(self.state_key, "state", HALF_OPEN)
+                    transitions_total.inc(circuit=self.name, state=HALF_OPEN)
+                return
+        except Exception as e:
+            logger.debug("Circuit %s state unavailable, allowing call: %s", self.name, e)
+            return
+
+        rejected_total.inc(circuit=self.name)
+        raise CircuitOpenError(self.name, retry_after=max(remaining, 1.0))
+
+    def record(self, success: bool, elapsed: float):
+        """Record an upstream outcome; may open or close the circuit."""
+        slow = elapsed >= self.slow_call_seconds
+        try:
+            state = self._read_state()["state"]
+            if state == HALF_OPEN:
+                if success and not slow:
+                    self._transition(CLOSED)
+                else:
+                    self._transition(OPEN, "probe failed" if not success else "probe too slow")
+                return
+            if state == OPEN:
+                # Late result of a call started before the circuit opened
+                return
+
+            key = self.bucket_key(self._buckets()[-1])
+            pipe = self.client.pipeline()
+            pipe.hincrby(key, "total", 1)
+            if not success:
+                pipe.hincrby(key, "failures", 1)
+            if slow:
+                pipe.hincrby(key, "slow", 1)
+            pipe.expire(key, self.window + BUCKET_SECONDS)
+            pipe.execute()
+
+            if success and not slow:
+                return
+            totals = self.window_stats()
+            if totals["total"] < self.min_calls:
+                return
+            if totals["failures"] / totals["total"] >= self.failure_rate:
+                self._transition(OPEN, f"failure rate {totals['failures']}/{totals['total']}")
+            elif totals["slow"] / totals["total"] >= self.slow_call_rate:
+                self._transition(OPEN, f"slow calls {totals['slow']}/{totals['total']}")
+        except Exception as e:
+            logger.debug("Circuit %s could not record outcome: %s", self.name, e)
+
+    def window_stats(self) -> Dict[str, int]:
+        pipe = self.client.pipeline()
+        for bucket in self._buckets():
+            pipe.hgetall(self.bucket_key(bucket))
+        totals = {"total": 0, "failures": 0, "slow": 0}
+        for row in pipe.execute():
+            for field in totals:
+                totals[field] += int((row or {}).get(field) or 0)
+        return totals
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            state = self._read_state()
+            return {
+                "name": self.name,
+                "state": state["state"],
+                "reason": state["reason"],
+                "retry_in": max(0.0, round(state["open_until"] - time.time(), 1)) if state["state"] != CLOSED else 0,
+                "window": self.window_stats(),
+            }
+        except Exception as e:
+            return {"name": self.name, "state": "unknown", "error": str(e)}
+
+    def call(self, fn, *args, is_failure=lambda exc: True, **kwargs):
+        """Run ``fn`` through the breaker. ``is_failure(exc)`` decides whether an exception counts against the upstream."""
+        self.before_call()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record(not is_failure(e), time.perf_counter() - start)
+            raise
+        self.record(True, time.perf_counter() - start)
+        return result
@@ -0,0 +1,175 @@
+# app/utils/pagination.py
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the sort key of the last row already seen instead of
+an OFFSET, so page N costs the same as page 1 and rows inserted meanwhile
+never shift the pages. The sort key is (sort expression, unique id); the
+cursor handed to clients is that pair, JSON-encoded and base64url'd, and is
+opaque to them.
+
+List endpoints return the cursor of the next page in the ``X-Next-Cursor``
+header (absent on the last page) so their JSON bodies keep their shape.
+
+``paginate_request`` is the shared layer for model listings: keyset on
+(created_at, id), or id alone for models without a NOT NULL created_at,
+driven by ``?limit``, ``?cursor``, ``?order=asc|desc`` and an opt-in
+``?fields=a,b`` projection that loads only those columns (``load_only``) and
+returns their raw values. Only the fields the caller allows can be
+projected, so columns its serializer leaves out (password hashes, MFA
+secrets) stay out. Each listing's sort keys are backed by a
+``(created_at, id)`` index, so a page costs an index range scan.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import request
+from sqlalchemy import DateTime, inspect, tuple_
+from sqlalchemy.orm import load_only
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor") from None
+    if not isinstance(values, list):
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+def parse_limit(value: Optional[str], default: int = 50, maximum: int = 500) -> int:
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        raise InvalidCursor("limit must be an integer") from None
+    return max(1, min(limit, maximum))
+
+
+def keyset_page(query, sort_keys: Sequence[Any], cursor: Optional[str], limit: int,
+                row_key: Callable[[Any], Sequence[Any]], descending: bool = False) -> Page:
+    """
+    Fetch one page of the ORM ``query`` ordered by ``sort_keys`` (ending with a unique
+    column). ``row_key(row)`` returns a row's values for those keys; they
+    become the next cursor. Raises InvalidCursor for a cursor that does not
+    fit the keys.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(sort_keys):
+            raise InvalidCursor("Cursor does not match this listing")
+        values = [_coerce(key, value) for key, value in zip(sort_keys, values)]
+        after = tuple_(*sort_keys) < tuple_(*values) if descending else tuple_(*sort_keys) > tuple_(*values)
+        query = query.filter(after)
+
+    order = [key.desc() if descending else key.asc() for key in sort_keys]
+    rows = query.order_by(*order).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(row_key(rows[-1])) if has_more and rows else None
+    return Page(rows, next_cursor)
+
+
+def _coerce(key, value):
+    # Cursors carry datetimes as strings; bind them back as datetimes
+    if isinstance(value, str) and isinstance(getattr(key, "type", None), DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise InvalidCursor("Malformed cursor") from None
+    return value
+
+
+def with_next_cursor(response, page: Page):
+    """Attach the next-page cursor header to a (response, status) or response."""
+    target = response[0] if isinstance(response, tuple) else response
+    if page.next_cursor:
+        target.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return response
+
+
+# ------------------- model listings -------------------
+def _keyed_on_created_at(model) -> bool:
+    # A nullable created_at would drop its NULL rows from row comparisons
+    column = inspect(model).columns.get("created_at")
+    return column is not None and not column.nullable
+
+
+def model_sort_keys(model) -> List[Any]:
+    if _keyed_on_created_at(model):
+        return [model.created_at, model.id]
+    return [model.id]
+
+
+def _model_row_key(model) -> Callable[[Any], List[Any]]:
+    if _keyed_on_created_at(model):
+        return lambda obj: [obj.created_at.isoformat(), obj.id]
+    return lambda obj: [obj.id]
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Field names from ``?fields=a,b``; None when absent. ``id`` is always included."""
+    if not raw:
+        return None
+    fields = ["id"] + [name.strip() for name in raw.split(",") if name.strip() and name.strip() != "id"]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def project(obj, fields: Sequence[str]) -> Dict[str, Any]:
+    values = {}
+    for name in fields:
+        value = getattr(obj, name)
+        values[name] = value.isoformat() if isinstance(value, (datetime, date)) else value
+    return values
+
+
+def paginate_request(query, model, serialize: Callable[[Any], Dict[str, Any]],
+                     fields_allowed: Sequence[str] = (), default_limit: int = 100,
+                     max_limit: int = 500) -> Tuple[List[Dict[str, Any]], Page]:
+    """
+    Page through ORM ``query`` over ``model`` using the request's limit,
+    cursor, order and fields arguments. Rows are rendered with ``serialize``,
+    or as the requested columns when ``fields`` is given; ``fields_allowed``
+    lists the columns of ``model`` that may be requested. Raises
+    InvalidCursor / InvalidFields (both ValueError) for bad arguments.
+    """
+    fields = parse_fields(request.args.get("fields"), fields_allowed)
+    limit = parse_limit(request.args.get("limit"), default=default_limit, maximum=max_limit)
+    order = request.args.get("order", "asc").lower()
+    if order not in ("asc", "desc"):
+        raise InvalidCursor("order must be asc or desc")
+
+    if fields:
+        needed = set(fields) | ({"created_at"} if _keyed_on_created_at(model) else set())
+        query = query.options(load_only(*(getattr(model, name) for name in needed)))
+
+    page = keyset_page(query, model_sort_keys(model), request.args.get("cursor"), limit,
+                       _model_row_key(model), descending=order == "desc")
+    records = [project(obj, fields) if fields else serialize(obj) for obj in page.items]
+    return records, page
@@ -0,0 +1,34 @@
+# app/utils/query_counter.py
+"""
+Count the SQL statements (database round trips) issued inside a block:
+
+    with count_queries(db.engine) as counter:
+        dashboard_stats()
+    assert counter.count == 1, counter.statements
+"""
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._record)
@@ -0,0 +1,229 @@
+# app/utils/single_flight.py
+"""
+Single-flight: concurrent calls with the same key share one execution.
+
+Within a process, callers of a key that is already running wait on it
+directly. Across processes the first caller takes a Redis lock
+(``singleflight:<name>:<key>:lock``) and becomes the leader; everyone else
+subscribes to ``singleflight:<name>:<key>:done`` and receives the leader's
+result. The result is also kept for ``result_ttl`` seconds so a follower that
+subscribes just after the leader published still finds it.
+
+Followers never wait longer than ``wait_timeout``; if the wait runs out the
+follower runs the call itself. If the leader's call fails, every follower
+fails with it (the leader's exception in its own process, ``LeaderError``
+in others), so an upstream that just failed sees one call rather than one
+per waiter. If the leader's lock disappears without a result (crashed
+worker, or an error published before the follower subscribed), the
+followers compete for the lock again and one of them runs the call.
+Without Redis every call just runs.
+
+Results must be JSON serialisable.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict
+
+from app.extensions import redis_client
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-delete so a leader never removes a lock that expired and was re-taken
+RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+calls_total = REGISTRY.counter(
+    "singleflight_calls_total",
+    "Single-flight calls by role: leader ran the call, coalesced received a shared result, "
+    "leader_error received the leader's failure, fallback_* ran it again after a timeout, "
+    "wait error or lost leader, bypass ran without Redis",
+    labelnames=("name", "role"),
+)
+wait_seconds = REGISTRY.histogram(
+    "singleflight_wait_seconds",
+    "Time followers waited for a leader",
+    labelnames=("name", "outcome"),
+)
+
+
+class LeaderError(RuntimeError):
+    """The leader's call failed in another process; carries its error message."""
+
+
+class _LocalFlight:
+    __slots__ = ("event", "ok", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.ok = False
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, name: str, client=None, lock_ttl: float = 180, wait_timeout: float = 120,
+                 result_ttl: float = 30, poll_interval: float = 1.0):
+        self.name = name
+        self.client = client if client is not None else redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._local: Dict[str, _LocalFlight] = {}
+        self._local_lock = threading.Lock()
+
+    # ------------------- keys -------------------
+    def lock_key(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}:lock"
+
+    def result_key(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}:result"
+
+    def channel(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}:done"
+
+    # ------------------- entry point -------------------
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, sharing one execution among concurrent callers of ``key``."""
+        with self._local_lock:
+            flight = self._local.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._local[key] = _LocalFlight()
+
+        if not leader:
+            return self._wait_local(key, flight, fn)
+
+        try:
+            flight.result = self._do_distributed(key, fn)
+            flight.ok = True
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._local_lock:
+                self._local.pop(key, None)
+            flight.event.set()
+
+    def _wait_local(self, key: str, flight: _LocalFlight, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        finished = flight.event.wait(self.wait_timeout)
+        elapsed = time.perf_counter() - start
+        if finished and flight.ok:
+            wait_seconds.observe(elapsed, name=self.name, outcome="coalesced")
+            calls_total.inc(name=self.name, role="coalesced")
+            return _copy(flight.result)
+        if finished and flight.error is not None:
+            wait_seconds.observe(elapsed, name=self.name, outcome="leader_error")
+            calls_total.inc(name=self.name, role="leader_error")
+            raise flight.error
+        role = "fallback_timeout" if not finished else "fallback_error"
+        wait_seconds.observe(elapsed, name=self.name, outcome=role)
+        calls_total.inc(name=self.name, role=role)
+        return fn()
+
+    # ------------------- cross-process -------------------
+    def _do_distributed(self, key: str, fn: Callable[[], Any]) -> Any:
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.client.set(self.lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            logger.debug("Single-flight %s unavailable, running call: %s", self.name, e)
+            calls_total.inc(name=self.name, role="bypass")
+            return fn()
+
+        if acquired:
+            return self._lead(key, token, fn)
+        return self._follow(key, fn)
+
+    def _lead(self, key: str, token: str, fn: Callable[[], Any]) -> Any:
+        calls_total.inc(name=self.name, role="leader")
+        try:
+            result = fn()
+        except Exception as e:
+            self._publish(key, {"ok": False, "error": str(e)[:500]})
+            self._release(key, token)
+            raise
+        self._publish(key, {"ok": True, "result": result})
+        self._release(key, token)
+        return result
+
+    def _publish(self, key: str, message: Dict[str, Any]):
+        try:
+            payload = json.dumps(message)
+            pipe = self.client.pipeline()
+            if message["ok"]:
+                pipe.set(self.result_key(key), payload, px=int(self.result_ttl * 1000))
+            pipe.publish(self.channel(key), payload)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Single-flight %s could not publish result: %s", self.name, e)
+
+    def _release(self, key: str, token: str):
+        try:
+            self.client.eval(RELEASE_LOCK, 1, self.lock_key(key), token)
+        except Exception as e:
+            logger.debug("Single-flight %s could not release lock: %s", self.name, e)
+
+    def _follow(self, key: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        deadline = start + self.wait_timeout
+        message, outcome = None, "fallback_timeout"
+        pubsub = None
+        try:
+            # Subscribe before checking for a stored result so nothing published in between is missed
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self.channel(key))
+            message = self.client.get(self.result_key(key))
+            while message is None and time.perf_counter() < deadline:
+                event = pubsub.get_message(timeout=min(self.poll_interval, max(deadline - time.perf_counter(), 0)))
+                if event and event.get("type") == "message":
+                    message = event["data"]
+                elif not self.client.exists(self.lock_key(key)):
+                    # Leader gone: it either just finished or died without publishing
+                    message = self.client.get(self.result_key(key))
+                    if message is None:
+                        outcome = "fallback_lost_leader"
+                        break
+        except Exception as e:
+            logger.debug("Single-flight %s wait failed, running call: %s", self.name, e)
+            outcome = "fallback_error"
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+        if message is not None:
+            data = json.loads(message)
+            if data.get("ok"):
+                outcome = "coalesced"
+            else:
+                outcome = "leader_error"
+                logger.info("Single-flight %s leader failed: %s", self.name, data.get("error"))
+
+        wait_seconds.observe(time.perf_counter() - start, name=self.name, outcome=outcome)
+        calls_total.inc(name=self.name, role=outcome)
+        if outcome == "coalesced":
+            return data["result"]
+        if outcome == "leader_error":
+            raise LeaderError(data.get("error") or "Single-flight leader failed")
+        if outcome == "fallback_lost_leader":
+            # Race the other followers for the lock so the retry is shared too
+            return self._do_distributed(key, fn)
+        return fn()
+
+
+def _copy(value: Any) -> Any:
+    # Callers in the same process must not share (and mutate) one result object
+    return json.loads(json.dumps(value))
@@ -0,0 +1,295 @@
+# app/utils/token_bucket.py
+"""
+Redis token buckets that budget upstream calls globally and per user.
+
+``RateBudget.acquire()`` takes one token from the caller's own bucket and
+one from the shared global bucket (sized to the upstream quota), waiting up
+to ``max_wait`` seconds for either. Callers that have to wait for the global
+bucket join a fair queue: each ticket is tagged with a virtual start time
+(start-time fair queuing), so a user with many queued calls is interleaved
+with everyone else instead of being served back to back. Only the ticket at
+the head of the queue may take a token.
+
+Tickets carry a deadline and are purged once it passes, so a crashed worker
+cannot block the queue. If Redis is unreachable the budget is not enforced.
+
+The caller is identified by ``llm_budget_user(...)`` if set, else by the JWT
+identity or the client address of the current request.
+"""
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from app.extensions import redis_client
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Shared refill step: tokens accrue at ARGV[1]/s up to ARGV[2]
+_REFILL = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate, burst, cost, ttl = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local function save()
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+"""
+
+# KEYS: bucket  ARGV: rate, burst, cost, ttl
+# Always reserves (the bucket may go negative) and returns the seconds until
+# the reservation is covered, as a string: Lua numbers are truncated on return
+TAKE = _REFILL + """
+tokens = tokens - cost
+save()
+return tostring(math.max(0, -tokens / rate))
+"""
+
+# KEYS: bucket, queue (ticket -> tag), deadlines (ticket -> expiry), vtime, user tags
+# ARGV: rate, burst, cost, ttl, ticket, user, max_wait
+# -> {acquired 0/1, seconds to wait, queue position}
+FAIR_TAKE = _REFILL + """
+local ticket, user, max_wait = ARGV[5], ARGV[6], tonumber(ARGV[7])
+
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+if #expired > 0 then
+    redis.call('ZREM', KEYS[2], unpack(expired))
+    redis.call('ZREM', KEYS[3], unpack(expired))
+end
+
+local tag = redis.call('ZSCORE', KEYS[2], ticket)
+if not tag then
+    if redis.call('ZCARD', KEYS[2]) == 0 and tokens >= cost then
+        tokens = tokens - cost
+        save()
+        return {1, '0', 0}
+    end
+    local vt = redis.call('GET', KEYS[4])
+    if not vt then
+        -- First waiter, or the queue sat idle until the keys expired: start tagging afresh
+        redis.call('DEL', KEYS[5])
+        vt = '0'
+    end
+    redis.call('SET', KEYS[4], vt, 'EX', ttl)
+    vt = tonumber(vt)
+    local last = tonumber(redis.call('HGET', KEYS[5], user) or '0')
+    tag = math.max(vt, last) + 1
+    redis.call('HSET', KEYS[5], user, tag)
+    redis.call('EXPIRE', KEYS[5], ttl)
+    redis.call('ZADD', KEYS[2], tag, ticket)
+    redis.call('ZADD', KEYS[3], now + max_wait, ticket)
+    redis.call('EXPIRE', KEYS[2], ttl)
+    redis.call('EXPIRE', KEYS[3], ttl)
+end
+
+local position = redis.call('ZRANK', KEYS[2], ticket)
+if position == 0 and tokens >= cost then
+    tokens = tokens - cost
+    save()
+    redis.call('ZREM', KEYS[2], ticket)
+    redis.call('ZREM', KEYS[3], ticket)
+    redis.call('SET', KEYS[4], tag, 'EX', ttl)
+    return {1, '0', 0}
+end
+save()
+-- The head waits for its deficit; the rest re-check about once per token
+local deficit = math.max(cost - tokens, 0) / rate
+local wait = deficit
+if position > 0 then
+    wait = math.max(deficit, 1 / rate)
+end
+return {0, tostring(wait), position}
+"""
+
+requests_total = REGISTRY.counter(
+    "ai_budget_requests_total",
+    "Budget acquisitions by outcome (immediate, queued, throttled, bypass)",
+    labelnames=("budget", "outcome"),
+)
+wait_seconds = REGISTRY.histogram(
+    "ai_budget_wait_seconds",
+    "Time spent waiting for budget",
+    labelnames=("budget", "stage", "outcome"),
+)
+queue_position = REGISTRY.histogram(
+    "ai_budget_queue_depth",
+    "Fair queue depth ahead of a caller when it started waiting",
+    labelnames=("budget",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+waiting = REGISTRY.gauge(
+    "ai_budget_waiting",
+    "Callers in this process currently waiting for budget",
+    labelnames=("budget", "stage"),
+)
+
+
+class BudgetExhaustedError(RuntimeError):
+    def __init__(self, name: str, retry_after: Optional[float] = None):
+        super().__init__(f"Rate budget '{name}' exhausted; try again later")
+        self.name = name
+        self.retry_after = retry_after
+
+
+_budget_user: ContextVar[Optional[Tuple[str, Optional[float]]]] = ContextVar("llm_budget_user", default=None)
+
+
+@contextmanager
+def llm_budget_user(user: str, max_wait: Optional[float] = None):
+    """Charge calls made inside the block to ``user``, optionally with its own wait limit."""
+    token = _budget_user.set((user, max_wait))
+    try:
+        yield
+    finally:
+        _budget_user.reset(token)
+
+
+def current_budget_user() -> Tuple[str, Optional[float]]:
+    override = _budget_user.get()
+    if override:
+        return override
+    if has_request_context():
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if identity:
+            return f"user:{identity}", None
+        return f"ip:{request.remote_addr or 'unknown'}", None
+    return "system", None
+
+
+class RateBudget:
+    def __init__(self, name: str, client=None, global_rate: float = 2.0, global_burst: float = 20,
+                 user_rate: float = 1 / 3, user_burst: float = 5, max_wait: float = 15):
+        self.name = name
+        self.client = client if client is not None else redis_client
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_wait = max_wait
+
+    # ------------------- keys -------------------
+    @property
+    def prefix(self) -> str:
+        return f"ai:budget:{self.name}"
+
+    def user_key(self, user: str) -> str:
+        return f"{self.prefix}:user:{user}"
+
+    @property
+    def global_keys(self):
+        return [f"{self.prefix}:global", f"{self.prefix}:queue", f"{self.prefix}:queue:deadlines",
+                f"{self.prefix}:vtime", f"{self.prefix}:tags"]
+
+    def _ttl(self, rate: float, burst: float) -> int:
+        # Long enough for an idle bucket to refill completely
+        return int(burst / rate) + 60
+
+    # ------------------- acquire -------------------
+    def acquire(self, user: Optional[str] = None, max_wait: Optional[float] = None, cost: float = 1):
+        """Block until both buckets grant ``cost`` tokens or raise BudgetExhaustedError."""
+        if user is None:
+            user, context_wait = current_budget_user()
+            max_wait = max_wait if max_wait is not None else context_wait
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+
+        try:
+            queued = self._take_user(user, cost, deadline)
+            queued = self._take_global(user, cost, deadline) or queued
+        except BudgetExhaustedError:
+            requests_total.inc(budget=self.name, outcome="throttled")
+            raise
+        except Exception as e:
+            logger.debug("Rate budget %s unavailable, allowing call: %s", self.name, e)
+            requests_total.inc(budget=self.name, outcome="bypass")
+            return
+        requests_total.inc(budget=self.name, outcome="queued" if queued else "immediate")
+
+    def _take_user(self, user: str, cost: float, deadline: float) -> bool:
+        key = self.user_key(user)
+        args = (self.user_rate, self.user_burst, cost, self._ttl(self.user_rate, self.user_burst))
+        wait = float(self.client.eval(TAKE, 1, key, *args))
+        if wait <= 0:
+            return False
+
+        start = time.monotonic()
+        if start + wait > deadline:
+            # Hand back the reservation we cannot wait for
+            self.client.hincrbyfloat(key, "tokens", cost)
+            wait_seconds.observe(0, budget=self.name, stage="user", outcome="timeout")
+            raise BudgetExhaustedError(self.name, retry_after=wait)
+        # The token is already reserved; just wait out the deficit
+        waiting.inc(budget=self.name, stage="user")
+        try:
+            time.sleep(wait)
+        finally:
+            waiting.dec(budget=self.name, stage="user")
+        wait_seconds.observe(time.monotonic() - start, budget=self.name, stage="user", outcome="acquired")
+        return True
+
+    def _take_global(self, user: str, cost: float, deadline: float) -> bool:
+        keys = self.global_keys
+        ticket = uuid.uuid4().hex
+        ttl = self._ttl(self.global_rate, self.global_burst)
+        start = time.monotonic()
+        acquired, wait, position = self._fair_take(keys, cost, ttl, ticket, user, deadline - start)
+        if acquired:
+            return False
+
+        queue_position.observe(position, budget=self.name)
+        waiting.inc(budget=self.name, stage="global")
+        try:
+            while not acquired:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.client.zrem(keys[1], ticket)
+                    self.client.zrem(keys[2], ticket)
+                    self.client.hincrbyfloat(self.user_key(user), "tokens", cost)
+                    wait_seconds.observe(time.monotonic() - start, budget=self.name, stage="global",
+                                         outcome="timeout")
+                    raise BudgetExhaustedError(self.name, retry_after=max(wait * (position + 1), 1.0))
+                time.sleep(min(max(wait, 0.02), remaining, 1.0))
+                acquired, wait, position = self._fair_take(keys, cost, ttl, ticket, user, remaining)
+        finally:
+            waiting.dec(budget=self.name, stage="global")
+        wait_seconds.observe(time.monotonic() - start, budget=self.name, stage="global", outcome="acquired")
+        return True
+
+    def _fair_take(self, keys, cost, ttl, ticket, user, max_wait):
+        acquired, wait, position = self.client.eval(
+            FAIR_TAKE, len(keys), *keys,
+            self.global_rate, self.global_burst, cost, ttl, ticket, user, max(max_wait, 0) + 1,
+        )
+        return bool(int(acquired)), float(wait), int(position)
+
+    # ------------------- introspection -------------------
+    def stats(self) -> Dict[str, Any]:
+        try:
+            bucket, queue = self.global_keys[:2]
+            pipe = self.client.pipeline()
+            pipe.hget(bucket, "tokens")
+            pipe.zcard(queue)
+            tokens, depth = pipe.execute()
+            return {
+                "name": self.name,
+                "global_tokens": round(float(tokens), 2) if tokens is not None else self.global_burst,
+                "global_rate_per_min": round(self.global_rate * 60, 2),
+                "user_rate_per_min": round(self.user_rate * 60, 2),
+                "queue_depth": int(depth or 0),
+            }
+        except Exception as e:
+            return {"name": self.name, "available": False, "error": str(e)}
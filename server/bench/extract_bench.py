@@ -0,0 +1,160 @@
+"""
+Throughput benchmark of resume text extraction, per format.
+
+Builds a fixture set of resumes in every supported format (PDF, DOCX, RTF,
+TXT) at a few sizes, then runs text_extraction_service.extract_document on
+each fixture from --concurrency threads, the way resume workers call it.
+Reports documents/s, MB/s and latency percentiles per fixture.
+
+Examples:
+    python bench/extract_bench.py
+    python bench/extract_bench.py --concurrency 4 --requests 200 --pages 1,5,30
+    python bench/extract_bench.py --write-fixtures bench/fixtures   # keep the files
+
+Run from the server directory (so ``app`` is importable). PDF_EXTRACT_PROCESSES
+and the size limits are read from the environment as in the app.
+"""
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.text_extraction_service import extract_document  # noqa: E402
+
+from run_bench import SAMPLE_CV  # noqa: E402
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _page_lines(pages: int):
+    """SAMPLE_CV repeated once per page."""
+    return [SAMPLE_CV.splitlines() for _ in range(pages)]
+
+
+def make_pdf(pages: int) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    for lines in _page_lines(pages):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (50, 50, -50, -50), "\n".join(lines), fontsize=10)
+    return doc.tobytes()
+
+
+def make_docx(pages: int) -> bytes:
+    body = []
+    for number, lines in enumerate(_page_lines(pages)):
+        if number:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        body.extend(f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{W_NS}"><w:body>{"".join(body)}</w:body></w:document>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def make_rtf(pages: int) -> bytes:
+    def rtf_escape(line):
+        return line.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+
+    parts = [r"{\rtf1\ansi\deff0{\fonttbl{\f0 Calibri;}}{\colortbl;\red0\green0\blue0;}\f0\fs22 "]
+    for number, lines in enumerate(_page_lines(pages)):
+        if number:
+            parts.append("\\page ")
+        parts.extend(rtf_escape(line) + "\\par\n" for line in lines)
+    parts.append("}")
+    return "".join(parts).encode("latin-1")
+
+
+def make_txt(pages: int) -> bytes:
+    return "\f".join("\n".join(lines) for lines in _page_lines(pages)).encode("utf-8")
+
+
+MAKERS = {"pdf": make_pdf, "docx": make_docx, "rtf": make_rtf, "txt": make_txt}
+
+
+def build_fixtures(formats, page_counts):
+    return {f"{fmt}-{pages}p.{fmt}": MAKERS[fmt](pages) for fmt in formats for pages in page_counts}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def bench_fixture(data: bytes, requests: int, concurrency: int):
+    latencies, errors = [], 0
+
+    def one(_):
+        start = time.perf_counter()
+        extract_document(data)
+        return time.perf_counter() - start
+
+    extract_document(data)  # warm the pool
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(one, i) for i in range(requests)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "docs_per_s": round(len(latencies) / elapsed, 1),
+        "mb_per_s": round(len(latencies) * len(data) / elapsed / 1e6, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--formats", default="pdf,docx,rtf,txt")
+    parser.add_argument("--pages", default="1,5,30", help="Comma separated page counts per fixture")
+    parser.add_argument("--requests", type=int, default=100, help="Extractions per fixture")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--write-fixtures", metavar="DIR", help="Also write the fixtures to DIR")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    fixtures = build_fixtures(args.formats.split(","), [int(p) for p in args.pages.split(",")])
+    if args.write_fixtures:
+        target = Path(args.write_fixtures)
+        target.mkdir(parents=True, exist_ok=True)
+        for name, data in fixtures.items():
+            (target / name).write_bytes(data)
+
+    results = {}
+    for name, data in fixtures.items():
+        result = extract_document(data)
+        results[name] = {
+            "mime": result["mime"],
+            "bytes": len(data),
+            "chars": len(result["text"]),
+            **bench_fixture(data, args.requests, args.concurrency),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'fixture':<16}{'bytes':>10}{'chars':>9}{'docs/s':>10}{'MB/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['bytes']:>10}{r['chars']:>9}{r['docs_per_s']:>10}{r['mb_per_s']:>8}"
+              f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Local stand-in for OpenRouter (and Cloudinary uploads) for load testing the
+AI path without network access or token spend.
+
+Speaks POST /api/v1/chat/completions (plain and "stream": true SSE, with a
+"usage" block) and POST /v1_1/<cloud>/<type>/upload. Latency is log-normal
+around --latency-ms; a share of calls can fail with 5xx, 429 + Retry-After,
+or hang past the client timeout.
+
+    python bench/openrouter_stub.py --port 8090 --latency-ms 800 --error-rate 0.02 --rate-limit-rate 0.05
+
+Point the app at it:
+
+    OPENROUTER_BASE_URL=http://127.0.0.1:8090/api/v1
+    CLOUDINARY_URL="cloudinary://k:s@bench?upload_prefix=http://127.0.0.1:8090"
+    CLOUDINARY_CLOUD_NAME=bench CLOUDINARY_API_KEY=k CLOUDINARY_API_SECRET=s
+
+Runtime knobs: GET /__stub/stats, POST /__stub/config with any of the
+option names below as JSON keys (e.g. {"error_rate": 1.0} to trip the
+circuit breaker), POST /__stub/reset to zero the counters.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONFIG = {
+    "latency_ms": 800.0,        # median upstream latency
+    "latency_sigma": 0.5,       # log-normal spread; 0 = constant
+    "error_rate": 0.0,          # share of 500/502/503 responses
+    "rate_limit_rate": 0.0,     # share of 429 responses
+    "retry_after": 1,           # seconds, sent with 429s
+    "hang_rate": 0.0,           # share of calls that sleep for hang_seconds
+    "hang_seconds": 120.0,
+    "completion_tokens": 150,
+    "stream_chunk_ms": 20.0,    # delay between SSE chunks
+    "upload_latency_ms": 150.0, # Cloudinary upload latency
+    "model": "openai/gpt-4o-mini",
+    "cost_per_1k_tokens": 0.0004,
+}
+
+_stats_lock = threading.Lock()
+STATS = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "by_status": {}, "uploads": 0}
+
+
+def _track(delta: int, status=None):
+    with _stats_lock:
+        if delta > 0:
+            STATS["requests"] += 1
+        STATS["in_flight"] += delta
+        STATS["max_in_flight"] = max(STATS["max_in_flight"], STATS["in_flight"])
+        if status is not None:
+            key = str(status)
+            STATS["by_status"][key] = STATS["by_status"].get(key, 0) + 1
+
+
+def _latency() -> float:
+    median = CONFIG["latency_ms"] / 1000
+    sigma = CONFIG["latency_sigma"]
+    return median * math.exp(random.gauss(0, sigma)) if sigma else median
+
+
+def _prompt_text(body) -> str:
+    return "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+
+
+def _completion(prompt: str) -> str:
+    """Shape the answer like the real model would for each of our prompts."""
+    score = random.randint(35, 95)
+    if "strictly as JSON" in prompt:
+        return json.dumps({
+            "match_score": score,
+            "missing_skills": ["Kubernetes", "GraphQL"],
+            "suggestions": ["Quantify achievements", "Add recent projects"],
+            "interview_questions": ["Describe a system you scaled.", "How do you test APIs?"],
+        })
+    if "Match Score:" in prompt:
+        return (f"Match Score: {score}/100\nMissing Skills:\n- Kubernetes\n- GraphQL\n"
+                "Suggestions:\n- Quantify achievements\n- Add recent projects")
+    words = re.findall(r"\w+", prompt)[-12:]
+    return "Thanks for your message about " + " ".join(words) + ". " + "This is a stubbed reply. " * 4
+
+
+def _usage(prompt: str, completion: str):
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, min(CONFIG["completion_tokens"], len(completion) // 4))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cost": round((prompt_tokens + completion_tokens) / 1000 * CONFIG["cost_per_1k_tokens"], 8),
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "OpenRouterStub/1.0"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status: int, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    # ------------------- control -------------------
+    def do_GET(self):
+        if self.path.startswith("/__stub/stats"):
+            with _stats_lock:
+                return self._send_json(200, {"stats": STATS, "config": CONFIG})
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.startswith("/__stub/config"):
+            updates = json.loads(self._read_body() or b"{}")
+            unknown = [k for k in updates if k not in CONFIG]
+            if unknown:
+                return self._send_json(400, {"error": f"unknown options {unknown}"})
+            CONFIG.update(updates)
+            return self._send_json(200, CONFIG)
+        if self.path.startswith("/__stub/reset"):
+            self._read_body()
+            with _stats_lock:
+                STATS.update(requests=0, max_in_flight=STATS["in_flight"], by_status={}, uploads=0)
+            return self._send_json(200, STATS)
+        if re.match(r"^/v1_1/[^/]+/[^/]+/upload", self.path):
+            return self._upload()
+        if self.path.rstrip("/").endswith("/chat/completions"):
+            return self._chat_completions()
+        self._send_json(404, {"error": "not found"})
+
+    # ------------------- Cloudinary -------------------
+    def _upload(self):
+        self._read_body()
+        _track(+1)
+        try:
+            time.sleep(CONFIG["upload_latency_ms"] / 1000)
+            public_id = f"candidate_cvs/{uuid.uuid4().hex}"
+            with _stats_lock:
+                STATS["uploads"] += 1
+            self._send_json(200, {
+                "public_id": public_id,
+                "resource_type": "raw",
+                "secure_url": f"https://res.cloudinary.invalid/bench/raw/upload/{public_id}",
+            })
+        finally:
+            _track(-1, 200)
+
+    # ------------------- OpenRouter -------------------
+    def _chat_completions(self):
+        body = json.loads(self._read_body() or b"{}")
+        _track(+1)
+        status = 200
+        try:
+            roll = random.random()
+            if roll < CONFIG["hang_rate"]:
+                time.sleep(CONFIG["hang_seconds"])
+            time.sleep(_latency())
+
+            roll = random.random()
+            if roll < CONFIG["error_rate"]:
+                status = random.choice((500, 502, 503))
+                return self._send_json(status, {"error": {"code": status, "message": "stubbed upstream error"}})
+            if roll < CONFIG["error_rate"] + CONFIG["rate_limit_rate"]:
+                status = 429
+                return self._send_json(429, {"error": {"code": 429, "message": "rate limited"}},
+                                       headers={"Retry-After": CONFIG["retry_after"]})
+
+            prompt = _prompt_text(body)
+            completion = _completion(prompt)
+            model = body.get("model") if body.get("model") not in (None, "openrouter/auto") else CONFIG["model"]
+            if body.get("stream"):
+                return self._stream(completion, _usage(prompt, completion), model)
+
+            self._send_json(200, {
+                "id": f"gen-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": completion},
+                    "finish_reason": "stop",
+                }],
+                "usage": _usage(prompt, completion),
+            })
+        except (BrokenPipeError, ConnectionResetError):
+            status = "disconnected"
+        finally:
+            _track(-1, status)
+
+    def _stream(self, completion: str, usage, model: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        gen_id = f"gen-{uuid.uuid4().hex}"
+
+        def send(payload):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+
+        self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+        pieces = re.findall(r"\S+\s*", completion)
+        for piece in pieces:
+            send({"id": gen_id, "model": model, "choices": [{"index": 0, "delta": {"content": piece}}]})
+            time.sleep(CONFIG["stream_chunk_ms"] / 1000)
+        send({"id": gen_id, "model": model,
+              "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--seed", type=int, help="Seed the RNG for repeatable runs")
+    for key, default in CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=type(default), default=default)
+    args = parser.parse_args()
+
+    CONFIG.update({key: getattr(args, key) for key in CONFIG})
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"OpenRouter stub listening on http://{args.host}:{args.port} "
+          f"(latency ~{CONFIG['latency_ms']:.0f} ms, errors {CONFIG['error_rate']:.0%}, "
+          f"429s {CONFIG['rate_limit_rate']:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+End-to-end benchmark of the AI endpoints, meant to run against a local app
+wired to bench/openrouter_stub.py (no network, no token spend).
+
+Scenarios:
+    chat           POST /api/ai/chat
+    chat_stream    POST /api/ai/chat?stream=true   (also reports time to first byte)
+    parse_cv       POST /api/ai/parse_cv            (candidate token)
+    upload_resume  POST /api/candidate/upload_resume/<id>, then polls the job
+                   until it finishes (reports enqueue and end-to-end latency);
+                   needs one fresh application per request (--application-ids)
+
+Examples:
+    python bench/run_bench.py --scenario chat --concurrency 16 --requests 400
+    python bench/run_bench.py --scenario parse_cv --duration 60 --concurrency 8 \\
+        --email cand@example.com --password secret
+    python bench/run_bench.py --scenario upload_resume --application-ids 100-299 \\
+        --token $JWT --redis-url redis://localhost:6379/0 --stub-url http://127.0.0.1:8090
+
+Saturation is reported as the mean number of requests in flight (Little's
+law: throughput x mean latency) against the configured concurrency. With
+--stub-url the peak number of concurrent upstream LLM calls is reported,
+and with --redis-url the resume queue backlog is sampled during the run.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+SAMPLE_CV = """Jane Doe
+Software Engineer | jane@example.com | Johannesburg
+
+SUMMARY
+Backend engineer with 6 years of experience building Python web services.
+
+SKILLS
+Python, Flask, PostgreSQL, Redis, Docker, AWS, REST APIs, CI/CD
+
+EXPERIENCE
+Senior Software Engineer, Acme Corp 2021 - present
+- Led migration of a monolith to Flask microservices serving 2M requests/day
+- Introduced Redis caching, cutting p95 latency by 40%
+Software Engineer, Beta Ltd 2018 - 2021
+- Built REST APIs and background workers in Python
+
+EDUCATION
+BSc Computer Science, University of Cape Town 2017
+"""
+
+SAMPLE_JOB = """We are hiring a Backend Engineer (Python).
+Requirements: 4+ years Python, Flask or Django, PostgreSQL, Docker, AWS,
+experience with message queues and caching. Nice to have: Kubernetes, GraphQL."""
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def parse_id_range(spec):
+    ids = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            ids.extend(range(int(start), int(end) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+
+class Result:
+    __slots__ = ("ok", "status", "latency", "ttfb", "e2e", "error")
+
+    def __init__(self, ok, status, latency, ttfb=None, e2e=None, error=None):
+        self.ok = ok
+        self.status = status
+        self.latency = latency
+        self.ttfb = ttfb
+        self.e2e = e2e
+        self.error = error
+
+
+class Bench:
+    def __init__(self, args):
+        self.args = args
+        self.base = args.base_url.rstrip("/")
+        self.local = threading.local()
+        self.token = args.token or (self._login() if args.email else None)
+        self.application_ids = parse_id_range(args.application_ids)
+        self._ids_lock = threading.Lock()
+        self.cv_text = Path(args.cv_file).read_text() if args.cv_file else SAMPLE_CV
+        self.resume_file = Path(args.resume_file) if args.resume_file else None
+
+    # ------------------- plumbing -------------------
+    @property
+    def session(self):
+        # One keep-alive session per worker thread
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def _login(self):
+        resp = requests.post(f"{self.base}/api/auth/login",
+                             json={"email": self.args.email, "password": self.args.password}, timeout=30)
+        resp.raise_for_status()
+        token = resp.json().get("access_token")
+        if not token:
+            sys.exit(f"Login did not return an access token: {resp.text[:200]}")
+        return token
+
+    def next_application_id(self):
+        with self._ids_lock:
+            return self.application_ids.pop(0) if self.application_ids else None
+
+    # ------------------- scenarios -------------------
+    def chat(self):
+        start = time.perf_counter()
+        resp = self.session.post(f"{self.base}/api/ai/chat", headers=self.headers(),
+                                 json={"message": "What does a good backend CV look like?"},
+                                 timeout=self.args.timeout)
+        return Result(resp.status_code == 200, resp.status_code, time.perf_counter() - start)
+
+    def chat_stream(self):
+        start = time.perf_counter()
+        ttfb = None
+        with self.session.post(f"{self.base}/api/ai/chat?stream=true", headers=self.headers(),
+                               json={"message": "Give me three interview tips."},
+                               timeout=self.args.timeout, stream=True) as resp:
+            ok = resp.status_code == 200
+            for line in resp.iter_lines(decode_unicode=True):
+                if ttfb is None and line.startswith("data:"):
+                    ttfb = time.perf_counter() - start
+                if line.startswith("event: error"):
+                    ok = False
+        return Result(ok, resp.status_code, time.perf_counter() - start, ttfb=ttfb)
+
+    def parse_cv(self):
+        start = time.perf_counter()
+        # Vary the text so the analysis cache does not turn the run into a cache benchmark
+        cv_text = self.cv_text if self.args.allow_cache_hits else f"{self.cv_text}\nRef: {time.time_ns()}"
+        resp = self.session.post(f"{self.base}/api/ai/parse_cv", headers=self.headers(),
+                                 json={"cv_text": cv_text, "job_description": SAMPLE_JOB},
+                                 timeout=self.args.timeout)
+        return Result(resp.status_code == 200, resp.status_code, time.perf_counter() - start)
+
+    def upload_resume(self):
+        application_id = self.next_application_id()
+        if application_id is None:
+            return None
+        if self.resume_file:
+            files = {"resume": (self.resume_file.name, self.resume_file.read_bytes())}
+            data = {}
+        else:
+            files = {"resume": ("resume.txt", self.cv_text.encode(), "text/plain")}
+            data = {"resume_text": self.cv_text}
+
+        start = time.perf_counter()
+        resp = self.session.post(f"{self.base}/api/candidate/upload_resume/{application_id}",
+                                 headers=self.headers(), files=files, data=data, timeout=self.args.timeout)
+        enqueue_latency = time.perf_counter() - start
+        if resp.status_code != 202:
+            return Result(False, resp.status_code, enqueue_latency, error=resp.text[:200])
+
+        status_url = f"{self.base}{resp.json()['status_url']}"
+        deadline = start + self.args.job_timeout
+        while time.perf_counter() < deadline:
+            time.sleep(self.args.poll_interval)
+            job = self.session.get(status_url, headers=self.headers(), timeout=self.args.timeout).json()
+            if job.get("status") in ("succeeded", "dead"):
+                ok = job["status"] == "succeeded"
+                return Result(ok, job["status"], enqueue_latency, e2e=time.perf_counter() - start,
+                              error=None if ok else job.get("error"))
+        return Result(False, "job_timeout", enqueue_latency, e2e=time.perf_counter() - start)
+
+
+def run_scenario(bench, name):
+    args = bench.args
+    fn = getattr(bench, name)
+    results = []
+    results_lock = threading.Lock()
+    issued = Counter()
+    stop_at = time.perf_counter() + args.duration if args.duration else None
+
+    def should_continue():
+        with results_lock:
+            if stop_at is not None:
+                return time.perf_counter() < stop_at
+            if issued["n"] >= args.requests:
+                return False
+            issued["n"] += 1
+            return True
+
+    def worker():
+        while should_continue():
+            try:
+                result = fn()
+            except requests.RequestException as e:
+                result = Result(False, type(e).__name__, 0.0, error=str(e)[:200])
+            if result is None:  # ran out of inputs
+                return
+            with results_lock:
+                results.append(result)
+
+    sampler = Sampler(args) if (args.redis_url or args.stub_url) else None
+    if sampler:
+        sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+    if sampler:
+        sampler.stop()
+    return summarize(name, results, elapsed, args.concurrency, sampler)
+
+
+class Sampler(threading.Thread):
+    """Samples resume queue depth (Redis) and upstream concurrency (stub) during a run."""
+
+    def __init__(self, args):
+        super().__init__(daemon=True)
+        self.args = args
+        self.halt = threading.Event()
+        self.pending, self.processing = [], []
+        self.stub_max_in_flight = None
+        self.redis = None
+        if args.redis_url:
+            import redis
+            self.redis = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        if args.stub_url:
+            requests.post(f"{args.stub_url.rstrip('/')}/__stub/reset", timeout=5)
+
+    def run(self):
+        while not self.halt.wait(0.5):
+            if self.redis:
+                try:
+                    self.pending.append(self.redis.llen("jobs:resume:pending"))
+                    self.processing.append(self.redis.llen("jobs:resume:processing"))
+                except Exception:
+                    pass
+
+    def stop(self):
+        self.halt.set()
+        self.join(timeout=2)
+        if self.args.stub_url:
+            try:
+                stats = requests.get(f"{self.args.stub_url.rstrip('/')}/__stub/stats", timeout=5).json()["stats"]
+                self.stub_max_in_flight = stats["max_in_flight"]
+                self.stub_statuses = stats["by_status"]
+            except (requests.RequestException, KeyError, ValueError):
+                pass
+
+
+def _ms(value):
+    return None if value is None else round(value * 1000, 1)
+
+
+def summarize(name, results, elapsed, concurrency, sampler=None):
+    latencies = [r.latency for r in results]
+    ok = [r for r in results if r.ok]
+    summary = {
+        "scenario": name,
+        "requests": len(results),
+        "ok": len(ok),
+        "errors": dict(Counter(str(r.status) for r in results if not r.ok)),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "mean": _ms(statistics.fmean(latencies)) if latencies else None,
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+            "p99": _ms(percentile(latencies, 99)),
+            "max": _ms(max(latencies)) if latencies else None,
+        },
+    }
+    if latencies and elapsed:
+        in_flight = len(results) / elapsed * statistics.fmean(latencies)
+        summary["saturation"] = {
+            "mean_in_flight": round(in_flight, 2),
+            "client_concurrency": concurrency,
+            "utilisation": round(in_flight / concurrency, 2),
+        }
+    ttfb = [r.ttfb for r in results if r.ttfb is not None]
+    if ttfb:
+        summary["ttfb_ms"] = {"p50": _ms(percentile(ttfb, 50)), "p95": _ms(percentile(ttfb, 95)),
+                              "p99": _ms(percentile(ttfb, 99))}
+    e2e = [r.e2e for r in results if r.e2e is not None]
+    if e2e:
+        summary["end_to_end_ms"] = {"p50": _ms(percentile(e2e, 50)), "p95": _ms(percentile(e2e, 95)),
+                                    "p99": _ms(percentile(e2e, 99))}
+    if sampler:
+        if sampler.pending:
+            summary["queue"] = {"max_pending": max(sampler.pending), "max_processing": max(sampler.processing)}
+        if sampler.stub_max_in_flight is not None:
+            summary["upstream"] = {"max_in_flight": sampler.stub_max_in_flight,
+                                   "responses": getattr(sampler, "stub_statuses", {})}
+    sample_errors = [r.error for r in results if r.error][:3]
+    if sample_errors:
+        summary["sample_errors"] = sample_errors
+    return summary
+
+
+def print_summary(summary):
+    lat = summary["latency_ms"]
+    print(f"\n== {summary['scenario']} ==")
+    print(f"  requests {summary['requests']}  ok {summary['ok']}  errors {summary['errors'] or '-'}")
+    print(f"  throughput {summary['throughput_rps']} req/s over {summary['elapsed_s']} s")
+    print(f"  latency ms  mean {lat['mean']}  p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    for key in ("ttfb_ms", "end_to_end_ms"):
+        if key in summary:
+            v = summary[key]
+            print(f"  {key.replace('_ms', '')} ms  p50 {v['p50']}  p95 {v['p95']}  p99 {v['p99']}")
+    if "saturation" in summary:
+        s = summary["saturation"]
+        print(f"  in flight {s['mean_in_flight']} / {s['client_concurrency']} (utilisation {s['utilisation']})")
+    if "queue" in summary:
+        print(f"  resume queue  max pending {summary['queue']['max_pending']}  "
+              f"max processing {summary['queue']['max_processing']}")
+    if "upstream" in summary:
+        print(f"  upstream max in flight {summary['upstream']['max_in_flight']}  "
+              f"responses {summary['upstream']['responses']}")
+    for error in summary.get("sample_errors", []):
+        print(f"  e.g. {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--scenario", action="append",
+                        choices=["chat", "chat_stream", "parse_cv", "upload_resume"],
+                        help="Repeat to run several scenarios in sequence (default: chat)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--duration", type=float, help="Run each scenario for N seconds instead")
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--token", help="JWT access token")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--cv-file", help="Plain-text CV used for parse_cv/upload_resume")
+    parser.add_argument("--resume-file", help="File uploaded by upload_resume (default: the text CV)")
+    parser.add_argument("--application-ids", help="Applications for upload_resume, e.g. 100-199,205")
+    parser.add_argument("--allow-cache-hits", action="store_true", help="Send identical parse_cv bodies")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--job-timeout", type=float, default=300)
+    parser.add_argument("--redis-url", help="Sample resume queue depth from this Redis")
+    parser.add_argument("--stub-url", help="Base URL of openrouter_stub.py for upstream stats")
+    parser.add_argument("--json", dest="json_out", help="Also write the summaries to this file")
+    args = parser.parse_args()
+
+    bench = Bench(args)
+    summaries = []
+    for name in args.scenario or ["chat"]:
+        if name == "upload_resume" and not bench.application_ids:
+            sys.exit("upload_resume needs --application-ids")
+        summary = run_scenario(bench, name)
+        print_summary(summary)
+        summaries.append(summary)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(summaries, indent=2))
+
+
+if __name__ == "__main__":
+    main()
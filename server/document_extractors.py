@@ -0,0 +1,224 @@
+# document_extractors.py
+"""
+Text extractors for uploaded documents, run in the extraction pool of
+app.services.text_extraction_service.
+
+This module lives outside the ``app`` package on purpose: importing anything
+under ``app`` runs app/__init__.py, which connects to MongoDB and Redis and
+starts their background threads. The pool's fork server preloads only this
+module (the standard library, plus PyMuPDF on first use), so it stays a
+single-threaded process with no open sockets and every pool process forked
+from it starts clean. Keep it that way: no imports from ``app`` here.
+
+Every extractor takes ``(source, max_pages)``, where source is the document
+bytes or a file path, and returns {"text", "pages", "total_pages",
+"truncated"}, with text capped at ``EXTRACT_MAX_CHARS`` characters. Pages
+are separated by form feeds so repeated page headers/footers can be
+recognised later (cv_condenser_service).
+"""
+import codecs
+import io
+import os
+import re
+import zipfile
+from typing import Any, Dict, Union
+from xml.etree import ElementTree
+
+EXTRACT_MAX_CHARS = int(os.environ.get("EXTRACT_MAX_CHARS", 200_000))
+# Uncompressed size of word/document.xml; guards against zip bombs
+DOCX_MAX_XML_BYTES = int(os.environ.get("DOCX_MAX_XML_BYTES", 50 * 1024 * 1024))
+
+PAGE_BREAK = "\f"
+
+
+class ExtractionError(RuntimeError):
+    """The document could not be read (malformed, encrypted, not a PDF...)."""
+
+
+def extract_pdf_pages(source: Union[bytes, str], max_pages: int) -> Dict[str, Any]:
+    import fitz
+
+    try:
+        doc = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype="pdf")
+    except Exception as e:
+        raise ExtractionError(f"Could not open PDF: {e}") from None
+
+    with doc:
+        if doc.needs_pass:
+            raise ExtractionError("PDF is password protected")
+        total = doc.page_count
+        last = min(total, max_pages) if max_pages else total
+        out = io.StringIO()
+        length, pages, truncated = 0, 0, last < total
+        for number in range(last):
+            piece = (PAGE_BREAK if number else "") + doc.load_page(number).get_text()
+            out.write(piece)
+            length += len(piece)
+            pages += 1
+            if length >= EXTRACT_MAX_CHARS:
+                truncated = truncated or length > EXTRACT_MAX_CHARS or pages < total
+                break
+
+    text = out.getvalue()[:EXTRACT_MAX_CHARS]
+    return {"text": text, "pages": pages, "total_pages": total, "truncated": truncated}
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def extract_docx(source: Union[bytes, str], max_pages: int) -> Dict[str, Any]:
+    """Streams word/document.xml; explicit page breaks count as pages."""
+    try:
+        archive = zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source))
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ExtractionError(f"Could not open DOCX: {e}") from None
+
+    with archive:
+        try:
+            info = archive.getinfo("word/document.xml")
+        except KeyError:
+            raise ExtractionError("DOCX has no word/document.xml") from None
+        if info.file_size > DOCX_MAX_XML_BYTES:
+            raise ExtractionError(f"DOCX body is {info.file_size} bytes uncompressed; "
+                                  f"the limit is {DOCX_MAX_XML_BYTES}")
+
+        out = io.StringIO()
+        length, pages, truncated = 0, 1, False
+        try:
+            with archive.open(info) as xml:
+                for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+                    tag = element.tag
+                    piece = None
+                    if event == "end":
+                        if tag == f"{_W}t":
+                            piece = element.text
+                        elif tag == f"{_W}tab":
+                            piece = "\t"
+                        elif tag in (f"{_W}br", f"{_W}cr"):
+                            if element.get(f"{_W}type") == "page":
+                                if max_pages and pages >= max_pages:
+                                    truncated = True
+                                    break
+                                pages += 1
+                                piece = PAGE_BREAK
+                            else:
+                                piece = "\n"
+                        elif tag == f"{_W}p":
+                            piece = "\n"
+                            # Paragraphs are complete here; drop them to keep memory flat
+                            element.clear()
+                    if piece:
+                        out.write(piece)
+                        length += len(piece)
+                        if length >= EXTRACT_MAX_CHARS:
+                            truncated = True
+                            break
+        except ElementTree.ParseError as e:
+            raise ExtractionError(f"Malformed DOCX: {e}") from None
+
+    text = out.getvalue()[:EXTRACT_MAX_CHARS]
+    return {"text": text, "pages": pages, "total_pages": pages, "truncated": truncated}
+
+
+# Groups: control word, its argument, hex escape, control symbol, brace, literal char
+_RTF_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)",
+                        re.IGNORECASE | re.DOTALL)
+# Groups whose content is not document text
+_RTF_DESTINATIONS = frozenset((
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "objdata", "header", "footer",
+    "headerl", "headerr", "headerf", "footerl", "footerr", "footerf", "footnote", "field", "fldinst",
+    "datastore", "themedata", "listtable", "listoverridetable", "rsidtbl", "generator", "xmlnstbl",
+    "latentstyles", "filetbl", "revtbl", "userprops", "bkmkstart", "bkmkend",
+))
+_RTF_SPECIALS = {
+    "par": "\n", "line": "\n", "sect": "\n\n", "page": PAGE_BREAK, "tab": "\t", "cell": "\t", "row": "\n",
+    "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022", "lquote": "\u2018", "rquote": "\u2019",
+    "ldblquote": "\u201c", "rdblquote": "\u201d", "emspace": " ", "enspace": " ", "qmspace": " ",
+}
+
+
+def extract_rtf(source: Union[bytes, str], max_pages: int) -> Dict[str, Any]:
+    """Strip RTF control words, keeping text, paragraph breaks and \\u / \\' escapes."""
+    rtf = _read(source).decode("latin-1")
+    out, stack = [], []
+    ignorable, uc_skip, skip, pages, length = False, 1, 0, 1, 0
+    truncated = False
+
+    def emit(text):
+        nonlocal length
+        if not ignorable:
+            out.append(text)
+            length += len(text)
+
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, arg, hexcode, symbol, brace, char = match.groups()
+        if brace:
+            skip = 0
+            if brace == "{":
+                stack.append((uc_skip, ignorable))
+            elif stack:
+                uc_skip, ignorable = stack.pop()
+        elif symbol:
+            skip = 0
+            if symbol == "*":
+                ignorable = True
+            elif symbol == "~":
+                emit("\u00a0")
+            elif symbol in "{}\\":
+                emit(symbol)
+        elif word:
+            skip = 0
+            if word in _RTF_DESTINATIONS:
+                ignorable = True
+            elif ignorable:
+                continue
+            elif word == "uc":
+                uc_skip = int(arg or 1)
+            elif word == "u":
+                code = int(arg or 0)
+                emit(chr(code + 0x10000 if code < 0 else code))
+                skip = uc_skip
+            elif word in _RTF_SPECIALS:
+                if word == "page":
+                    if max_pages and pages >= max_pages:
+                        truncated = True
+                        break
+                    pages += 1
+                emit(_RTF_SPECIALS[word])
+        elif hexcode or char:
+            if skip:
+                skip -= 1
+            elif hexcode:
+                emit(bytes((int(hexcode, 16),)).decode("cp1252", errors="replace"))
+            else:
+                emit(char)
+        if length >= EXTRACT_MAX_CHARS:
+            truncated = True
+            break
+
+    text = "".join(out)[:EXTRACT_MAX_CHARS]
+    return {"text": text, "pages": pages, "total_pages": pages, "truncated": truncated}
+
+
+def extract_text(source: Union[bytes, str], max_pages: int) -> Dict[str, Any]:
+    data = _read(source)
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"),
+                          (codecs.BOM_UTF16_BE, "utf-16")):
+        if data.startswith(bom):
+            text = data.decode(encoding, errors="replace")
+            break
+    else:
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            text = data.decode("cp1252", errors="replace")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return {"text": text[:EXTRACT_MAX_CHARS], "pages": 1, "total_pages": 1,
+            "truncated": len(text) > EXTRACT_MAX_CHARS}
+
+
+def _read(source: Union[bytes, str]) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return source
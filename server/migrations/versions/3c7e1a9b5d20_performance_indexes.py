@@ -0,0 +1,75 @@
+"""performance indexes on hot filter and join columns
+
+Revision ID: 3c7e1a9b5d20
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+Built with CREATE INDEX CONCURRENTLY so writes to the tables continue while
+they build; that cannot run inside a transaction, hence autocommit_block().
+This is the first tracked revision: it expects the tables that predate the
+migration history (users, applications, ...) to exist, and every table or
+column added since is created by a later revision. IF NOT EXISTS makes it
+safe to re-run. A concurrent build that failed earlier leaves an INVALID
+index behind; those are dropped and rebuilt. Check the plans afterwards with
+``flask explain-queries``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e1a9b5d20'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# name -> (table, indexed expressions); keep in step with app/models.py
+INDEXES = {
+    'ix_applications_requisition_id': ('applications', 'requisition_id'),
+    'ix_applications_candidate_id': ('applications', 'candidate_id'),
+    'ix_applications_status': ('applications', 'status'),
+    'ix_applications_created_at': ('applications', 'created_at'),
+    'ix_candidates_user_id': ('candidates', 'user_id'),
+    'ix_notifications_user_id_is_read_created_at': ('notifications', 'user_id, is_read, created_at'),
+    'ix_interviews_application_id': ('interviews', 'application_id'),
+    'ix_interviews_candidate_id': ('interviews', 'candidate_id'),
+    'ix_assessment_results_application_id': ('assessment_results', 'application_id'),
+    'ix_audit_logs_timestamp': ('audit_logs', '"timestamp"'),
+    'ix_meetings_organizer_id_start_time': ('meetings', 'organizer_id, start_time'),
+    'ix_meetings_start_time': ('meetings', 'start_time'),
+    'ix_users_email_lower': ('users', 'lower(email)'),
+}
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not _is_postgres():
+        for name, (table, columns) in INDEXES.items():
+            op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+        return
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, (table, columns) in INDEXES.items():
+            invalid = bind.execute(sa.text(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ), {'name': name}).scalar()
+            if invalid:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})')
+
+
+def downgrade():
+    if not _is_postgres():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
+        return
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
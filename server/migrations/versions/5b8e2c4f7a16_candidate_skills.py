@@ -0,0 +1,36 @@
+"""candidate skill index table
+
+Revision ID: 5b8e2c4f7a16
+Revises: 8d2f4b6a1c93
+Create Date: 2026-10-18 09:00:00.000000
+
+Creates ``candidate_skills``, the inverted skill index maintained by
+app.services.skill_index_service. The table starts empty; run
+``flask reindex-skills`` once after upgrading to index existing candidates.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2c4f7a16'
+down_revision = '8d2f4b6a1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'candidate_skills',
+        sa.Column('skill', sa.String(length=100), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('skill', 'candidate_id', 'source'),
+    )
+    op.create_index('ix_candidate_skills_candidate_id', 'candidate_skills', ['candidate_id'])
+
+
+def downgrade():
+    op.drop_index('ix_candidate_skills_candidate_id', table_name='candidate_skills')
+    op.drop_table('candidate_skills')
@@ -0,0 +1,42 @@
+"""llm usage daily rollup table
+
+Revision ID: 7f1d3a9c2e58
+Revises: 5b8e2c4f7a16
+Create Date: 2026-10-18 09:10:00.000000
+
+Creates ``llm_usage_daily``, upserted by app.services.llm_usage_service.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f1d3a9c2e58'
+down_revision = '5b8e2c4f7a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'llm_usage_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('model', sa.String(length=150), nullable=False),
+        sa.Column('route', sa.String(length=150), nullable=False),
+        sa.Column('calls', sa.Integer(), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.Column('retries', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('completion_tokens', sa.BigInteger(), nullable=False),
+        sa.Column('cost_usd', sa.Float(), nullable=False),
+        sa.Column('latency_ms_total', sa.Float(), nullable=False),
+        sa.Column('latency_ms_max', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'model', 'route', name='uq_llm_usage_daily'),
+    )
+
+
+def downgrade():
+    op.drop_table('llm_usage_daily')
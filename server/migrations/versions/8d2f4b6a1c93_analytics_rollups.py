@@ -0,0 +1,66 @@
+"""analytics rollups table
+
+Revision ID: 8d2f4b6a1c93
+Revises: 3c7e1a9b5d20
+Create Date: 2026-10-17 12:00:00.000000
+
+Creates ``analytics_rollups`` and, on PostgreSQL, fills it from the source
+tables in one INSERT ... SELECT; afterwards
+app.services.analytics_rollup_service keeps it up to date. On other
+databases run ``flask rebuild-rollups`` once after upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6a1c93'
+down_revision = '3c7e1a9b5d20'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors analytics_rollup_service.rollup_key (PASS_MARK 50, 1970-01 for missing dates)
+BACKFILL = """
+INSERT INTO analytics_rollups (metric, month, requisition_id, status, count)
+SELECT 'applications',
+       COALESCE(date_trunc('month', a.created_at)::date, DATE '1970-01-01'),
+       COALESCE(a.requisition_id, 0), LEFT(COALESCE(a.status, ''), 50), COUNT(*)
+FROM applications a
+GROUP BY 2, 3, 4
+UNION ALL
+SELECT 'assessments',
+       COALESCE(date_trunc('month', ar.created_at)::date, DATE '1970-01-01'),
+       COALESCE(a.requisition_id, 0),
+       CASE WHEN ar.percentage_score >= 50 THEN 'passed' ELSE 'failed' END, COUNT(*)
+FROM assessment_results ar
+LEFT JOIN applications a ON a.id = ar.application_id
+GROUP BY 2, 3, 4
+UNION ALL
+SELECT 'interviews',
+       COALESCE(date_trunc('month', i.created_at)::date, DATE '1970-01-01'),
+       COALESCE(a.requisition_id, 0), LEFT(COALESCE(i.status, ''), 50), COUNT(*)
+FROM interviews i
+LEFT JOIN applications a ON a.id = i.application_id
+GROUP BY 2, 3, 4
+"""
+
+
+def upgrade():
+    op.create_table(
+        'analytics_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=20), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('requisition_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'month', 'requisition_id', 'status', name='uq_analytics_rollup'),
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_table('analytics_rollups')
@@ -0,0 +1,38 @@
+"""resume documents by content hash
+
+Revision ID: 9a4c6e1b3d72
+Revises: 7f1d3a9c2e58
+Create Date: 2026-10-18 09:20:00.000000
+
+Creates ``resume_documents``, written by app.services.resume_document_service.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c6e1b3d72'
+down_revision = '7f1d3a9c2e58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resume_documents',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('resume_url', sa.String(length=500), nullable=True),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.Column('pages', sa.Integer(), nullable=True),
+        sa.Column('truncated', sa.Boolean(), nullable=True),
+        sa.Column('use_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+
+
+def downgrade():
+    op.drop_table('resume_documents')
@@ -0,0 +1,26 @@
+"""candidate profile picture variants
+
+Revision ID: c3e7f5a2b914
+Revises: 9a4c6e1b3d72
+Create Date: 2026-10-18 09:30:00.000000
+
+Adds ``candidates.profile_picture_variants``, filled by the media queue's
+profile_picture_variants jobs (app.services.profile_picture_service).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e7f5a2b914'
+down_revision = '9a4c6e1b3d72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('candidates', sa.Column('profile_picture_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('candidates', 'profile_picture_variants')
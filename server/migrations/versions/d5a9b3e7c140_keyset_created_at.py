@@ -0,0 +1,72 @@
+"""created_at keyset indexes on users and requisitions
+
+Revision ID: d5a9b3e7c140
+Revises: c3e7f5a2b914
+Create Date: 2026-10-18 11:00:00.000000
+
+The admin user list and the job lists page on (created_at, id). Rows
+without a created_at are backfilled (requisitions from published_on, then
+1970-01-01) and the column made NOT NULL, so the row comparison in
+app.utils.pagination never skips a row and can range-scan the new
+(created_at, id) indexes. On PostgreSQL these build CONCURRENTLY; SQLite
+cannot alter a column in place, so there the backfill and indexes are
+applied but the column stays nullable.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9b3e7c140'
+down_revision = 'c3e7f5a2b914'
+branch_labels = None
+depends_on = None
+
+
+# name -> (table, value for rows without a created_at)
+INDEXES = {
+    'ix_users_created_at_id': ('users', "'1970-01-01 00:00:00'"),
+    'ix_requisitions_created_at_id': ('requisitions', "COALESCE(published_on, '1970-01-01 00:00:00')"),
+}
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    for table, backfill in INDEXES.values():
+        op.execute(f'UPDATE {table} SET created_at = {backfill} WHERE created_at IS NULL')
+
+    if not _is_postgres():
+        for name, (table, _) in INDEXES.items():
+            op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} (created_at, id)')
+        return
+
+    for table, _ in INDEXES.values():
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, (table, _) in INDEXES.items():
+            invalid = bind.execute(sa.text(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ), {'name': name}).scalar()
+            if invalid:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} (created_at, id)')
+
+
+def downgrade():
+    if not _is_postgres():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
+        return
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    for table, _ in INDEXES.values():
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=True)